@@ -1,10 +1,8 @@
-from typing import Dict, Any
-
 import pandas as pd
 import streamlit as st
 import altair as alt
 
-from scripts.data_processing import load_and_preprocess_data, clear_all_caches
+from scripts.data_processing import load_dataset, clear_all_caches
 from scripts.navigation import make_sidebar
 from scripts.theme import (
     GREEN, RED,
@@ -38,12 +36,10 @@ make_sidebar("Home")
 render_refresh_status()
 
 # Load data safely (returns empty DFs if files missing)
-data: Dict[str, Any] = load_and_preprocess_data()
-
-income_df: pd.DataFrame = data.get("income", pd.DataFrame())
-expenses_df: pd.DataFrame = data.get("expenses", pd.DataFrame())
-daily_stocks_df: pd.DataFrame = data.get("daily_stocks", pd.DataFrame())
-daily_equity_df: pd.DataFrame = data.get("daily_equity", pd.DataFrame())
+income_df: pd.DataFrame = load_dataset("income")
+expenses_df: pd.DataFrame = load_dataset("expenses")
+daily_stocks_df: pd.DataFrame = load_dataset("daily_stocks")
+daily_equity_df: pd.DataFrame = load_dataset("daily_equity")
 
 # Check for empty state to guide the user
 if income_df.empty and expenses_df.empty and daily_stocks_df.empty:
@@ -71,7 +67,7 @@ else:
 last_expenses_refresh = get_last_refresh_date_from_df(expenses_df, "date")
 
 # Calculate Investment Metrics
-portfolio_snapshot = get_portfolio_snapshot(data)
+portfolio_snapshot = get_portfolio_snapshot({"daily_equity": daily_equity_df})
 total_portfolio_value = portfolio_snapshot["total_portfolio_value"]
 total_equity = portfolio_snapshot["total_equity"]
 total_profit = portfolio_snapshot["total_profit"]
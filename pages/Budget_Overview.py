@@ -2,13 +2,14 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 from datetime import date
-from scripts.data_processing import load_and_preprocess_data
+from scripts.budget_cube import category_names, monthly_totals, rollup
+from scripts.data_processing import load_dataset
 from scripts.navigation import make_sidebar
 from scripts.theme import (
     BLUE, GREEN, RED,
     page_header, section_header, stat_card_grid, html_table, grad_divider,
 )
-from scripts.utils import clean_amount_column, render_freshness_badge, render_refresh_status
+from scripts.utils import render_freshness_badge, render_refresh_status
 
 # ----------------- PAGE CONFIG ----------------- #
 st.set_page_config(page_title="Budget Overview", page_icon="💸", layout="wide")
@@ -21,32 +22,22 @@ page_header("Budget Overview", icon="💸",
 
 render_refresh_status()
 
-# ----------------- DATA LOADING & CLEANING ----------------- #
-data = load_and_preprocess_data()
-income_df  = data["income"].copy()
-expenses_df = data["expenses"].copy()
+# ----------------- DATA LOADING ----------------- #
+# Typed transactions and the month × category cube are cached datasets (see
+# scripts/budget_cube.py); filter changes only slice the cube. Only budget
+# files are read, never the investment history.
+income_df   = load_dataset("income_transactions")
+expenses_df = load_dataset("expense_transactions")
+budget_cube = load_dataset("budget_cube")
 
 _budget_max_date = None
-if not expenses_df.empty and "date" in expenses_df.columns:
-    _budget_max_date = pd.to_datetime(expenses_df["date"], errors="coerce").max()
-elif not income_df.empty and "date" in income_df.columns:
-    _budget_max_date = pd.to_datetime(income_df["date"], errors="coerce").max()
+if not expenses_df.empty:
+    _budget_max_date = expenses_df["date"].max()
+elif not income_df.empty:
+    _budget_max_date = income_df["date"].max()
 if _budget_max_date is not None:
     render_freshness_badge(_budget_max_date, label="Budget data through")
 
-if "expense_category" in expenses_df.columns:
-    expenses_df = expenses_df.rename(columns={"expense_category": "category"})
-if "source" in income_df.columns:
-    income_df = income_df.rename(columns={"source": "category"})
-
-income_df   = clean_amount_column(income_df)
-expenses_df = clean_amount_column(expenses_df)
-
-income_df["date"]   = pd.to_datetime(income_df["date"],   errors="coerce")
-expenses_df["date"] = pd.to_datetime(expenses_df["date"], errors="coerce")
-income_df   = income_df.dropna(subset=["date"])
-expenses_df = expenses_df.dropna(subset=["date"])
-
 # ----------------- FILTERS (TOP OF PAGE) ----------------- #
 with st.container():
     st.html(section_header("Filters", icon="🔍"))
@@ -74,7 +65,7 @@ with st.container():
         else:
             start_date, end_date = default_start, default_end
 
-    unique_categories = sorted(expenses_df["category"].dropna().astype(str).unique().tolist())
+    unique_categories = category_names(budget_cube, "expense")
 
     with f_col2:
         selected_categories = st.multiselect(
@@ -84,30 +75,13 @@ with st.container():
         )
 
 # ----------------- DATA PROCESSING ----------------- #
-mask_income = (income_df["date"].dt.date >= start_date) & (income_df["date"].dt.date <= end_date)
-filtered_income = income_df.loc[mask_income]
-
-mask_expenses = (
-        (expenses_df["date"].dt.date >= start_date) &
-        (expenses_df["date"].dt.date <= end_date) &
-        (expenses_df["category"].isin(selected_categories))
-)
-filtered_expenses = expenses_df.loc[mask_expenses]
-
-income_monthly = (
-    filtered_income.set_index("date")
-        .resample("MS")["amount"]
-        .sum()
-        .reset_index()
-        .rename(columns={"amount": "Income"})
+income_monthly = monthly_totals(
+    rollup(budget_cube, income_df, "income", start_date, end_date),
+    value_name="Income",
 )
-
-expenses_monthly = (
-    filtered_expenses.set_index("date")
-        .resample("MS")["amount"]
-        .sum()
-        .reset_index()
-        .rename(columns={"amount": "Expenses"})
+expenses_monthly = monthly_totals(
+    rollup(budget_cube, expenses_df, "expense", start_date, end_date, categories=selected_categories),
+    value_name="Expenses",
 )
 
 chart_data = pd.merge(income_monthly, expenses_monthly, on="date", how="outer").fillna(0.0)
@@ -3,7 +3,7 @@ import pandas as pd
 import plotly.express as px
 
 from scripts.data_processing import (
-    load_and_preprocess_data,
+    load_dataset,
     load_market_context,
     calculate_buying_opportunity_scores,
 )
@@ -20,11 +20,10 @@ make_sidebar("Buying Opportunities")
 render_refresh_status()
 
 # ----------------- LOAD DATA ----------------- #
-data = load_and_preprocess_data()
-stocks_complete = data.get("stocks_complete", pd.DataFrame())
+stocks_complete = load_dataset("stocks_complete")
 market_ctx = load_market_context()
-stock_info = data.get("stock_info", pd.DataFrame())
-stocks = data.get("stocks", pd.DataFrame())
+stock_info = load_dataset("stock_info")
+stocks = load_dataset("stocks")
 
 # ----------------- DATA FRESHNESS BANNER ----------------- #
 last_updated = "Unknown"
@@ -3,7 +3,7 @@ import pandas as pd
 import plotly.express as px
 import random
 from datetime import datetime, timedelta
-from scripts.data_processing import load_and_preprocess_data
+from scripts.data_processing import load_dataset, load_price_matrices
 from scripts.navigation import make_sidebar
 from scripts.theme import BLUE, GREEN_VIVID, page_header, section_header, grad_divider
 from scripts.utils import render_freshness_badge, render_refresh_status
@@ -20,9 +20,8 @@ page_header("Company Deep-Dive", icon="🏢",
 render_refresh_status()
 
 # ----------------- DATA LOADING ----------------- #
-data = load_and_preprocess_data()
-stock_info   = data["stock_info"].copy()
-daily_stocks = data["daily_stocks"].copy()
+stock_info   = load_dataset("stock_info").copy()
+prices       = load_price_matrices()
 
 if not stock_info.empty and "last_updated" in stock_info.columns:
     render_freshness_badge(pd.to_datetime(stock_info["last_updated"]).max(), label="Fundamentals last updated")
@@ -45,7 +44,8 @@ if selected_display:
 
     if not stock_info[stock_info["stock"] == selected_ticker].empty:
         company_data = stock_info[stock_info["stock"] == selected_ticker].iloc[0]
-        history_data = daily_stocks[daily_stocks["stock"] == selected_ticker].copy()
+        # The ticker's column of the shared close matrix
+        history_data = prices.series(selected_ticker)
     else:
         st.error("Data for this company is missing.")
         st.stop()
@@ -112,9 +112,8 @@ with col_chart:
     st.html(section_header("Price History (1 Year)", icon="📉"))
 
     if not history_data.empty:
-        history_data["date"] = pd.to_datetime(history_data["date"])
         one_year_ago = datetime.now() - timedelta(days=365)
-        chart_df = history_data[history_data["date"] >= one_year_ago].sort_values("date")
+        chart_df = history_data.loc[one_year_ago:].rename("close").reset_index()
 
         fig = px.line(chart_df, x="date", y="close", title=f"{selected_ticker} Stock Price")
         fig.update_traces(fill='tozeroy', line_color=GREEN_VIVID)
@@ -197,7 +196,7 @@ with r1:
 with r2:
     st.html(section_header("Analyst Consensus", icon="🎯"))
     target_mean   = company_data.get("target_mean_price", 0)
-    current_price = history_data.iloc[-1]["close"] if not history_data.empty else 0
+    current_price = history_data.iloc[-1] if not history_data.empty else 0
 
     if target_mean > 0 and current_price > 0:
         upside = ((target_mean - current_price) / current_price) * 100
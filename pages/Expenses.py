@@ -2,13 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import date
-from scripts.data_processing import load_and_preprocess_data
+from scripts.budget_cube import category_names, category_totals, rollup
+from scripts.data_processing import get_expense_search_index, load_dataset
 from scripts.navigation import make_sidebar
 from scripts.theme import (
     page_header, section_header, stat_card_grid, html_table, badge, grad_divider,
     GREEN_PIE_PALETTE,
 )
-from scripts.utils import clean_amount_column, render_freshness_badge, render_refresh_status
+from scripts.utils import render_freshness_badge, render_refresh_status
 
 # ----------------- PAGE CONFIG ----------------- #
 st.set_page_config(page_title="Expense Breakdown", page_icon="🧾", layout="wide")
@@ -21,20 +22,15 @@ page_header("Expense Breakdown", icon="🧾",
 
 render_refresh_status()
 
-# ----------------- DATA LOADING & CLEANING ----------------- #
-data = load_and_preprocess_data()
-expenses_df = data["expenses"].copy()
+# ----------------- DATA LOADING ----------------- #
+# Typed transactions and the month × category cube are cached datasets (see
+# scripts/budget_cube.py); filter changes only slice the cube. Only budget
+# files are read, never the investment history.
+expenses_df = load_dataset("expense_transactions")
+budget_cube = load_dataset("budget_cube")
 
-if not expenses_df.empty and "date" in expenses_df.columns:
-    render_freshness_badge(pd.to_datetime(expenses_df["date"], errors="coerce").max(), label="Expense data through")
-
-if "expense_category" in expenses_df.columns:
-    expenses_df = expenses_df.rename(columns={"expense_category": "category"})
-
-expenses_df = clean_amount_column(expenses_df)
-expenses_df["date"] = pd.to_datetime(expenses_df["date"], errors="coerce")
-expenses_df = expenses_df.dropna(subset=["date"])
-expenses_df["description_clean"] = expenses_df["description"].fillna("").astype(str).str.strip().str.upper()
+if not expenses_df.empty:
+    render_freshness_badge(expenses_df["date"].max(), label="Expense data through")
 
 # Build a stable category → badge color mapping (cycles through 4 colors)
 _BADGE_COLORS = ["teal", "green", "yellow", "teal"]
@@ -73,27 +69,39 @@ with st.container():
         else:
             start_date, end_date = default_start, default_end
 
-    unique_categories = sorted(expenses_df["category"].dropna().astype(str).unique().tolist())
+    unique_categories = category_names(budget_cube, "expense")
     with f_col2:
         selected_categories = st.multiselect("Category", options=unique_categories, default=unique_categories)
 
     with f_col3:
-        search_term = st.text_input("Search Description (e.g., 'Uber')", "")
+        search_term = st.text_input(
+            "Search Description (e.g., 'Uber')", "",
+            help='Words must all match; use OR for alternatives, amaz* for word prefixes, "uber eats" for a phrase.',
+        )
 
 # ----------------- FILTERING LOGIC ----------------- #
+# Totals and the category split come from the cube; a description search can
+# only be answered from the transactions themselves, via the prebuilt
+# description index (see scripts/expense_search.py).
 mask = (
-        (expenses_df["date"].dt.date >= start_date) &
-        (expenses_df["date"].dt.date <= end_date) &
+        (expenses_df["date"] >= pd.Timestamp(start_date)) &
+        (expenses_df["date"] < pd.Timestamp(end_date) + pd.Timedelta(days=1)) &
         (expenses_df["category"].isin(selected_categories))
 )
+if search_term.strip():
+    mask &= get_expense_search_index(expenses_df).mask(search_term, len(expenses_df))
 filtered_df = expenses_df.loc[mask].copy()
 
-if search_term:
-    filtered_df = filtered_df[filtered_df["description_clean"].str.contains(search_term.upper())]
+if search_term.strip():
+    cat_group = filtered_df.groupby("category", observed=True)["amount"].agg(total="sum", count="count").reset_index()
+else:
+    cat_group = category_totals(
+        rollup(budget_cube, expenses_df, "expense", start_date, end_date, categories=selected_categories)
+    )
 
 # ----------------- METRICS ----------------- #
-total_spend       = filtered_df["amount"].sum()
-transaction_count = len(filtered_df)
+total_spend       = cat_group["total"].sum()
+transaction_count = int(cat_group["count"].sum())
 avg_transaction   = total_spend / transaction_count if transaction_count > 0 else 0.0
 
 st.html(grad_divider())
@@ -109,10 +117,9 @@ c1, c2 = st.columns([1, 1])
 
 with c1:
     st.html(section_header("Spending by Category", icon="🥧"))
-    if not filtered_df.empty:
-        cat_group = filtered_df.groupby("category")["amount"].sum().reset_index()
+    if not cat_group.empty:
         fig_cat = px.pie(
-            cat_group, values="amount", names="category",
+            cat_group, values="total", names="category",
             hole=0.4, title="Expense Distribution",
             color_discrete_sequence=GREEN_PIE_PALETTE,
         )
@@ -122,10 +129,12 @@ with c1:
         st.info("No data for chart.")
 
 with c2:
-    st.html(section_header("Description Trends", icon="📊"))
+    st.html(section_header("Merchant Trends", icon="📊"))
     if not filtered_df.empty:
+        # Grouped by canonical merchant (scripts/merchants.py), so
+        # "Uber home" and "Uber to DC" count as one bar
         desc_group = (
-            filtered_df.groupby("description_clean")
+            filtered_df.groupby("merchant", observed=True)
                 .agg(Total_Amount=("amount", "sum"), Count=("amount", "count"), Category=("category", "first"))
                 .reset_index().sort_values(by="Count", ascending=False)
         )
@@ -137,7 +146,7 @@ with c2:
             top_desc = desc_group.sort_values("Total_Amount", ascending=False).head(10)
             y_axis   = "Total_Amount"
 
-        fig_desc = px.bar(top_desc, x=y_axis, y="description_clean", orientation='h',
+        fig_desc = px.bar(top_desc, x=y_axis, y="merchant", orientation='h',
                           text=y_axis, color="Category",
                           color_discrete_sequence=GREEN_PIE_PALETTE)
         fig_desc.update_layout(yaxis={'categoryorder': 'total ascending'})
@@ -9,7 +9,7 @@ import pandas as pd
 import streamlit as st
 from PIL import Image
 
-from scripts.data_processing import load_and_preprocess_data
+from scripts.data_processing import load_dataset
 from scripts.navigation import make_sidebar
 from scripts.theme import page_header, section_header, grad_divider
 from scripts.utils import render_freshness_badge, render_refresh_status
@@ -37,15 +37,13 @@ TOP_N = 25
 
 # ---------- LOAD DATA ---------- #
 
-data = load_and_preprocess_data()
-
-_stock_info_hl = data.get("stock_info", pd.DataFrame())
+_stock_info_hl = load_dataset("stock_info")
 if not _stock_info_hl.empty and "last_updated" in _stock_info_hl.columns:
     render_freshness_badge(pd.to_datetime(_stock_info_hl["last_updated"]).max(), label="Fundamentals last updated")
 
-stocks_complete: pd.DataFrame = data.get("stocks_complete")
-stocks: pd.DataFrame = data["stocks"]
-stock_info: pd.DataFrame = data["stock_info"]
+stocks_complete: pd.DataFrame = load_dataset("stocks_complete")
+stocks: pd.DataFrame = load_dataset("stocks")
+stock_info: pd.DataFrame = load_dataset("stock_info")
 
 if stocks_complete is None:
     if "stock" in stocks.columns and "stock" in stock_info.columns:
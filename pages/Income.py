@@ -2,13 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import date
-from scripts.data_processing import load_and_preprocess_data
+from scripts.budget_cube import category_totals, rollup, slice_cube
+from scripts.data_processing import load_dataset
 from scripts.navigation import make_sidebar
 from scripts.theme import (
     page_header, section_header, stat_card_grid, html_table, badge, grad_divider,
     GREEN_PIE_PALETTE,
 )
-from scripts.utils import clean_amount_column, render_freshness_badge, render_refresh_status
+from scripts.utils import render_freshness_badge, render_refresh_status
 
 # ----------------- PAGE CONFIG ----------------- #
 st.set_page_config(page_title="Income Analysis", page_icon="💵", layout="wide")
@@ -21,21 +22,15 @@ page_header("Income Analysis", icon="💵",
 
 render_refresh_status()
 
-# ----------------- DATA LOADING & CLEANING ----------------- #
-data = load_and_preprocess_data()
-income_df = data["income"].copy()
+# ----------------- DATA LOADING ----------------- #
+# Typed transactions and the month × category cube are cached datasets (see
+# scripts/budget_cube.py); filter changes only slice the cube. Only budget
+# files are read, never the investment history.
+income_df = load_dataset("income_transactions")
+budget_cube = load_dataset("budget_cube")
 
-if not income_df.empty and "date" in income_df.columns:
-    render_freshness_badge(pd.to_datetime(income_df["date"], errors="coerce").max(), label="Income data through")
-
-if "source" in income_df.columns:
-    income_df = income_df.rename(columns={"source": "category"})
-
-income_df = clean_amount_column(income_df)
-income_df["date"] = pd.to_datetime(income_df["date"], errors="coerce")
-income_df = income_df.dropna(subset=["date"])
-
-income_df["description_clean"] = income_df["category"].fillna("").astype(str).str.strip().str.upper()
+if not income_df.empty:
+    render_freshness_badge(income_df["date"].max(), label="Income data through")
 
 
 def _cat_color(cat: str) -> str:
@@ -72,11 +67,7 @@ with st.container():
         else:
             start_date, end_date = default_start, default_end
 
-    if not income_df.empty:
-        cat_stats = income_df.groupby("category")["amount"].sum().sort_values(ascending=False)
-        sorted_categories = cat_stats.index.tolist()
-    else:
-        sorted_categories = []
+    sorted_categories = category_totals(slice_cube(budget_cube, "income"))["category"].tolist()
 
     with f_col2:
         selected_categories = st.multiselect(
@@ -89,19 +80,18 @@ with st.container():
         search_term = st.text_input("Search Source", "")
 
 # ----------------- FILTERING ----------------- #
-mask = (
-        (income_df["date"].dt.date >= start_date) &
-        (income_df["date"].dt.date <= end_date) &
-        (income_df["category"].isin(selected_categories))
-)
-filtered_df = income_df.loc[mask].copy()
-
+# The search box matches source names, so it narrows the category list and
+# every total still comes from the cube.
 if search_term:
-    filtered_df = filtered_df[filtered_df["description_clean"].str.contains(search_term.upper())]
+    selected_categories = [c for c in selected_categories if search_term.upper() in str(c).strip().upper()]
+
+desc_group = category_totals(
+    rollup(budget_cube, income_df, "income", start_date, end_date, categories=selected_categories)
+)
 
 # ----------------- METRICS ----------------- #
-total_income      = filtered_df["amount"].sum()
-transaction_count = len(filtered_df)
+total_income      = desc_group["total"].sum()
+transaction_count = int(desc_group["count"].sum())
 avg_transaction   = total_income / transaction_count if transaction_count > 0 else 0.0
 
 st.html(grad_divider())
@@ -117,10 +107,9 @@ c1, c2 = st.columns([1, 1])
 
 with c1:
     st.html(section_header("Income by Source", icon="🥧"))
-    if not filtered_df.empty:
-        cat_group = filtered_df.groupby("category")["amount"].sum().reset_index()
+    if not desc_group.empty:
         fig_cat = px.pie(
-            cat_group, values="amount", names="category",
+            desc_group, values="total", names="category",
             hole=0.4, title="Income Distribution",
             color_discrete_sequence=GREEN_PIE_PALETTE,
         )
@@ -131,19 +120,13 @@ with c1:
 
 with c2:
     st.html(section_header("Top Sources (Bar)", icon="📊"))
-    if not filtered_df.empty:
-        desc_group = (
-            filtered_df.groupby("category")
-                .agg(Total_Amount=("amount", "sum"), Count=("amount", "count"))
-                .reset_index().sort_values(by="Total_Amount", ascending=False)
-        )
-
+    if not desc_group.empty:
         fig_desc = px.bar(
             desc_group.head(10),
-            x="Total_Amount",
+            x="total",
             y="category",
             orientation='h',
-            text="Total_Amount",
+            text="total",
             title="Top Income Sources by Value",
             color_discrete_sequence=GREEN_PIE_PALETTE,
         )
@@ -157,6 +140,13 @@ with c2:
 st.html(grad_divider())
 st.html(section_header("Income Log", icon="📋"))
 
+mask = (
+        (income_df["date"] >= pd.Timestamp(start_date)) &
+        (income_df["date"] < pd.Timestamp(end_date) + pd.Timedelta(days=1)) &
+        (income_df["category"].isin(selected_categories))
+)
+filtered_df = income_df.loc[mask]
+
 if not filtered_df.empty:
     display_cols = ["date", "category", "amount"]
     if "description" in filtered_df.columns and not filtered_df["description"].isna().all():
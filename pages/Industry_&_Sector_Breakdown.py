@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from scripts.data_processing import load_and_preprocess_data
+from scripts.data_processing import load_dataset
 from scripts.navigation import make_sidebar
 from scripts.theme import page_header, section_header, grad_divider, GREEN_PIE_PALETTE
 from scripts.utils import render_freshness_badge, render_refresh_status
@@ -18,12 +18,10 @@ page_header("Industry & Sector Breakdown", icon="🧭",
 render_refresh_status()
 
 # ----------------- DATA LOADING ----------------- #
-data = load_and_preprocess_data()
-
-todays_stocks_complete = data.get("todays_stocks_complete", pd.DataFrame()).copy()
-sector_values          = data.get("sector_values",          pd.DataFrame()).copy()
-industry_values        = data.get("industry_values",        pd.DataFrame()).copy()
-stock_info             = data.get("stock_info",             pd.DataFrame())
+todays_stocks_complete = load_dataset("todays_stocks_complete").copy()
+sector_values          = load_dataset("sector_values").copy()
+industry_values        = load_dataset("industry_values").copy()
+stock_info             = load_dataset("stock_info")
 
 if not stock_info.empty and "last_updated" in stock_info.columns:
     render_freshness_badge(pd.to_datetime(stock_info["last_updated"]).max(), label="Fundamentals last updated")
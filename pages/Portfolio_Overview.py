@@ -3,9 +3,9 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import plotly.express as px
-from datetime import date, timedelta
-from scripts.data_processing import load_and_preprocess_data
+from scripts.data_processing import load_dataset, load_price_matrices
 from scripts.navigation import make_sidebar
+from scripts.returns import LOOKBACKS, YTD, returns_for
 from scripts.theme import (
     GREEN, RED,
     page_header, section_header, stat_card_grid, html_table, grad_divider,
@@ -24,17 +24,17 @@ page_header("Portfolio Overview", icon="📈",
 render_refresh_status()
 
 # ----------------- DATA LOADING ----------------- #
-data = load_and_preprocess_data()
-stocks_complete = data["stocks_complete"].copy()
-daily_stocks = data["daily_stocks"].copy()
-daily_equity = data.get("daily_equity", pd.DataFrame())
-stock_info = data.get("stock_info", pd.DataFrame())
+stocks_complete = load_dataset("stocks_complete").copy()
+prices = load_price_matrices()
+daily_equity = load_dataset("daily_equity")
+return_anchors = load_dataset("return_anchors")
+stock_info = load_dataset("stock_info")
 
 # Freshness badges
 if not stock_info.empty and "last_updated" in stock_info.columns:
     render_freshness_badge(pd.to_datetime(stock_info["last_updated"]).max(), label="Fundamentals last updated")
-if not daily_stocks.empty and "date" in daily_stocks.columns:
-    render_freshness_badge(pd.to_datetime(daily_stocks["date"], errors="coerce").max(), label="Price history through")
+if not prices.empty:
+    render_freshness_badge(prices.dates.max(), label="Price history through")
 
 # ----------------- DATA CLEANING ----------------- #
 
@@ -45,16 +45,9 @@ else:
     stocks_complete["market_value"] = 0.0
 
 # 2. True Cost Basis from daily_stocks (replayed transaction history)
-if not daily_stocks.empty and {"stock", "equity", "date"}.issubset(daily_stocks.columns):
-    daily_stocks["date"] = pd.to_datetime(daily_stocks["date"], errors="coerce")
-    latest_date = daily_stocks["date"].max()
-    cost_basis = (
-        daily_stocks[daily_stocks["date"] == latest_date]
-        .groupby("stock")["equity"]
-        .sum()
-        .reset_index()
-        .rename(columns={"equity": "true_cost_basis"})
-    )
+latest_equity = prices.on(field="equity")   # latest row of the shared equity matrix
+if latest_equity.notna().any():
+    cost_basis = latest_equity.dropna().rename("true_cost_basis").rename_axis("stock").reset_index()
     stocks_complete = pd.merge(stocks_complete, cost_basis, on="stock", how="left")
     stocks_complete["invested"] = pd.to_numeric(stocks_complete["true_cost_basis"], errors="coerce").fillna(0)
 else:
@@ -175,50 +168,10 @@ st.html(section_header("Movers & Shakers", icon="🔥"))
 
 time_frame = st.radio(
     "Calculate Performance Over:",
-    ["1 Day", "1 Week", "1 Month", "3 Months", "1 Year", "YTD"],
+    [*LOOKBACKS, YTD],
     horizontal=True
 )
 
-
-def get_performance_df(daily_df, days_lookback=None, is_ytd=False):
-    if daily_df.empty:
-        return pd.DataFrame()
-
-    daily_df["date"] = pd.to_datetime(daily_df["date"])
-    daily_df = daily_df.sort_values("date")
-
-    max_date = daily_df["date"].max()
-
-    if is_ytd:
-        start_date = date(max_date.year, 1, 1)
-    else:
-        start_date = max_date - timedelta(days=days_lookback)
-
-    end_prices = daily_df[daily_df["date"] == max_date][["stock", "close"]].rename(columns={"close": "End_Price"})
-
-    history_subset = daily_df[daily_df["date"] <= pd.Timestamp(start_date)]
-    if history_subset.empty:
-        history_subset = daily_df.copy()
-
-    latest_dates = history_subset.groupby("stock")["date"].max().reset_index()
-    start_prices_raw = pd.merge(daily_df, latest_dates, on=["stock", "date"])
-    start_prices = start_prices_raw[["stock", "close"]].rename(columns={"close": "Start_Price"})
-
-    perf_df = pd.merge(end_prices, start_prices, on="stock", how="inner")
-    perf_df["Abs_Change"] = perf_df["End_Price"] - perf_df["Start_Price"]
-    perf_df["Pct_Change"] = (perf_df["Abs_Change"] / perf_df["Start_Price"]) * 100
-
-    return perf_df
-
-
-lookback_map = {
-    "1 Day": 1,
-    "1 Week": 7,
-    "1 Month": 30,
-    "3 Months": 90,
-    "1 Year": 365
-}
-
 _MOVER_COLS = {
     "stock":       "Ticker",
     "Start_Price": "Start Price",
@@ -231,11 +184,9 @@ _MOVER_FMT = {
     "% Change":    "{:+.2f}%",
 }
 
-if "daily_stocks" in data and not daily_stocks.empty:
-    if time_frame == "YTD":
-        perf_df = get_performance_df(daily_stocks, is_ytd=True)
-    else:
-        perf_df = get_performance_df(daily_stocks, days_lookback=lookback_map[time_frame])
+if not prices.empty:
+    # Start prices for every window are precomputed once per data load (scripts/returns.py)
+    perf_df = returns_for(return_anchors, time_frame)
 
     if not perf_df.empty:
         col_g, col_l = st.columns(2)
@@ -264,4 +215,4 @@ if "daily_stocks" in data and not daily_stocks.empty:
     else:
         st.warning("Not enough historical data to calculate performance for this period.")
 else:
-    st.info("No daily stock history available (daily_stocks.csv). Run the investment data processor.")
+    st.info("No daily stock history available (data/daily_stocks/). Run the investment data processor.")
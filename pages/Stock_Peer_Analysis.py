@@ -4,9 +4,10 @@ import pandas as pd
 import altair as alt
 import streamlit as st
 
-from scripts.data_processing import load_and_preprocess_data
+from scripts.data_processing import load_dataset, load_price_matrices
 from scripts.navigation import make_sidebar
-from scripts.theme import RED, GREEN_VIVID, page_header, section_header, grad_divider
+from scripts.peer_analytics import normalize, peer_averages, relative_strength, return_correlation
+from scripts.theme import RED, GREEN_VIVID, page_header, section_header, grad_divider, html_table
 from scripts.utils import render_freshness_badge, render_refresh_status
 
 st.set_page_config(page_title="Stock Peer Analysis", page_icon="📊", layout="wide")
@@ -26,26 +27,17 @@ st.html("""
 
 # ---------- LOAD DATA ---------- #
 
-data = load_and_preprocess_data()
-daily_stocks: pd.DataFrame = data["daily_stocks"]
-stocks_df:    pd.DataFrame = data["stocks"]
+prices    = load_price_matrices()
+stocks_df: pd.DataFrame = load_dataset("stocks")
 
-if not daily_stocks.empty and "date" in daily_stocks.columns:
-    max_price_date = pd.to_datetime(daily_stocks["date"], errors="coerce").max()
-    render_freshness_badge(max_price_date, label="Price history through")
+if not prices.empty:
+    render_freshness_badge(prices.dates.max(), label="Price history through")
 
 st.html(grad_divider())
 
-if "date" not in daily_stocks.columns or "stock" not in daily_stocks.columns:
-    st.error("`daily_stocks` is missing required columns (`date`, `stock`).")
-    st.stop()
-
-daily_stocks = daily_stocks.copy()
-daily_stocks["date"] = pd.to_datetime(daily_stocks["date"], errors="coerce")
-
 # ---------- UNIVERSE & DEFAULTS ---------- #
 
-universe_tickers = sorted(daily_stocks["stock"].dropna().astype(str).unique().tolist())
+universe_tickers = prices.tickers
 
 default_tickers = []
 if {"stock", "market_value"}.issubset(stocks_df.columns):
@@ -93,28 +85,22 @@ if not selected_tickers:
     left_col.info("Pick some stocks from your portfolio to compare.", icon="ℹ️")
     st.stop()
 
-# ---------- FILTER & PIVOT PRICE DATA ---------- #
+# ---------- SLICE PRICE DATA ---------- #
 
-horizon_months = horizon_map[horizon_label]
-max_date       = daily_stocks["date"].max()
-if pd.isna(max_date):
-    st.error("No valid dates found in `daily_stocks`.")
+if prices.empty:
+    st.error("No valid dates found in the daily price history.")
     st.stop()
 
-start_date = max_date - pd.DateOffset(months=horizon_months)
+horizon_months = horizon_map[horizon_label]
+start_date     = prices.dates.max() - pd.DateOffset(months=horizon_months)
 
-mask     = (daily_stocks["date"] >= start_date) & daily_stocks["stock"].isin(selected_tickers)
-filtered = daily_stocks.loc[mask, ["date", "stock", "close"]].copy()
+# Rows from start_date for the selected columns of the shared close matrix
+price_matrix = prices.window(start=start_date, tickers=selected_tickers).dropna(how="all")
 
-if filtered.empty:
+if price_matrix.empty:
     st.warning("No price data available for the selected tickers and time horizon.")
     st.stop()
 
-price_matrix = (
-    filtered.pivot_table(index="date", columns="stock", values="close")
-    .sort_index()
-)
-
 price_matrix = price_matrix.dropna(axis=1, how="all")
 
 if price_matrix.empty:
@@ -131,17 +117,8 @@ price_matrix = price_matrix[tickers]
 
 # ---------- NORMALIZE PRICES ---------- #
 
-normalized = pd.DataFrame(index=price_matrix.index)
-
-for t in tickers:
-    s = price_matrix[t].dropna()
-    if s.empty:
-        normalized[t] = pd.Series(index=price_matrix.index, data=pd.NA)
-    else:
-        norm_series = s / s.iloc[0]
-        normalized[t] = norm_series.reindex(price_matrix.index)
-
-normalized = normalized.dropna(axis=1, how="all")
+# Whole-matrix operations (scripts/peer_analytics.py), no per-ticker loop
+normalized = normalize(price_matrix)
 tickers    = [t for t in tickers if t in normalized.columns]
 
 if not tickers:
@@ -150,24 +127,24 @@ if not tickers:
 
 # ---------- BEST / WORST METRICS ---------- #
 
-latest_norm_values = {t: normalized[t].dropna().iat[-1] for t in tickers if not normalized[t].dropna().empty}
+strength = relative_strength(normalized)
 
-if not latest_norm_values:
+if strength.empty:
     st.error("Could not compute latest normalized values.")
     st.stop()
 
-best_ticker  = max(latest_norm_values, key=latest_norm_values.get)
-worst_ticker = min(latest_norm_values, key=latest_norm_values.get)
-best_value   = latest_norm_values[best_ticker]
-worst_value  = latest_norm_values[worst_ticker]
+best_ticker  = strength["stock"].iat[0]
+worst_ticker = strength["stock"].iat[-1]
+best_value   = strength["return_pct"].iat[0]
+worst_value  = strength["return_pct"].iat[-1]
 
 with left_col:
     st.html(section_header("Peer Highlights", icon="🏆"))
     m1, m2 = st.columns(2)
     with m1:
-        st.metric("Best stock",  best_ticker,  delta=f"{(best_value  - 1) * 100:,.0f}%")
+        st.metric("Best stock",  best_ticker,  delta=f"{best_value:,.0f}%")
     with m2:
-        st.metric("Worst stock", worst_ticker, delta=f"{(worst_value - 1) * 100:,.0f}%")
+        st.metric("Worst stock", worst_ticker, delta=f"{worst_value:,.0f}%")
 
 # ---------- MAIN NORMALIZED PRICE CHART ---------- #
 
@@ -198,18 +175,71 @@ with right_col:
 
     st.altair_chart(base_chart, use_container_width=True)
 
+if len(tickers) <= 1:
+    st.html(grad_divider())
+    st.info("Pick 2 or more tickers above to see peer comparisons.", icon="ℹ️")
+    st.stop()
+
+# ---------- RELATIVE STRENGTH & CORRELATION ---------- #
+
+st.html(grad_divider())
+st.html(section_header("Relative Strength & Correlation", icon="🧭"))
+
+rank_col, corr_col = st.columns([2, 3])
+
+with rank_col:
+    st.html(html_table(
+        strength,
+        col_labels={
+            "rank":              "#",
+            "stock":             "Ticker",
+            "return_pct":        "Return",
+            "peer_return_pct":   "Peer Avg",
+            "relative_strength": "RS vs Peers",
+        },
+        formatters={
+            "Return":      "{:+.1f}%",
+            "Peer Avg":    "{:+.1f}%",
+            "RS vs Peers": "{:.2f}",
+        },
+        ticker_col="stock",
+    ))
+
+with corr_col:
+    corr_long = (
+        return_correlation(price_matrix[tickers])
+        .rename_axis(index="Stock A", columns="Stock B")
+        .stack(future_stack=True)
+        .rename("Correlation")
+        .reset_index()
+    )
+    corr_chart = (
+        alt.Chart(corr_long)
+        .mark_rect()
+        .encode(
+            x=alt.X("Stock A:N", sort=tickers, title=None),
+            y=alt.Y("Stock B:N", sort=tickers, title=None),
+            color=alt.Color("Correlation:Q", scale=alt.Scale(domain=[-1, 1], range=[RED, "white", GREEN_VIVID])),
+            tooltip=[
+                alt.Tooltip("Stock A:N"),
+                alt.Tooltip("Stock B:N"),
+                alt.Tooltip("Correlation:Q", format=".2f"),
+            ],
+        )
+        .properties(title="Daily return correlation", height=340)
+    )
+    st.altair_chart(corr_chart, use_container_width=True)
+
 # ---------- INDIVIDUAL STOCK VS PEER AVERAGE ---------- #
 
 st.html(grad_divider())
 st.html(section_header("Individual Stocks vs Peer Average", icon="🔍"))
 
-if len(tickers) <= 1:
-    st.info("Pick 2 or more tickers above to see peer comparisons.", icon="ℹ️")
-    st.stop()
+# Leave-one-out peer average for every ticker at once
+peer_avg_matrix = peer_averages(normalized)
 
 for i, ticker in enumerate(tickers):
-    peers    = normalized.drop(columns=[ticker])
-    peer_avg = peers.mean(axis=1)
+    peer_avg = peer_avg_matrix[ticker]
 
     row_cols = st.columns(2)
 
@@ -0,0 +1,100 @@
+"""
+Offline benchmark for the investment refresh (process_investment_data.py).
+
+Runs create_daily_stock_table, build_summary_dataframe and
+create_stock_info_table against a seeded FakeMarketSource at several
+portfolio sizes, with no network and no rate-limit cost, and prints a timing
+table. Outputs go to a temporary directory; real data/ files are untouched.
+
+"batches" is the number of history download() calls and "calls" every source
+call (batches plus info / fast_info). Neither is an HTTP request count: live
+yfinance sends one request per ticker inside each history batch.
+
+    python scripts/benchmark_refresh.py                       # 100, 1,000, 10,000 tickers
+    python scripts/benchmark_refresh.py --sizes 100 500 --latency 0.01 --rate-limit-rate 0.02
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import process_investment_data as pid  # noqa: E402
+from scripts.data_sources import FakeMarketSource, synthetic_stock_dictionary  # noqa: E402
+from scripts.rate_limiter import TokenBucketLimiter  # noqa: E402
+from scripts.refresh_checkpoint import RefreshCheckpoint  # noqa: E402
+from scripts.response_cache import ResponseCache  # noqa: E402
+
+DEFAULT_SIZES = [100, 1_000, 10_000]
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(n_tickers, seed=0, years=2.0, latency=0.0, rate_limit_rate=0.0,
+                  batch_size=pid.HISTORY_BATCH_SIZE):
+    """
+    One full (non-incremental) refresh of n_tickers synthetic holdings.
+    Returns {"tickers", "batches", "calls", "rows", "history_s", "summary_s", "fundamentals_s"}.
+    """
+    source = FakeMarketSource(seed=seed, latency=latency, rate_limit_rate=rate_limit_rate)
+    pid.set_data_source(source)
+    # Pacing, caching and journaling are measured separately; here they'd only add noise
+    pid.YAHOO_LIMITER = TokenBucketLimiter(1e9, burst=1_000_000)
+    pid.RESPONSE_CACHE = ResponseCache(path=None)
+    pid.CHECKPOINT = RefreshCheckpoint(path=None)
+    pid.QUOTES = pid.QuoteStore()
+
+    stock_dict = synthetic_stock_dictionary(n_tickers, seed=seed, years=years)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        daily_df, history_s = _timed(pid.create_daily_stock_table, stock_dict, tmp / "daily_stocks",
+                                     True, batch_size=batch_size)
+        _, summary_s = _timed(pid.build_summary_dataframe, stock_dict, daily_df)
+        _, fundamentals_s = _timed(pid.create_stock_info_table, stock_dict, tmp / "stock_info.csv", True)
+
+    return {
+        "tickers": n_tickers,
+        "batches": source.batches,
+        "calls": source.requests,
+        "rows": len(daily_df),
+        "history_s": history_s,
+        "summary_s": summary_s,
+        "fundamentals_s": fundamentals_s,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the investment refresh offline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Portfolio sizes (ticker counts) to benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--years', type=float, default=2.0,
+                        help="Span of synthetic purchase history per ticker")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Simulated seconds per request")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                        help="Probability that a simulated request returns 429")
+    parser.add_argument('--batch-size', type=int, default=pid.HISTORY_BATCH_SIZE)
+    args = parser.parse_args()
+
+    results = []
+    for n in args.sizes:
+        print(f"--- {n:,} tickers ---")
+        results.append(run_benchmark(n, seed=args.seed, years=args.years, latency=args.latency,
+                                     rate_limit_rate=args.rate_limit_rate, batch_size=args.batch_size))
+
+    print()
+    print(f"{'tickers':>8} {'batches':>8} {'calls':>9} {'rows':>10} {'history':>9} {'summary':>9} "
+          f"{'fundamentals':>13}")
+    for r in results:
+        print(f"{r['tickers']:>8,} {r['batches']:>8,} {r['calls']:>9,} {r['rows']:>10,} {r['history_s']:>8.2f}s "
+              f"{r['summary_s']:>8.2f}s {r['fundamentals_s']:>12.2f}s")
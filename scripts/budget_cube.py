@@ -0,0 +1,251 @@
+"""
+Monthly budget rollup cube (data/budget_cube.parquet).
+
+process_budget_data.py aggregates income.csv / expenses.csv into one row per
+month × type × category, so the Budget Overview, Income and Expenses pages can
+answer their date-range and category filters by slicing a few hundred
+pre-aggregated rows instead of re-cleaning and re-grouping every transaction
+on each Streamlit rerun:
+
+    month       datetime64   first day of the month
+    type        category     "income" | "expense"
+    category    category     expense category / income source
+    total       float64      sum of amounts
+    count       int64        number of transactions
+    min, max    float64      smallest / largest single amount
+
+Sum, count, min and max all merge, so cubes built from separate chunks (one per
+sheet in --stream mode) combine exactly with merge_cubes(). The page filters
+are day-precise; rollup() takes whole months from the cube and recomputes only
+the partial months at either end of the range from the raw transactions.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from scripts.budget_store import coerce_amounts
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BUDGET_CUBE_PATH = PROJECT_ROOT / "data" / "budget_cube.parquet"
+
+CUBE_COLUMNS = ["month", "type", "category", "total", "count", "min", "max"]
+CUBE_TYPES = ["income", "expense"]
+
+# Column holding the category for each transaction type, after normalising
+# headers the way data_processing.normalize_basic_columns does
+CATEGORY_COLUMN = {"income": "source", "expense": "expense_category"}
+
+def prepare_transactions(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """
+    Typed [date, category, amount, description, merchant] frame from an
+    income or expense table, with either the CSV headers (Amount, Date,
+    Source / Expense_Category) or their lower-cased app equivalents; merchant
+    is empty unless the table has one (the typed expenses copy does). Rows without a
+    parseable date are dropped. Already-typed input (the Parquet copies from
+    scripts/budget_store.py) passes through without re-parsing.
+    """
+    columns = {str(c).strip().replace(" ", "_").lower(): c for c in df.columns}
+    category_col = columns.get(CATEGORY_COLUMN[kind], columns.get("category"))
+    if df.empty or "date" not in columns or "amount" not in columns or category_col is None:
+        return pd.DataFrame({
+            "date": pd.Series(dtype="datetime64[ns]"),
+            "category": pd.Series(dtype="object"),
+            "amount": pd.Series(dtype="float64"),
+            "description": pd.Series(dtype="object"),
+            "merchant": pd.Series(dtype="object"),
+        })
+
+    dates = df[columns["date"]]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors="coerce")
+    out = pd.DataFrame({
+        "date": dates,
+        "category": df[category_col],
+        "amount": coerce_amounts(df[columns["amount"]]),
+        "description": df[columns["description"]] if "description" in columns else None,
+        "merchant": df[columns["merchant"]] if "merchant" in columns else None,
+    })
+    return out.dropna(subset=["date"]).reset_index(drop=True)
+
+
+def _aggregate(transactions: pd.DataFrame, kind: str) -> pd.DataFrame:
+    if transactions.empty:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    month = transactions["date"].dt.to_period("M").dt.to_timestamp()
+    grouped = (
+        transactions.groupby([month.rename("month"), "category"], dropna=False, sort=True, observed=True)["amount"]
+            .agg(total="sum", count="count", min="min", max="max")
+            .reset_index()
+    )
+    grouped.insert(1, "type", kind)
+    return grouped[CUBE_COLUMNS]
+
+
+def _typed(cube: pd.DataFrame) -> pd.DataFrame:
+    cube = cube[CUBE_COLUMNS].copy()
+    cube["month"] = pd.to_datetime(cube["month"]).astype("datetime64[ns]")
+    cube["type"] = pd.Categorical(cube["type"], categories=CUBE_TYPES)
+    cube["category"] = cube["category"].astype(object).astype("category")
+    cube["total"] = cube["total"].astype("float64")
+    cube["count"] = cube["count"].astype("int64")
+    cube["min"] = cube["min"].astype("float64")
+    cube["max"] = cube["max"].astype("float64")
+    return cube.sort_values(["month", "type", "category"]).reset_index(drop=True)
+
+
+def empty_cube() -> pd.DataFrame:
+    return _typed(pd.DataFrame(columns=CUBE_COLUMNS))
+
+
+def build_budget_cube(expenses: pd.DataFrame, income: pd.DataFrame) -> pd.DataFrame:
+    """Month × type × category rollup of an expenses and an income table."""
+    parts = [
+        _aggregate(prepare_transactions(expenses, "expense"), "expense"),
+        _aggregate(prepare_transactions(income, "income"), "income"),
+    ]
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return empty_cube()
+    return _typed(pd.concat(parts, ignore_index=True))
+
+
+def merge_cubes(cubes: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Combines partial cubes covering the same or different months."""
+    parts = [c for c in cubes if c is not None and not c.empty]
+    if not parts:
+        return empty_cube()
+    stacked = pd.concat([p.astype({"type": str, "category": object}) for p in parts], ignore_index=True)
+    merged = (
+        stacked.groupby(["month", "type", "category"], dropna=False, sort=True)
+            .agg(total=("total", "sum"), count=("count", "sum"), min=("min", "min"), max=("max", "max"))
+            .reset_index()
+    )
+    return _typed(merged)
+
+
+def write_budget_cube(cube: pd.DataFrame, path: Path = BUDGET_CUBE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    _typed(cube).to_parquet(tmp_path, index=False, engine="pyarrow")
+    os.replace(tmp_path, path)
+
+
+def read_budget_cube(path: Path = BUDGET_CUBE_PATH) -> pd.DataFrame:
+    """The stored cube, or an empty typed cube if it hasn't been built yet."""
+    if not path.exists():
+        return empty_cube()
+    try:
+        return _typed(pd.read_parquet(path, engine="pyarrow"))
+    except Exception as e:
+        print(f"Error reading {path.name}: {e}")
+        return empty_cube()
+
+
+# ----------------- QUERIES ----------------- #
+
+def category_names(cube: pd.DataFrame, kind: str) -> list:
+    """Sorted category names present for one transaction type."""
+    names = cube.loc[cube["type"] == kind, "category"].dropna().astype(str).unique()
+    return sorted(names.tolist())
+
+
+def slice_cube(cube: pd.DataFrame, kind: str, months: Optional[tuple] = None,
+               categories: Optional[Iterable] = None) -> pd.DataFrame:
+    """Rows for one type, optionally limited to [first_month, last_month] and categories."""
+    mask = cube["type"] == kind
+    if months is not None:
+        first, last = months
+        if first is not None:
+            mask &= cube["month"] >= first
+        if last is not None:
+            mask &= cube["month"] <= last
+    if categories is not None:
+        mask &= cube["category"].isin(list(categories))
+    return cube.loc[mask]
+
+
+def _month_start(ts: pd.Timestamp) -> pd.Timestamp:
+    return ts.to_period("M").to_timestamp()
+
+
+def rollup(cube: pd.DataFrame, transactions: pd.DataFrame, kind: str, start=None, end=None,
+           categories: Optional[Iterable] = None) -> pd.DataFrame:
+    """
+    Cube rows for kind covering the inclusive day range [start, end], exact
+    to the day. Months lying wholly inside the range come from the cube; a
+    partially covered first / last month is re-aggregated from transactions
+    (prepared with prepare_transactions) restricted to the range.
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    # Whole months inside the range
+    first_full = None
+    partial = []
+    if start is not None:
+        first_full = _month_start(start)
+        if start != first_full:
+            partial.append(first_full)
+            first_full = first_full + pd.offsets.MonthBegin(1)
+    last_full = None
+    if end is not None:
+        last_full = _month_start(end)
+        if end.normalize() != last_full + pd.offsets.MonthEnd(0):
+            if last_full not in partial:
+                partial.append(last_full)
+            last_full = last_full - pd.offsets.MonthBegin(1)
+
+    parts = []
+    if first_full is None or last_full is None or first_full <= last_full:
+        parts.append(slice_cube(cube, kind, (first_full, last_full), categories))
+
+    if partial and not transactions.empty:
+        tx = transactions
+        month = tx["date"].dt.to_period("M").dt.to_timestamp()
+        mask = month.isin(partial)
+        if start is not None:
+            mask &= tx["date"] >= start
+        if end is not None:
+            mask &= tx["date"] < end.normalize() + pd.Timedelta(days=1)
+        if categories is not None:
+            mask &= tx["category"].isin(list(categories))
+        edge = _aggregate(tx.loc[mask], kind)
+        if not edge.empty:
+            parts.append(edge)
+
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return empty_cube()
+    return _typed(pd.concat([p.astype({"type": str, "category": object}) for p in parts], ignore_index=True))
+
+
+def monthly_totals(rolled: pd.DataFrame, value_name: str = "amount") -> pd.DataFrame:
+    """
+    [date, value_name] per month, with every month between the first and last
+    present (zero-filled), matching resample("MS").sum() on the transactions.
+    """
+    if rolled.empty:
+        return pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"),
+                             value_name: pd.Series(dtype="float64")})
+    totals = rolled.groupby("month")["total"].sum()
+    index = pd.date_range(totals.index.min(), totals.index.max(), freq="MS")
+    totals = totals.reindex(index, fill_value=0.0)
+    return pd.DataFrame({"date": totals.index, value_name: totals.to_numpy(dtype=np.float64)})
+
+
+def category_totals(rolled: pd.DataFrame) -> pd.DataFrame:
+    """[category, total, count] over the rolled-up months, largest total first."""
+    if rolled.empty:
+        return pd.DataFrame({"category": pd.Series(dtype="object"),
+                             "total": pd.Series(dtype="float64"),
+                             "count": pd.Series(dtype="int64")})
+    grouped = (
+        rolled.astype({"category": object})
+            .groupby("category", dropna=False)[["total", "count"]].sum()
+            .reset_index()
+    )
+    return grouped.sort_values("total", ascending=False).reset_index(drop=True)
@@ -0,0 +1,166 @@
+"""
+Typed Parquet copies of income.csv / expenses.csv (data/income.parquet,
+data/expenses.parquet).
+
+The CSVs store amounts and dates as loosely formatted text, so every reader
+used to regex-scrub amounts and re-parse dates with errors="coerce". The budget
+processor now normalises each table once at ingestion and writes it next to
+the CSV with fixed column types:
+
+    Amount              float64      dollars, rounded to cents
+    Date                datetime64   (rows without a valid date are dropped)
+    Expense_Category    category     expenses only
+    Source              category     income only
+    Description         string       expenses only
+    Merchant            category     expenses only (scripts/merchants.py)
+
+The schema version is stored in the Parquet footer metadata. A reader that
+finds a different version (or no file) gets None and falls back to the CSV,
+so the app keeps working across upgrades. The CSVs are still written for
+humans and for tests/test_data_integrity.py.
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scripts.merchants import MerchantResolver
+
+SCHEMA_VERSION = 2
+SCHEMA_VERSION_KEY = b"budget_schema_version"
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+ARROW_SCHEMAS = {
+    "expense": pa.schema([
+        ("Amount", pa.float64()),
+        ("Date", pa.timestamp("ns")),
+        ("Expense_Category", _CATEGORY),
+        ("Description", pa.string()),
+        ("Merchant", _CATEGORY),
+    ]),
+    "income": pa.schema([
+        ("Source", _CATEGORY),
+        ("Amount", pa.float64()),
+        ("Date", pa.timestamp("ns")),
+    ]),
+}
+CATEGORY_COLUMNS = {"expense": "Expense_Category", "income": "Source"}
+
+
+def parquet_path_for(csv_path: Path) -> Path:
+    """The typed copy that sits next to a transactions CSV."""
+    return csv_path.with_suffix(".parquet")
+
+
+def coerce_amounts(values: pd.Series) -> pd.Series:
+    """
+    Amounts as float64: '$1,234.56', '1,234' and '(500.00)' become numbers and
+    anything unparseable becomes 0, as utils.clean_amount_column does. Numeric
+    input skips the string scrub.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype("float64").fillna(0.0)
+    s = values.astype(str)
+    s = s.str.replace(r"[$,]", "", regex=True)
+    s = s.str.replace(r"^\((.*)\)$", r"-\1", regex=True)
+    return pd.to_numeric(s, errors="coerce").fillna(0.0).astype("float64")
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    return values.where(values.isna(), values.astype(str))
+
+
+def to_typed_transactions(df: pd.DataFrame, kind: str, merchants: Optional[MerchantResolver] = None) -> pd.DataFrame:
+    """
+    Casts a processor-shaped expenses / income frame to the stored schema.
+    Expense merchants are resolved from Description with merchants (an
+    in-memory resolver when None) unless df already has a Merchant column.
+    """
+    schema = ARROW_SCHEMAS[kind]
+    if df.empty:
+        return schema.empty_table().to_pandas()
+    if merchants is None:
+        merchants = MerchantResolver()
+    out = pd.DataFrame(index=df.index)
+    for field in schema:
+        name = field.name
+        col = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if name == "Merchant" and name not in df.columns:
+            descriptions = df["Description"] if "Description" in df.columns else col
+            out[name] = merchants.resolve(descriptions).astype("category")
+        elif name == "Amount":
+            out[name] = coerce_amounts(col).round(2)
+        elif name == "Date":
+            out[name] = pd.to_datetime(col, errors="coerce").astype("datetime64[ns]")
+        elif name in (CATEGORY_COLUMNS[kind], "Merchant"):
+            out[name] = _as_text(col).astype("category")
+        else:
+            out[name] = _as_text(col).astype(object)
+    return out.dropna(subset=["Date"]).reset_index(drop=True)
+
+
+def _to_table(typed: pd.DataFrame, kind: str) -> pa.Table:
+    schema = ARROW_SCHEMAS[kind].with_metadata({SCHEMA_VERSION_KEY: str(SCHEMA_VERSION).encode()})
+    return pa.Table.from_pandas(typed, schema=schema, preserve_index=False)
+
+
+def write_typed_transactions(df: pd.DataFrame, kind: str, path: Path,
+                             merchants: Optional[MerchantResolver] = None) -> pd.DataFrame:
+    """Writes the typed copy (temp file + rename). Returns the typed frame."""
+    typed = to_typed_transactions(df, kind, merchants)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    pq.write_table(_to_table(typed, kind), tmp_path)
+    os.replace(tmp_path, path)
+    return typed
+
+
+class TypedTransactionWriter:
+    """
+    Appends typed chunks to a Parquet file one row group at a time (used by
+    --stream mode). The file only replaces path on close().
+    """
+
+    def __init__(self, path: Path, kind: str, merchants: Optional[MerchantResolver] = None):
+        self.path = path
+        self.kind = kind
+        self.merchants = merchants if merchants is not None else MerchantResolver()
+        self._tmp_path = path.with_suffix(".parquet.tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(self._tmp_path, _to_table(to_typed_transactions(pd.DataFrame(), kind),
+                                                                  kind).schema)
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        typed = to_typed_transactions(chunk, self.kind, self.merchants)
+        if not typed.empty:
+            self._writer.write_table(_to_table(typed, self.kind))
+
+    def close(self) -> None:
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        self._writer.close()
+        if self._tmp_path.exists():
+            self._tmp_path.unlink()
+
+
+def read_typed_transactions(path: Path) -> Optional[pd.DataFrame]:
+    """
+    The typed table, or None when the file is missing, unreadable or written
+    under a different schema version.
+    """
+    if not path.exists():
+        return None
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(SCHEMA_VERSION_KEY) != str(SCHEMA_VERSION).encode():
+            return None
+        return pd.read_parquet(path, engine="pyarrow")
+    except Exception as e:
+        print(f"Error reading {path.name}: {e}")
+        return None
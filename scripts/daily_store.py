@@ -0,0 +1,167 @@
+"""
+Parquet-backed store for the per-day holdings history (formerly daily_stocks.csv).
+
+Layout — one hive partition per ticker, so a refresh rewrites only the tickers
+whose rows actually changed and readers can push ticker/date filters down to
+the file level instead of parsing the whole history as text:
+
+    data/daily_stocks/
+        _manifest.json               ticker → {"rows", "last_date", "digest"}
+        Stock=AAPL/part-0.parquet
+        Stock=MSFT/part-0.parquet
+        ...
+
+Columns are typed on disk: Date is datetime64, numeric columns are float32 and
+Stock comes back as a categorical (it is the partition key).
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STORE_DIR = PROJECT_ROOT / "data" / "daily_stocks"
+
+MANIFEST_NAME = "_manifest.json"
+PARTITION_KEY = "Stock"
+PART_FILE = "part-0.parquet"
+
+# Canonical column order (matches the old CSV so downstream code is unchanged)
+COLUMNS = ["Date", "Close", "Stock", "Shares_Held", "Avg_Cost", "Equity",
+           "Market_Value", "Total_Profit", "Daily_Profit", "Daily_Pct_Profit"]
+FLOAT_COLUMNS = [c for c in COLUMNS if c not in ("Date", "Stock")]
+
+
+def _partition_dir(store_dir: Path, ticker: str) -> Path:
+    return store_dir / f"{PARTITION_KEY}={quote(str(ticker), safe='')}"
+
+
+def _to_storage_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Date → datetime64, numerics → float32, sorted by date; drops the partition key."""
+    out = df.drop(columns=[PARTITION_KEY], errors="ignore").copy()
+    out["Date"] = pd.to_datetime(out["Date"])
+    for c in FLOAT_COLUMNS:
+        if c in out.columns:
+            out[c] = pd.to_numeric(out[c], errors="coerce").astype("float32")
+    return out.sort_values("Date").reset_index(drop=True)
+
+
+def _digest(df: pd.DataFrame) -> str:
+    return str(int(pd.util.hash_pandas_object(df, index=False).sum()))
+
+
+def legacy_csv_path(store_dir: Path = STORE_DIR) -> Path:
+    """The pre-Parquet CSV sitting next to a store (data/daily_stocks.csv)."""
+    return store_dir.parent / f"{store_dir.name}.csv"
+
+
+def store_exists(store_dir: Path = STORE_DIR) -> bool:
+    return (store_dir / MANIFEST_NAME).exists()
+
+
+def read_manifest(store_dir: Path = STORE_DIR) -> Dict[str, dict]:
+    """Returns {ticker: {"rows", "last_date", "digest"}} or {} if the store is empty."""
+    try:
+        with open(store_dir / MANIFEST_NAME, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_daily_stocks(df: pd.DataFrame, store_dir: Path = STORE_DIR, prune: bool = False) -> List[str]:
+    """
+    Writes the holdings history, one partition per ticker, skipping any ticker
+    whose content digest matches the manifest (nothing changed since last run).
+    prune=True also deletes partitions for tickers absent from df (full rebuild).
+    Each file is written to a temp name and renamed, so a crash mid-refresh
+    never leaves a half-written partition behind.
+    Returns the list of tickers whose partitions were (re)written.
+    """
+    store_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(store_dir)
+    written = []
+
+    for ticker, group in df.groupby(PARTITION_KEY, sort=True, observed=True):
+        ticker = str(ticker)
+        typed = _to_storage_types(group)
+        digest = _digest(typed)
+        if manifest.get(ticker, {}).get("digest") == digest:
+            continue
+        part_dir = _partition_dir(store_dir, ticker)
+        part_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = part_dir / f".{PART_FILE}.tmp"
+        typed.to_parquet(tmp_path, index=False, engine="pyarrow")
+        os.replace(tmp_path, part_dir / PART_FILE)
+        manifest[ticker] = {
+            "rows": len(typed),
+            "last_date": typed["Date"].max().strftime("%Y-%m-%d"),
+            "digest": digest,
+        }
+        written.append(ticker)
+
+    removed = []
+    if prune:
+        keep = set(df[PARTITION_KEY].astype(str).unique())
+        for ticker in [t for t in manifest if t not in keep]:
+            shutil.rmtree(_partition_dir(store_dir, ticker), ignore_errors=True)
+            manifest.pop(ticker)
+            removed.append(ticker)
+
+    if written or removed or not (store_dir / MANIFEST_NAME).exists():
+        tmp_manifest = store_dir / f".{MANIFEST_NAME}.tmp"
+        with open(tmp_manifest, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_manifest, store_dir / MANIFEST_NAME)
+
+    return written
+
+
+def widen_floats(df: pd.DataFrame) -> pd.DataFrame:
+    """Upcasts the float32 storage columns to float64 for in-memory arithmetic."""
+    cols = [c for c in FLOAT_COLUMNS if c in df.columns]
+    if cols:
+        df[cols] = df[cols].astype("float64")
+    return df
+
+
+def read_daily_stocks(
+    store_dir: Path = STORE_DIR,
+    tickers: Optional[Iterable[str]] = None,
+    start=None,
+    end=None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Reads the holdings history with optional ticker / date-range / column
+    pushdown. Ticker filters prune whole partitions; date filters use the
+    Parquet row-group statistics. Returns an empty frame with the canonical
+    columns when the store is missing.
+    """
+    if not store_exists(store_dir) or not read_manifest(store_dir):
+        return pd.DataFrame(columns=columns or COLUMNS)
+
+    filters = []
+    if tickers is not None:
+        tickers = [str(t) for t in tickers]
+        if not tickers:
+            return pd.DataFrame(columns=columns or COLUMNS)
+        filters.append((PARTITION_KEY, "in", tickers))
+    if start is not None:
+        filters.append(("Date", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("Date", "<=", pd.Timestamp(end)))
+
+    df = pd.read_parquet(
+        store_dir,
+        engine="pyarrow",
+        columns=columns,
+        filters=filters or None,
+    )
+    ordered = [c for c in (columns or COLUMNS) if c in df.columns]
+    ordered += [c for c in df.columns if c not in ordered]
+    return df[ordered]
@@ -2,7 +2,7 @@ import json
 import numpy as np
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 import pandas as pd
 import streamlit as st
 import yfinance as yf
@@ -13,9 +13,19 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from scripts.budget_cube import BUDGET_CUBE_PATH, build_budget_cube, prepare_transactions, read_budget_cube
+from scripts.budget_store import parquet_path_for, read_typed_transactions
 from scripts.config import RUN_MODE
+from scripts.expense_search import ExpenseSearchIndex
+from scripts.indicator_store import INDICATOR_FILE, read_indicators
+from scripts.indicators import wilder_rsi
+from scripts.merchants import MERCHANT_CACHE_PATH, MerchantResolver
+from scripts.price_matrix import PriceMatrices, build_price_matrices
+from scripts.returns import build_return_anchors
+from scripts.daily_store import MANIFEST_NAME, read_daily_stocks, store_exists, widen_floats
 
 DATA_DIR = PROJECT_ROOT / "data"
+DAILY_STOCKS_STORE_DIR = DATA_DIR / "daily_stocks"
 
 # ----- SCHEMA DEFINITIONS (For Empty State) -----
 # These ensure that if a file is missing, we return a DF with the right columns
@@ -50,6 +60,42 @@ def safe_read_csv(file_path: Path, schema_key: str) -> pd.DataFrame:
         return pd.DataFrame(columns=expected_cols)
 
 
+def read_transactions(csv_path: Path, schema_key: str) -> pd.DataFrame:
+    """
+    Reads income / expenses from the typed Parquet copy written by
+    process_budget_data.py (float amounts, datetime dates, categorical
+    categories — nothing to re-clean), falling back to the CSV when the copy is
+    missing, from another schema version, or older than the CSV.
+    """
+    typed_path = parquet_path_for(csv_path)
+    if typed_path.exists() and (not csv_path.exists()
+                                or typed_path.stat().st_mtime >= csv_path.stat().st_mtime):
+        typed = read_typed_transactions(typed_path)
+        if typed is not None:
+            return typed if not typed.empty else pd.DataFrame(columns=EMPTY_SCHEMAS[schema_key])
+    return safe_read_csv(csv_path, schema_key)
+
+
+def read_daily_stocks_data(store_dir: Path = DAILY_STOCKS_STORE_DIR) -> pd.DataFrame:
+    """
+    Reads the daily holdings history from the Parquet store (typed columns, no
+    text parsing), falling back to the legacy daily_stocks.csv before the first
+    refresh has migrated it. Tickers are returned as plain strings so existing
+    groupby/merge call sites keep their semantics; floats are widened to float64
+    so portfolio-level sums don't accumulate float32 rounding.
+    """
+    if store_exists(store_dir):
+        try:
+            df = read_daily_stocks(store_dir)
+            if df.empty:
+                return pd.DataFrame(columns=EMPTY_SCHEMAS["daily_stocks"])
+            df["Stock"] = df["Stock"].astype(str)
+            return widen_floats(df)
+        except Exception as e:
+            print(f"Error reading daily history store: {e}")
+    return safe_read_csv(store_dir.parent / "daily_stocks.csv", "daily_stocks")
+
+
 # ----- Helpers -----
 
 def normalize_basic_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -122,50 +168,149 @@ def normalize_stock_info_columns(df: pd.DataFrame) -> pd.DataFrame:
 
 # ----- Data loading function -----
 
-@st.cache_data(ttl=1800, show_spinner=False)
-def load_main_data() -> Dict[str, Any]:
+def _read_stock_dictionary() -> Dict[str, Any]:
+    path = DATA_DIR / "stock_dictionary.json"
+    if path.exists():
+        try:
+            with path.open("r") as file:
+                return json.load(file)
+        except Exception:
+            pass
+    return {}
+
+
+def _read_stored_budget_cube() -> Optional[pd.DataFrame]:
+    return read_budget_cube_if_current(BUDGET_CUBE_PATH, [DATA_DIR / "expenses.csv", DATA_DIR / "income.csv"])
+
+
+def file_fingerprint(path: Path) -> tuple:
+    """(name, mtime_ns, size) of a file, or (name, None) if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return (path.name, None)
+    return (path.name, stat.st_mtime_ns, stat.st_size)
+
+
+# One reader per raw dataset. load_main_data() reads them all; load_dataset()
+# reads each one only when a page first needs it.
+RAW_READERS = {
+    "stocks": lambda: normalize_basic_columns(safe_read_csv(DATA_DIR / "stocks.csv", "stocks")),
+    "stock_info": lambda: normalize_stock_info_columns(safe_read_csv(DATA_DIR / "stock_info.csv", "stock_info")),
+    "daily_stocks": lambda: normalize_basic_columns(read_daily_stocks_data()),
+    "indicators": lambda: read_indicators(DAILY_STOCKS_STORE_DIR),
+    "stock_dictionary": _read_stock_dictionary,
+    "expenses": lambda: normalize_basic_columns(read_transactions(DATA_DIR / "expenses.csv", "expenses")),
+    "income": lambda: normalize_basic_columns(read_transactions(DATA_DIR / "income.csv", "income")),
+    "monthly_budget": lambda: normalize_basic_columns(safe_read_csv(DATA_DIR / "monthly_budget.csv", "monthly_budget")),
+    "budget_cube": _read_stored_budget_cube,
+}
+
+def _transaction_files(name: str) -> list:
+    csv_path = DATA_DIR / f"{name}.csv"
+    return [csv_path, parquet_path_for(csv_path)]
+
+
+# Files each raw dataset is read from. Cached tables are keyed on the
+# fingerprints of these files, so they stay valid until an input actually
+# changes (an in-app refresh, or a processor run from the terminal) and a
+# change only invalidates the datasets built from that file.
+RAW_SOURCES = {
+    "stocks": lambda: [DATA_DIR / "stocks.csv"],
+    "stock_info": lambda: [DATA_DIR / "stock_info.csv"],
+    "daily_stocks": lambda: [DAILY_STOCKS_STORE_DIR / MANIFEST_NAME, DATA_DIR / "daily_stocks.csv"],
+    # Only used while it matches the daily history; otherwise RSI is computed from it
+    "indicators": lambda: [DAILY_STOCKS_STORE_DIR / INDICATOR_FILE, *RAW_SOURCES["daily_stocks"]()],
+    "stock_dictionary": lambda: [DATA_DIR / "stock_dictionary.json"],
+    "expenses": lambda: _transaction_files("expenses"),
+    "income": lambda: _transaction_files("income"),
+    "monthly_budget": lambda: [DATA_DIR / "monthly_budget.csv"],
+    # The stored cube is only used while it's newer than the transactions
+    "budget_cube": lambda: [BUDGET_CUBE_PATH, *_transaction_files("expenses"), *_transaction_files("income")],
+}
+
+
+def sources_fingerprint(names) -> tuple:
+    """Fingerprints of the files behind the given raw datasets."""
+    return tuple(tuple(file_fingerprint(path) for path in RAW_SOURCES[name]()) for name in names)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _load_main_data(fingerprint: tuple) -> Dict[str, Any]:
     if RUN_MODE == "testing":
         print(f"Project Root Dir: {PROJECT_ROOT}")
         print(f"Data Dir: {DATA_DIR}")
 
-    # USE SAFE READ
-    stocks = safe_read_csv(DATA_DIR / "stocks.csv", "stocks")
-    stocks = normalize_basic_columns(stocks)
+    return {name: reader() for name, reader in RAW_READERS.items()}
 
-    daily_stocks = safe_read_csv(DATA_DIR / "daily_stocks.csv", "daily_stocks")
-    daily_stocks = normalize_basic_columns(daily_stocks)
 
-    expenses = safe_read_csv(DATA_DIR / "expenses.csv", "expenses")
-    expenses = normalize_basic_columns(expenses)
+def load_main_data() -> Dict[str, Any]:
+    """Every raw dataset, re-read only when one of the source files changes."""
+    return _load_main_data(sources_fingerprint(RAW_READERS))
 
-    income = safe_read_csv(DATA_DIR / "income.csv", "income")
-    income = normalize_basic_columns(income)
 
-    monthly_budget = safe_read_csv(DATA_DIR / "monthly_budget.csv", "monthly_budget")
-    monthly_budget = normalize_basic_columns(monthly_budget)
+def read_budget_cube_if_current(cube_path: Path, sources) -> Optional[pd.DataFrame]:
+    """
+    The stored budget cube, or None when it is missing or older than any of
+    the transaction CSVs it summarises (preprocess_data then rebuilds it).
+    """
+    if not cube_path.exists():
+        return None
+    cube_mtime = cube_path.stat().st_mtime
+    if any(src.exists() and src.stat().st_mtime > cube_mtime for src in sources):
+        return None
+    cube = read_budget_cube(cube_path)
+    return None if cube.empty else cube
 
-    stock_info_raw = safe_read_csv(DATA_DIR / "stock_info.csv", "stock_info")
-    stock_info = normalize_stock_info_columns(stock_info_raw)
 
-    stock_dictionary = {}
-    if (DATA_DIR / "stock_dictionary.json").exists():
-        try:
-            with (DATA_DIR / "stock_dictionary.json").open("r") as file:
-                stock_dictionary = json.load(file)
-        except Exception:
-            pass
+def build_expense_transactions(expenses: pd.DataFrame) -> pd.DataFrame:
+    """Typed expense rows (prepare_transactions) with a merchant per row."""
+    expense_transactions = prepare_transactions(expenses, "expense")
+    if not expense_transactions.empty and expense_transactions["merchant"].isna().all():
+        # Read from the CSV (no typed copy yet): resolve with the processor's cache
+        expense_transactions["merchant"] = MerchantResolver(MERCHANT_CACHE_PATH).resolve(
+            expense_transactions["description"])
+    return expense_transactions
+
+
+def build_income_transactions(income: pd.DataFrame) -> pd.DataFrame:
+    return prepare_transactions(income, "income")
+
 
+def _budget_views(raw_data: Dict[str, Any], expenses: pd.DataFrame, income: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Typed transactions plus the month × category rollup the budget pages
+    slice (see scripts/budget_cube.py). Computed once per data load rather
+    than on every page rerun.
+    """
+    budget_cube = raw_data.get("budget_cube")
+    if budget_cube is None:
+        budget_cube = build_budget_cube(expenses, income)
     return {
-        "stocks": stocks,
-        "stock_info": stock_info,
-        "daily_stocks": daily_stocks,
-        "stock_dictionary": stock_dictionary,
-        "expenses": expenses,
-        "income": income,
-        "monthly_budget": monthly_budget
+        "expense_transactions": build_expense_transactions(expenses),
+        "income_transactions": build_income_transactions(income),
+        "budget_cube": budget_cube,
     }
 
 
+@st.cache_resource(show_spinner=False)
+def _expense_search_index() -> ExpenseSearchIndex:
+    return ExpenseSearchIndex()
+
+
+def get_expense_search_index(expense_transactions: pd.DataFrame) -> ExpenseSearchIndex:
+    """
+    The shared description index (scripts/expense_search.py), pointed at the
+    rows of expense_transactions. It is kept across reruns and sessions and
+    only re-synced when expenses.csv / expenses.parquet change on disk, and
+    then only new descriptions are tokenised.
+    """
+    version = (dataset_fingerprint("expense_transactions"), len(expense_transactions))
+    index = _expense_search_index()
+    index.update(expense_transactions["description"], version=version)
+    return index
+
+
 # ----- MARKET CONTEXT -----
 
 @st.cache_data(ttl=3600, show_spinner=False)
@@ -195,20 +340,6 @@ def load_market_context() -> Dict[str, float]:
     }
 
 
-# ----- HELPERS -----
-
-def _compute_rsi(closes: pd.Series, period: int = 14) -> float:
-    """Wilder's RSI computed from a Series of closing prices.
-    Returns 50.0 (neutral) when fewer than period+1 data points are available."""
-    if len(closes) < period + 1:
-        return 50.0
-    delta = closes.diff()
-    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
-    loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
-    rs = gain / loss.replace(0, 1e-10)
-    return float((100 - 100 / (1 + rs)).iloc[-1])
-
-
 # ----- SCORING LOGIC -----
 
 def calculate_buying_opportunity_scores(
@@ -316,38 +447,56 @@ def calculate_buying_opportunity_scores(
     return df.sort_values("buy_score", ascending=False)
 
 
-def preprocess_data(raw_data: Dict[str, Any]) -> Dict[str, Any]:
-    stocks = raw_data["stocks"].copy()
-    stock_info = raw_data["stock_info"].copy()
-    daily_stocks = raw_data["daily_stocks"].copy()
-    expenses = raw_data["expenses"].copy()
-    income = raw_data["income"].copy()
-    monthly_budget = raw_data.get("monthly_budget", pd.DataFrame()).copy()
+# ----- PREPROCESSING STAGES -----
+# preprocess_data() runs every stage; the dataset registry below runs only the
+# stages a page asks for.
 
-    # --- SAFETY CHECKS ---
-    # Return early if critical data is missing to avoid crashes
-    if stocks.empty and daily_stocks.empty:
-        return {
-            "stocks": stocks, "daily_stocks": daily_stocks, "stock_info": stock_info,
-            "expenses": expenses, "income": income, "monthly_budget": monthly_budget,
-            "stock_dictionary": raw_data["stock_dictionary"],
-            "stocks_complete": pd.DataFrame(), "daily_equity": pd.DataFrame(),
-            "todays_stocks": pd.DataFrame(), "todays_stocks_complete": pd.DataFrame(),
-            "daily_gainers": pd.DataFrame(), "daily_losers": pd.DataFrame(),
-            "sector_values": pd.DataFrame(), "industry_values": pd.DataFrame(),
-            "cap_sizes": pd.DataFrame(), "rebuying_opportunities": pd.DataFrame(),
-            "buying_opportunities": pd.DataFrame()
-        }
-
-    # ----- Stocks Preprocessing -----
+def held_stocks(stocks: pd.DataFrame) -> pd.DataFrame:
+    """Current holdings (quantity > 0)."""
     if not stocks.empty and "quantity" in stocks.columns:
-        stocks = stocks[stocks["quantity"] > 0]
+        return stocks[stocks["quantity"] > 0]
+    return stocks
+
 
-    # ----- Merges -----
-    stock_names = None
+def _stock_names(stocks: pd.DataFrame) -> Optional[pd.DataFrame]:
     if not stocks.empty and {"stock", "company"}.issubset(stocks.columns):
-        stock_names = stocks[["stock", "company"]].drop_duplicates()
+        return stocks[["stock", "company"]].drop_duplicates()
+    return None
+
+
+def _attach_indicators(stocks_complete: pd.DataFrame, daily_stocks: Optional[pd.DataFrame],
+                       indicators: Optional[pd.DataFrame]) -> pd.DataFrame:
+    # RSI-14, SMA-50/200, 20-day volatility and MACD per ticker, read from the
+    # indicator state process_investment_data.py keeps current
+    # (scripts/indicator_store.py). When that state is missing or stale, only
+    # RSI is computed from daily_stocks, in one vectorised pass over every
+    # ticker's trailing window (scripts/indicators.py).
+    # Watchlist stocks without history default to RSI 50 (neutral) in scoring.
+    if stocks_complete.empty or "stock" not in stocks_complete.columns:
+        return stocks_complete
+    if indicators is not None and not indicators.empty:
+        indicator_df = indicators.copy()
+        indicator_df["rsi_14"] = indicator_df["rsi_14"].round(2)
+    elif (daily_stocks is not None and not daily_stocks.empty
+            and "stock" in daily_stocks.columns
+            and "close" in daily_stocks.columns):
+        rsi = wilder_rsi(daily_stocks, period=14).round(2)
+        if rsi.empty:
+            return stocks_complete
+        indicator_df = rsi.rename("rsi_14").rename_axis("stock").reset_index()
+    else:
+        return stocks_complete
+
+    overlap = [c for c in indicator_df.columns if c in stocks_complete.columns and c != "stock"]
+    stocks_complete = stocks_complete.drop(columns=overlap).merge(indicator_df, on="stock", how="left")
+    stocks_complete["rsi_14"] = stocks_complete["rsi_14"].fillna(50.0)
+    return stocks_complete
+
 
+def build_stocks_complete(stocks: pd.DataFrame, stock_info: pd.DataFrame,
+                          daily_stocks: Optional[pd.DataFrame],
+                          indicators: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Holdings merged with fundamentals, technical indicators and invested capital."""
     if not stocks.empty and not stock_info.empty:
         # Drop columns from stock_info that already exist in stocks (price, 52_week_high, etc.)
         # to prevent pandas from creating _x/_y suffixes that break the scoring function.
@@ -358,59 +507,92 @@ def preprocess_data(raw_data: Dict[str, Any]) -> Dict[str, Any]:
     else:
         stocks_complete = stocks.copy()
 
-    # Compute RSI per ticker from daily_stocks price history — no API calls needed.
-    # Owned stocks get real 14-day RSI; watchlist stocks default to 50 (neutral) in scoring.
-    if (not daily_stocks.empty
-            and "stock" in daily_stocks.columns
-            and "close" in daily_stocks.columns
-            and not stocks_complete.empty
-            and "stock" in stocks_complete.columns):
-        rsi_rows = []
-        sort_col = "date" if "date" in daily_stocks.columns else None
-        for ticker, grp in daily_stocks.groupby("stock"):
-            closes = (
-                grp.sort_values(sort_col)["close"].reset_index(drop=True)
-                if sort_col else grp["close"].reset_index(drop=True)
-            )
-            rsi_rows.append({"stock": ticker, "rsi_14": round(_compute_rsi(closes), 2)})
-        if rsi_rows:
-            rsi_df = pd.DataFrame(rsi_rows)
-            if "rsi_14" in stocks_complete.columns:
-                stocks_complete = stocks_complete.drop(columns=["rsi_14"])
-            stocks_complete = stocks_complete.merge(rsi_df, on="stock", how="left")
-            stocks_complete["rsi_14"] = stocks_complete["rsi_14"].fillna(50.0)
+    stocks_complete = _attach_indicators(stocks_complete, daily_stocks, indicators)
 
     # Add invested column if missing
     if "invested" not in stocks_complete.columns and "quantity" in stocks_complete.columns:
         avg_cost_col = stocks_complete["avg_cost"] if "avg_cost" in stocks_complete.columns else 0
         stocks_complete["invested"] = stocks_complete["quantity"] * avg_cost_col
+    return stocks_complete
+
 
-    # ----- Daily Stocks -----
+def build_daily_stocks_complete(daily_stocks: pd.DataFrame, stocks: pd.DataFrame) -> pd.DataFrame:
+    """Daily history with company names and a parsed datetime column."""
     daily_stocks_complete = daily_stocks.copy()
+    stock_names = _stock_names(stocks)
     if stock_names is not None and not daily_stocks.empty and "stock" in daily_stocks.columns:
         daily_stocks_complete = pd.merge(daily_stocks, stock_names, on="stock", how="left")
 
     if "date" in daily_stocks_complete.columns:
         daily_stocks_complete["datetime"] = pd.to_datetime(daily_stocks_complete["date"])
+    return daily_stocks_complete
 
-    # ----- Daily Equity -----
+
+def build_daily_equity(daily_stocks_complete: pd.DataFrame) -> pd.DataFrame:
+    """Portfolio market value, equity and profit per day."""
     daily_equity = pd.DataFrame()
     if not daily_stocks_complete.empty and {"date", "market_value", "equity"}.issubset(daily_stocks_complete.columns):
         daily_equity = daily_stocks_complete.groupby("date")[["market_value", "equity"]].sum().reset_index()
         daily_equity["total_profit"] = daily_equity["market_value"] - daily_equity["equity"]
+    return daily_equity
+
 
-    # ----- Today's Stocks -----
-    todays_stocks = pd.DataFrame()
-    todays_stocks_complete = pd.DataFrame()
+def build_todays_stocks(daily_stocks_complete: pd.DataFrame) -> pd.DataFrame:
+    """Rows for the most recent day in the history."""
     if not daily_stocks_complete.empty and "datetime" in daily_stocks_complete.columns:
         max_date = daily_stocks_complete["datetime"].max()
-        todays_stocks = daily_stocks_complete[daily_stocks_complete["datetime"] == max_date].copy()
-        # Enrich with fundamentals (sector, industry, pe_ratio, etc.) from stocks_complete
-        if not todays_stocks.empty and not stocks_complete.empty and "stock" in todays_stocks.columns:
-            fund_cols = [c for c in stocks_complete.columns if c not in todays_stocks.columns] + ["stock"]
-            todays_stocks_complete = pd.merge(todays_stocks, stocks_complete[fund_cols], on="stock", how="left")
-        else:
-            todays_stocks_complete = todays_stocks.copy()
+        return daily_stocks_complete[daily_stocks_complete["datetime"] == max_date].copy()
+    return pd.DataFrame()
+
+
+def build_todays_stocks_complete(todays_stocks: pd.DataFrame, stocks_complete: pd.DataFrame) -> pd.DataFrame:
+    """Today's rows enriched with fundamentals (sector, industry, pe_ratio, etc.)."""
+    if todays_stocks.empty:
+        return pd.DataFrame()
+    if not stocks_complete.empty and "stock" in todays_stocks.columns:
+        fund_cols = [c for c in stocks_complete.columns if c not in todays_stocks.columns] + ["stock"]
+        return pd.merge(todays_stocks, stocks_complete[fund_cols], on="stock", how="left")
+    return todays_stocks.copy()
+
+
+def build_group_values(stocks_complete: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Market value summed per sector / industry."""
+    if not stocks_complete.empty and column in stocks_complete.columns:
+        return stocks_complete.groupby(column)["market_value"].sum().reset_index()
+    return pd.DataFrame()
+
+
+def preprocess_data(raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    stocks = raw_data["stocks"].copy()
+    stock_info = raw_data["stock_info"].copy()
+    daily_stocks = raw_data["daily_stocks"].copy()
+    expenses = raw_data["expenses"].copy()
+    income = raw_data["income"].copy()
+    monthly_budget = raw_data.get("monthly_budget", pd.DataFrame()).copy()
+    budget_views = _budget_views(raw_data, expenses, income)
+
+    # --- SAFETY CHECKS ---
+    # Return early if critical data is missing to avoid crashes
+    if stocks.empty and daily_stocks.empty:
+        return {
+            "stocks": stocks, "daily_stocks": daily_stocks, "stock_info": stock_info,
+            "expenses": expenses, "income": income, "monthly_budget": monthly_budget,
+            "stock_dictionary": raw_data["stock_dictionary"],
+            "stocks_complete": pd.DataFrame(), "daily_equity": pd.DataFrame(),
+            "todays_stocks": pd.DataFrame(), "todays_stocks_complete": pd.DataFrame(),
+            "daily_gainers": pd.DataFrame(), "daily_losers": pd.DataFrame(),
+            "sector_values": pd.DataFrame(), "industry_values": pd.DataFrame(),
+            "cap_sizes": pd.DataFrame(), "rebuying_opportunities": pd.DataFrame(),
+            "buying_opportunities": pd.DataFrame(),
+            **budget_views,
+        }
+
+    stocks = held_stocks(stocks)
+    stocks_complete = build_stocks_complete(stocks, stock_info, daily_stocks, raw_data.get("indicators"))
+    daily_stocks_complete = build_daily_stocks_complete(daily_stocks, stocks)
+    daily_equity = build_daily_equity(daily_stocks_complete)
+    todays_stocks = build_todays_stocks(daily_stocks_complete)
+    todays_stocks_complete = build_todays_stocks_complete(todays_stocks, stocks_complete)
 
     # ----- Buying Ops (deferred to Buying_Opportunities.py) -----
     # Scoring is computed on demand by Buying_Opportunities.py, which calls
@@ -420,15 +602,6 @@ def preprocess_data(raw_data: Dict[str, Any]) -> Dict[str, Any]:
     rebuy_df = pd.DataFrame()
     new_buy_df = pd.DataFrame()
 
-    # ----- Aggregates -----
-    sector_values = pd.DataFrame()
-    industry_values = pd.DataFrame()
-    if not stocks_complete.empty:
-        if "sector" in stocks_complete.columns:
-            sector_values = stocks_complete.groupby("sector")["market_value"].sum().reset_index()
-        if "industry" in stocks_complete.columns:
-            industry_values = stocks_complete.groupby("industry")["market_value"].sum().reset_index()
-
     return {
         "stocks": stocks,
         "daily_stocks": daily_stocks,
@@ -444,22 +617,118 @@ def preprocess_data(raw_data: Dict[str, Any]) -> Dict[str, Any]:
         "todays_stocks_complete": todays_stocks_complete,
         "daily_gainers": pd.DataFrame(),  # Simplified for safe loading
         "daily_losers": pd.DataFrame(),
-        "sector_values": sector_values,
-        "industry_values": industry_values,
+        "sector_values": build_group_values(stocks_complete, "sector"),
+        "industry_values": build_group_values(stocks_complete, "industry"),
         "cap_sizes": pd.DataFrame(),
         "rebuying_opportunities": rebuy_df,
         "buying_opportunities": new_buy_df,
+        **budget_views,
     }
 
 
-@st.cache_data(ttl=1800, show_spinner=False)
-def load_and_preprocess_data() -> Dict[str, Any]:
+@st.cache_data(show_spinner=False, max_entries=2)
+def _load_and_preprocess_data(fingerprint: tuple) -> Dict[str, Any]:
     raw_data = load_main_data()
     return preprocess_data(raw_data)
 
 
+def load_and_preprocess_data() -> Dict[str, Any]:
+    return _load_and_preprocess_data(sources_fingerprint(RAW_READERS))
+
+
+# ----- DATASET REGISTRY -----
+# Pages ask for the tables they use with load_dataset(name) instead of
+# load_and_preprocess_data(). Each dataset is cached on its own and built on
+# first request from its dependencies, so the budget pages never read the
+# investment history and the investment pages never touch the budget files.
+# name → (dependencies, builder called with the dependencies in order)
+DATASETS: Dict[str, Tuple[Tuple[str, ...], Callable[..., Any]]] = {
+    # Raw files
+    "raw_stocks":       ((), RAW_READERS["stocks"]),
+    "stock_info":       ((), RAW_READERS["stock_info"]),
+    "daily_stocks":     ((), RAW_READERS["daily_stocks"]),
+    "indicators":       ((), RAW_READERS["indicators"]),
+    "stock_dictionary": ((), RAW_READERS["stock_dictionary"]),
+    "expenses":         ((), RAW_READERS["expenses"]),
+    "income":           ((), RAW_READERS["income"]),
+    "monthly_budget":   ((), RAW_READERS["monthly_budget"]),
+    "stored_budget_cube": ((), RAW_READERS["budget_cube"]),
+    # Investments
+    "stocks":                 (("raw_stocks",), held_stocks),
+    # Only reads the daily history when the stored indicator state is stale
+    "stocks_complete":        (("stocks", "stock_info", "indicators"),
+                               lambda s, si, ind: build_stocks_complete(
+                                   s, si, load_dataset("daily_stocks") if ind is None else None, ind)),
+    "daily_stocks_complete":  (("daily_stocks", "stocks"), build_daily_stocks_complete),
+    "daily_equity":           (("daily_stocks_complete",), build_daily_equity),
+    "todays_stocks":          (("daily_stocks_complete",), build_todays_stocks),
+    "todays_stocks_complete": (("todays_stocks", "stocks_complete"), build_todays_stocks_complete),
+    "return_anchors":         (("daily_stocks",), build_return_anchors),
+    "sector_values":          (("stocks_complete",), lambda sc: build_group_values(sc, "sector")),
+    "industry_values":        (("stocks_complete",), lambda sc: build_group_values(sc, "industry")),
+    # Budget
+    "expense_transactions": (("expenses",), build_expense_transactions),
+    "income_transactions":  (("income",), build_income_transactions),
+    # Only falls back to reading the transactions when the stored cube is stale
+    "budget_cube": (("stored_budget_cube",),
+                    lambda stored: stored if stored is not None
+                    else build_budget_cube(load_dataset("expenses"), load_dataset("income"))),
+}
+
+
+# Old versions of a dataset are evicted once this many entries are cached
+DATASET_CACHE_ENTRIES = 4 * len(DATASETS)
+
+# Raw dataset behind each raw registry entry, when the names differ
+_RAW_NAMES = {"raw_stocks": "stocks", "stored_budget_cube": "budget_cube"}
+
+
+def dataset_fingerprint(name: str) -> tuple:
+    """
+    Cache key for a dataset: the fingerprints of its source files, or for a
+    derived dataset, those of its dependencies. A few stat() calls, no reads.
+    """
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset: {name}")
+    deps, _ = DATASETS[name]
+    if not deps:
+        return sources_fingerprint([_RAW_NAMES.get(name, name)])
+    return tuple(dataset_fingerprint(dep) for dep in deps)
+
+
+@st.cache_data(show_spinner=False, max_entries=DATASET_CACHE_ENTRIES)
+def _build_dataset(name: str, fingerprint: tuple) -> Any:
+    # fingerprint only keys the cache; see dataset_fingerprint()
+    deps, build = DATASETS[name]
+    return build(*(load_dataset(dep) for dep in deps))
+
+
+def load_dataset(name: str) -> Any:
+    """
+    One table from DATASETS, building (and caching) its dependencies first.
+    Cached until one of the files it's derived from changes on disk.
+    """
+    return _build_dataset(name, dataset_fingerprint(name))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _price_matrices(fingerprint: tuple) -> PriceMatrices:
+    return build_price_matrices(load_dataset("daily_stocks"))
+
+
+def load_price_matrices() -> PriceMatrices:
+    """
+    Date × ticker close / shares_held / market_value / equity matrices
+    (scripts/price_matrix.py), pivoted once per version of the daily history
+    and shared by every page without copying. Treat them as read-only.
+    """
+    return _price_matrices(dataset_fingerprint("daily_stocks"))
+
+
 def clear_all_caches() -> None:
     """Clear all cache layers so the next render reads fresh CSVs from disk."""
-    load_main_data.clear()
-    load_and_preprocess_data.clear()
+    _load_main_data.clear()
+    _load_and_preprocess_data.clear()
+    _build_dataset.clear()
+    _price_matrices.clear()
     load_market_context.clear()
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""
+Market-data sources for process_investment_data.py.
+
+The refresh talks to Yahoo Finance only through the small interface below, so
+a deterministic local stand-in can replace it (set_data_source) for
+benchmarking and tests without touching the network or the rate limit:
+
+    download(tickers, start)  → wide frame shaped like yf.download(group_by="ticker")
+    info(ticker)              → dict like yf.Ticker(ticker).info
+    fast_info(ticker)         → {"last_price", "previous_close", "year_high", "year_low"}
+    recent_history(ticker)    → last couple of daily bars (pre-flight check)
+
+YahooDataSource is the live implementation. FakeMarketSource generates seeded
+random-walk OHLC history, info dicts and fast_info for any ticker, and can
+inject per-request latency and simulated 429s. synthetic_stock_dictionary()
+builds a matching stock_dictionary.json payload of N tickers.
+"""
+
+import random
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from yfinance import shared as yf_shared
+
+# yf.download collects results in yfinance.shared._DFS / _ERRORS and resets
+# them on every call, so concurrent downloads would clobber each other.
+_DOWNLOAD_LOCK = threading.Lock()
+
+SECTORS = ["Technology", "Healthcare", "Financial Services", "Energy",
+           "Consumer Cyclical", "Industrials", "Utilities", "Real Estate"]
+
+
+class YahooDataSource:
+    """Live Yahoo Finance via yfinance."""
+
+    def download(self, tickers: List[str], start: str) -> pd.DataFrame:
+        """
+        yf.download makes one request per ticker and records per-ticker
+        failures (429s included) in yfinance.shared._ERRORS instead of
+        raising; they are copied to wide.attrs["errors"] as {ticker: message}.
+        Calls are serialized on _DOWNLOAD_LOCK because yf.download keeps its
+        results in module globals.
+        """
+        with _DOWNLOAD_LOCK:
+            wide = yf.download(
+                tickers,
+                start=start,
+                group_by="ticker",
+                auto_adjust=True,
+                actions=False,
+                threads=False,
+                progress=False,
+                multi_level_index=True,
+            )
+            errors = dict(getattr(yf_shared, "_ERRORS", None) or {})
+        if wide is not None:
+            wide.attrs["errors"] = {t: str(errors[t.upper()]) for t in tickers if t.upper() in errors}
+        return wide
+
+    def info(self, ticker: str) -> dict:
+        return yf.Ticker(ticker).info
+
+    def fast_info(self, ticker: str) -> dict:
+        fi = yf.Ticker(ticker).fast_info
+        return {
+            "last_price": getattr(fi, "last_price", None),
+            "previous_close": getattr(fi, "previous_close", None),
+            "year_high": getattr(fi, "year_high", None),
+            "year_low": getattr(fi, "year_low", None),
+        }
+
+    def recent_history(self, ticker: str, period: str = "2d") -> pd.DataFrame:
+        return yf.Ticker(ticker).history(period=period)
+
+
+class FakeMarketSource:
+    """
+    Deterministic offline stand-in for Yahoo Finance.
+
+    Every ticker's series is derived from (seed, ticker) alone, so results are
+    identical across runs and independent of request order or batching.
+    latency is slept once per request; rate_limit_rate is the probability
+    that a request raises a 429-style error (drawn from its own seeded RNG).
+    requests counts source calls and batches counts download() calls; a whole
+    download batch is one call here, where live yfinance sends one HTTP
+    request per ticker.
+    """
+
+    def __init__(self, seed: int = 0, end: Optional[date] = None, latency: float = 0.0,
+                 rate_limit_rate: float = 0.0, history_start: str = "2016-01-01"):
+        self.seed = seed
+        self.end = pd.Timestamp(end or date.today())
+        self.latency = latency
+        self.rate_limit_rate = rate_limit_rate
+        self.history_start = pd.Timestamp(history_start)
+        self.requests = 0
+        self.batches = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._series_cache: Dict[str, pd.DataFrame] = {}
+        self._dates = pd.bdate_range(self.history_start, self.end, name="Date")
+
+    def _request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            limited = self._rng.random() < self.rate_limit_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if limited:
+            raise RuntimeError("429 Client Error: Too Many Requests (simulated)")
+
+    def _ticker_rng(self, ticker: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+
+    def _series(self, ticker: str) -> pd.DataFrame:
+        """Full OHLCV random walk for one ticker (cached)."""
+        cached = self._series_cache.get(ticker)
+        if cached is not None:
+            return cached
+        rng = self._ticker_rng(ticker)
+        dates = self._dates
+        start_price = rng.uniform(5, 500)
+        drift, vol = rng.normal(0.0003, 0.0002), rng.uniform(0.008, 0.03)
+        close = start_price * np.exp(np.cumsum(rng.normal(drift, vol, len(dates))))
+        spread = np.abs(rng.normal(0, vol, len(dates))) * close
+        frame = pd.DataFrame({
+            "Open": close * (1 + rng.normal(0, vol / 4, len(dates))),
+            "High": close + spread,
+            "Low": np.maximum(close - spread, 0.01),
+            "Close": close,
+            "Volume": rng.integers(1e5, 5e7, len(dates)),
+        }, index=dates)
+        with self._lock:
+            self._series_cache[ticker] = frame
+        return frame
+
+    def download(self, tickers: List[str], start: str) -> pd.DataFrame:
+        with self._lock:
+            self.batches += 1
+        self._request()
+        start = pd.Timestamp(start)
+        parts = {t: self._series(t).loc[start:] for t in tickers}
+        return pd.concat(parts, axis=1)
+
+    def info(self, ticker: str) -> dict:
+        self._request()
+        rng = self._ticker_rng(ticker + ":info")
+        close = self._series(ticker)["Close"]
+        year = close.iloc[-252:]
+        return {
+            "longName": f"{ticker} Holdings Inc.",
+            "sector": SECTORS[int(rng.integers(len(SECTORS)))],
+            "industry": "Synthetic",
+            "country": "United States",
+            "state": "CA",
+            "city": "San Francisco",
+            "marketCap": float(rng.uniform(5e7, 3e12)),
+            "trailingPE": float(rng.uniform(5, 60)),
+            "priceToBook": float(rng.uniform(0.5, 20)),
+            "beta": float(rng.uniform(0.3, 2.0)),
+            "dividendYield": float(rng.uniform(0, 5)),
+            "targetMeanPrice": float(close.iloc[-1] * rng.uniform(0.8, 1.4)),
+            "currentPrice": float(close.iloc[-1]),
+            "52WeekChange": float(year.iloc[-1] / year.iloc[0] - 1),
+            "longBusinessSummary": f"Synthetic company for {ticker}.",
+            "companyOfficers": [{"name": f"CEO of {ticker}"}],
+            "auditRisk": int(rng.integers(1, 11)),
+            "boardRisk": int(rng.integers(1, 11)),
+            "compensationRisk": int(rng.integers(1, 11)),
+            "shareHolderRightsRisk": int(rng.integers(1, 11)),
+            "overallRisk": int(rng.integers(1, 11)),
+        }
+
+    def fast_info(self, ticker: str) -> dict:
+        self._request()
+        close = self._series(ticker)["Close"]
+        year = close.iloc[-252:]
+        return {
+            "last_price": float(close.iloc[-1]),
+            "previous_close": float(close.iloc[-2]) if len(close) > 1 else float(close.iloc[-1]),
+            "year_high": float(year.max()),
+            "year_low": float(year.min()),
+        }
+
+    def recent_history(self, ticker: str, period: str = "2d") -> pd.DataFrame:
+        self._request()
+        return self._series(ticker).iloc[-2:]
+
+
+def synthetic_stock_dictionary(n: int, seed: int = 0, end: Optional[date] = None,
+                               years: float = 2.0, sold_fraction: float = 0.1) -> dict:
+    """
+    n synthetic tickers in stock_dictionary.json format. Each gets a few buys
+    spread over the last `years` years; sold_fraction of them are fully sold
+    (exercising the closed-position paths).
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    span_days = int(years * 365)
+    stock_dict = {}
+    for i in range(n):
+        ticker = f"SYN{i:05d}"
+        buys = sorted(end - timedelta(days=rng.randint(30, span_days)) for _ in range(rng.randint(1, 4)))
+        history = [{
+            "date": d.strftime("%m/%d/%Y"),
+            "buy_sell": "buy",
+            "quantity": round(rng.uniform(1, 50), 3),
+            "share_price": round(rng.uniform(5, 500), 2),
+        } for d in buys]
+        if rng.random() < sold_fraction:
+            history.append({
+                "date": (buys[-1] + timedelta(days=rng.randint(1, 20))).strftime("%m/%d/%Y"),
+                "buy_sell": "sell",
+                "quantity": sum(t["quantity"] for t in history),
+                "share_price": round(rng.uniform(5, 500), 2),
+            })
+        stock_dict[ticker] = {"stock_name": f"{ticker} Holdings Inc.", "purchase_history": history}
+    return stock_dict
@@ -0,0 +1,191 @@
+"""
+Inverted index over expense descriptions for the Expenses page search box.
+
+Descriptions repeat heavily (the same merchants every month), so the index is
+built over the distinct normalised descriptions rather than over rows:
+
+    token    → description ids      (whole words, for prefix queries)
+    trigram  → description ids      (for substring queries)
+    description id → row positions  (to map hits back to transactions)
+
+A query touches only the postings of its terms and the rows of the matching
+descriptions, so latency does not grow with the length of the transaction
+log. update() indexes only descriptions it has not seen before; a changed
+expenses file costs a re-map of rows to description ids, not a rebuild.
+
+Query syntax (case-insensitive):
+
+    uber                substring, like the old str.contains search
+    uber eats           AND — every term must match
+    uber OR lyft        OR  (also "uber | lyft"); AND binds tighter
+    amaz*               prefix of any word in the description
+    "uber eats"         quoted phrase, matched as one substring
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+_TOKEN_RE = re.compile(r"[A-Z0-9]+")
+_QUERY_RE = re.compile(r'"[^"]*"|\S+')
+_OR_WORDS = {"OR", "|"}
+
+
+def normalize_description(values: pd.Series) -> pd.Series:
+    """The form descriptions are indexed and displayed in (stripped, upper-case)."""
+    return values.fillna("").astype(str).str.strip().str.upper()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """
+    Splits a query into OR-groups of AND-terms: 'a b OR c' → [['a', 'b'], ['c']].
+    Quoted phrases stay one term (quotes kept so they're matched as substrings).
+    """
+    groups: List[List[str]] = [[]]
+    for part in _QUERY_RE.findall(query.upper()):
+        if part in _OR_WORDS:
+            groups.append([])
+            continue
+        for i, piece in enumerate(part.split("|") if not part.startswith('"') else [part]):
+            if i > 0:
+                groups.append([])
+            if piece and piece != '""':
+                groups[-1].append(piece)
+    return [g for g in groups if g]
+
+
+class ExpenseSearchIndex:
+    """
+    Token / trigram index over distinct descriptions plus a row map for the
+    current transactions. Safe to share between Streamlit sessions.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self._texts: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._tokens: Dict[str, Set[int]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+        self._row_order = np.empty(0, dtype=np.int64)
+        self._doc_bounds = np.zeros(1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _add(self, text: str) -> int:
+        doc = len(self._texts)
+        self._texts.append(text)
+        self._ids[text] = doc
+        for token in _TOKEN_RE.findall(text):
+            self._tokens.setdefault(token, set()).add(doc)
+        for gram in _trigrams(text):
+            self._trigrams.setdefault(gram, set()).add(doc)
+        return doc
+
+    def update(self, descriptions: pd.Series, version=None) -> int:
+        """
+        Points the index at a new set of rows (positions 0..len-1 of
+        descriptions). Only descriptions not seen before are tokenised.
+        If version is given and equals the last one, nothing is done.
+        Returns the number of newly indexed descriptions.
+        """
+        with self._lock:
+            if version is not None and version == self.version:
+                return 0
+            codes, uniques = pd.factorize(normalize_description(descriptions), sort=False)
+            before = len(self._texts)
+            lookup = np.fromiter(
+                (self._ids[text] if text in self._ids else self._add(text) for text in uniques),
+                dtype=np.int64, count=len(uniques),
+            )
+            if len(self._texts) != before:
+                self._sorted_tokens = None
+
+            row_docs = lookup[codes] if len(codes) else np.empty(0, dtype=np.int64)
+            self._row_order = np.argsort(row_docs, kind="stable")
+            counts = np.bincount(row_docs, minlength=len(self._texts))
+            self._doc_bounds = np.concatenate([[0], np.cumsum(counts)])
+            self.version = version
+            return len(self._texts) - before
+
+    # ----------------- QUERIES ----------------- #
+
+    def _prefix_docs(self, prefix: str) -> Set[int]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._tokens)
+        tokens = self._sorted_tokens
+        docs: Set[int] = set()
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            docs |= self._tokens[tokens[i]]
+            i += 1
+        return docs
+
+    def _substring_docs(self, needle: str) -> Set[int]:
+        if len(needle) >= 3:
+            grams = sorted(_trigrams(needle), key=lambda g: len(self._trigrams.get(g, ())))
+            candidates = set(self._trigrams.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not candidates:
+                    break
+                candidates &= self._trigrams.get(gram, set())
+        else:
+            candidates = range(len(self._texts))
+        return {doc for doc in candidates if needle in self._texts[doc]}
+
+    def _term_docs(self, term: str) -> Set[int]:
+        if len(term) >= 2 and term.startswith('"') and term.endswith('"'):
+            return self._substring_docs(term[1:-1])
+        if term.endswith("*") and len(term) > 1:
+            return self._prefix_docs(term.rstrip("*"))
+        return self._substring_docs(term)
+
+    def _matching_docs(self, query: str) -> Set[int]:
+        matched: Set[int] = set()
+        for group in parse_query(query):
+            docs: Optional[Set[int]] = None
+            for term in sorted(group, key=len, reverse=True):
+                term_docs = self._term_docs(term)
+                docs = term_docs if docs is None else docs & term_docs
+                if not docs:
+                    break
+            matched |= docs or set()
+        return matched
+
+    def matching_descriptions(self, query: str) -> Set[int]:
+        """Description ids matching the query (empty query → none)."""
+        with self._lock:
+            return self._matching_docs(query)
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Sorted row positions whose description matches the query. Matching
+        and the row lookup happen under one lock, so a concurrent update()
+        can't pair one version's description ids with another's row map.
+        """
+        with self._lock:
+            docs = self._matching_docs(query)
+            if not docs:
+                return np.empty(0, dtype=np.int64)
+            parts = [self._row_order[self._doc_bounds[d]:self._doc_bounds[d + 1]] for d in docs]
+        return np.sort(np.concatenate(parts))
+
+    def mask(self, query: str, n_rows: int) -> np.ndarray:
+        """
+        Boolean mask over the first n_rows indexed rows. Positions past n_rows
+        (the index was updated to a longer frame in between) are ignored.
+        """
+        out = np.zeros(n_rows, dtype=bool)
+        rows = self.search(query)
+        out[rows[rows < n_rows]] = True
+        return out
@@ -0,0 +1,225 @@
+"""
+Incremental technical-indicator state, stored next to the daily history
+(data/daily_stocks/_indicators.json).
+
+Every indicator the app shows is a recurrence over closes, so each ticker
+keeps just enough state to take the next close:
+
+    avg_gain, avg_loss       Wilder averages behind RSI-14
+    ema_fast, ema_slow       EMA-12 / EMA-26 behind MACD
+    macd_signal              EMA-9 of MACD
+    closes                   last 200 closes (SMA-50 / SMA-200, 20-day volatility)
+    last_date, last_close    where the state ends
+
+process_investment_data.py calls update_indicator_store() after saving the
+history. Only days after last_date are fed in, so a daily refresh costs
+O(new days) per ticker. A ticker is rebuilt from its whole history when it is
+new, when --full is used, or when its stored close at last_date no longer
+matches the history (revised prices). The finished values are written
+alongside the state, so the app reads them in O(tickers) via
+read_indicators().
+
+The recurrences match pandas: ewm(alpha=1/14, adjust=False) of the gains and
+losses for RSI, ewm(span=n, adjust=False) for the EMAs, and a rolling mean /
+std for the SMAs and volatility.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scripts.daily_store import STORE_DIR, read_manifest
+from scripts.indicators import RSI_PERIOD, RSI_ZERO_LOSS
+
+INDICATOR_FILE = "_indicators.json"
+STATE_VERSION = 1
+
+SMA_WINDOWS = (50, 200)
+VOLATILITY_WINDOW = 20
+TRADING_DAYS = 252
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BUFFER_SIZE = max(max(SMA_WINDOWS), VOLATILITY_WINDOW + 1)
+
+# Relative tolerance when checking the stored last close against the history
+# (the store keeps float32 closes; the state was built from float64)
+CLOSE_RTOL = 1e-6
+
+INDICATOR_COLUMNS = ["rsi_14", "sma_50", "sma_200", "volatility_20", "macd", "macd_signal", "macd_hist"]
+
+
+def _span_alpha(span: int) -> float:
+    return 2.0 / (span + 1)
+
+
+def empty_state() -> dict:
+    return {
+        "last_date": None, "last_close": None, "count": 0,
+        "avg_gain": None, "avg_loss": None,
+        "ema_fast": None, "ema_slow": None, "macd_signal": None,
+        "closes": [],
+    }
+
+
+def extend_state(state: dict, closes, last_date) -> dict:
+    """Feeds closes (oldest first) through every recurrence; returns the new state."""
+    state = dict(state, closes=list(state["closes"]))
+    a_rsi = 1.0 / RSI_PERIOD
+    a_fast, a_slow, a_signal = _span_alpha(MACD_FAST), _span_alpha(MACD_SLOW), _span_alpha(MACD_SIGNAL)
+    for close in closes:
+        close = float(close)
+        if math.isnan(close):
+            continue
+        prev = state["last_close"]
+        if prev is None:
+            state["ema_fast"] = state["ema_slow"] = close
+            state["macd_signal"] = 0.0
+        else:
+            delta = close - prev
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            if state["avg_gain"] is None:
+                state["avg_gain"], state["avg_loss"] = gain, loss
+            else:
+                state["avg_gain"] += a_rsi * (gain - state["avg_gain"])
+                state["avg_loss"] += a_rsi * (loss - state["avg_loss"])
+            state["ema_fast"] += a_fast * (close - state["ema_fast"])
+            state["ema_slow"] += a_slow * (close - state["ema_slow"])
+            macd = state["ema_fast"] - state["ema_slow"]
+            state["macd_signal"] += a_signal * (macd - state["macd_signal"])
+        state["last_close"] = close
+        state["count"] += 1
+        state["closes"].append(close)
+    del state["closes"][:-BUFFER_SIZE]
+    if last_date is not None:
+        state["last_date"] = pd.Timestamp(last_date).strftime("%Y-%m-%d")
+    return state
+
+
+def _nan_to_none(value) -> Optional[float]:
+    return None if value is None or (isinstance(value, float) and math.isnan(value)) else float(value)
+
+
+def finished_values(state: dict) -> Dict[str, Optional[float]]:
+    """The indicator columns the app reads; None where history is too short."""
+    closes = np.asarray(state["closes"], dtype="float64")
+    count = state["count"]
+
+    rsi = 50.0
+    if count >= RSI_PERIOD + 1:
+        avg_loss = state["avg_loss"] or RSI_ZERO_LOSS
+        rsi = 100 - 100 / (1 + state["avg_gain"] / avg_loss)
+
+    values = {"rsi_14": rsi}
+    for window in SMA_WINDOWS:
+        values[f"sma_{window}"] = float(closes[-window:].mean()) if len(closes) >= window else None
+
+    volatility = None
+    if len(closes) >= VOLATILITY_WINDOW + 1:
+        recent = closes[-(VOLATILITY_WINDOW + 1):]
+        returns = np.diff(recent) / recent[:-1]
+        volatility = float(returns.std(ddof=1) * math.sqrt(TRADING_DAYS) * 100)
+    values["volatility_20"] = volatility
+
+    if state["ema_fast"] is None:
+        values.update(macd=None, macd_signal=None, macd_hist=None)
+    else:
+        macd = state["ema_fast"] - state["ema_slow"]
+        values.update(macd=macd, macd_signal=state["macd_signal"], macd_hist=macd - state["macd_signal"])
+    return {k: _nan_to_none(v) for k, v in values.items()}
+
+
+# ----------------- STORE ----------------- #
+
+def _store_path(store_dir: Path) -> Path:
+    return store_dir / INDICATOR_FILE
+
+
+def load_indicator_states(store_dir: Path = STORE_DIR) -> Dict[str, dict]:
+    """{ticker: state}, or {} when the file is missing, unreadable or another version."""
+    try:
+        with open(_store_path(store_dir), "r") as f:
+            payload = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if payload.get("version") != STATE_VERSION:
+        return {}
+    return {ticker: entry["state"] for ticker, entry in payload.get("tickers", {}).items()}
+
+
+def update_indicator_store(daily_df: pd.DataFrame, store_dir: Path = STORE_DIR,
+                           full_refresh: bool = False) -> Tuple[int, int]:
+    """
+    Brings every ticker's state up to the last row of daily_df (the full
+    history, columns Date / Close / Stock as written by daily_store) and
+    writes the store. Tickers no longer in daily_df are dropped.
+    Returns (tickers extended incrementally, tickers rebuilt).
+    """
+    states = {} if full_refresh else load_indicator_states(store_dir)
+    out = {}
+    extended = rebuilt = 0
+
+    history = daily_df[["Stock", "Date", "Close"]].copy()
+    history["Date"] = pd.to_datetime(history["Date"])
+    history = history.sort_values(["Stock", "Date"], kind="stable")
+    for ticker, group in history.groupby("Stock", sort=True, observed=True):
+        ticker = str(ticker)
+        dates = group["Date"].to_numpy()
+        closes = group["Close"].to_numpy(dtype="float64")
+        if len(closes) == 0:
+            continue
+        state = states.get(ticker)
+
+        if state is not None and state["last_close"] is not None:
+            anchor = pd.Timestamp(state["last_date"]).to_datetime64()
+            valid = ~np.isnan(closes)
+            seen = closes[valid & (dates <= anchor)]
+            if (len(seen) and dates[-1] >= anchor
+                    and math.isclose(seen[-1], state["last_close"], rel_tol=CLOSE_RTOL)):
+                state = extend_state(state, closes[dates > anchor], dates[-1])
+                extended += 1
+                out[ticker] = state
+                continue
+
+        out[ticker] = extend_state(empty_state(), closes, dates[-1])
+        rebuilt += 1
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": STATE_VERSION,
+        "tickers": {t: {"state": s, "values": finished_values(s)} for t, s in sorted(out.items())},
+    }
+    tmp_path = store_dir / f".{INDICATOR_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=1)
+    os.replace(tmp_path, _store_path(store_dir))
+    return extended, rebuilt
+
+
+def read_indicators(store_dir: Path = STORE_DIR) -> Optional[pd.DataFrame]:
+    """
+    [stock, rsi_14, sma_50, sma_200, volatility_20, macd, macd_signal,
+    macd_hist] for every ticker, or None when the store is missing or doesn't
+    match the daily history's manifest (a ticker missing or at another date).
+    """
+    try:
+        with open(_store_path(store_dir), "r") as f:
+            payload = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if payload.get("version") != STATE_VERSION:
+        return None
+
+    tickers = payload.get("tickers", {})
+    manifest = read_manifest(store_dir)
+    for ticker, entry in manifest.items():
+        if tickers.get(ticker, {}).get("state", {}).get("last_date") != entry.get("last_date"):
+            return None
+
+    rows = [{"stock": t, **entry["values"]} for t, entry in tickers.items() if t in manifest]
+    df = pd.DataFrame(rows, columns=["stock"] + INDICATOR_COLUMNS)
+    df[INDICATOR_COLUMNS] = df[INDICATOR_COLUMNS].astype("float64")
+    return df
@@ -0,0 +1,155 @@
+"""
+Merchant canonicalisation for expense descriptions (data/merchant_cache.json).
+
+Descriptions are free text, so the same merchant shows up under many spellings
+("Uber", "UBER *TRIP 123", "Uber home", "Giant groceries"). The budget
+processor resolves each distinct description to a merchant name once and
+stores the answer in a cache keyed by the raw (stripped) description; later
+runs only resolve descriptions they haven't seen.
+
+A new description is resolved in this order:
+
+    1. RULES             explicit patterns for known multi-spelling merchants
+    2. exact key         same canonical key as an existing merchant
+    3. leading words     key starts with an existing merchant's key
+                         ("GIANT GROCERIES" → Giant)
+    4. similarity        difflib ratio >= SIMILARITY_CUTOFF against merchants
+                         sharing the first letters (typos, plurals)
+    5. otherwise it starts a new merchant, named after this description
+
+Descriptions are resolved most-frequent first, so a merchant is named after
+its most common spelling.
+"""
+
+import json
+import os
+import re
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MERCHANT_CACHE_PATH = PROJECT_ROOT / "data" / "merchant_cache.json"
+CACHE_VERSION = 1
+
+SIMILARITY_CUTOFF = 0.85
+BLOCK_PREFIX = 3          # only compare keys sharing this many leading characters
+UNKNOWN_MERCHANT = "Unknown"
+
+# Card-processor prefixes that come before the merchant name ("SQ *BLUE BOTTLE")
+_PROCESSOR_PREFIX = re.compile(r"^(?:SQ|TST|SP|PP|PAYPAL|PY|IC|DD)\s*\*\s*")
+_KEY_CLEANUP = [
+    (re.compile(r"\s*\*.*$"), ""),            # "UBER *TRIP 123" → statement detail after '*'
+    (re.compile(r"\s+-\s+.*$"), ""),          # "Costco - alcohol" → note after ' - '
+    (re.compile(r"#\s*\d+|\b\d{3,}\b"), " "),  # store / reference numbers
+    (re.compile(r"[^A-Z0-9&+' ]"), " "),
+    (re.compile(r"\s+"), " "),
+]
+
+# (pattern on the canonical key, merchant name); first match wins
+RULES = [
+    (re.compile(r"^UBER ?EATS\b"), "Uber Eats"),
+    (re.compile(r"^UBER ?ONE\b"), "Uber One"),
+    (re.compile(r"^UBERS?\b"), "Uber"),
+    (re.compile(r"^LYFTS?\b"), "Lyft"),
+    (re.compile(r"^(?:AMZN|AMAZON)\b"), "Amazon"),
+]
+
+
+def merchant_key(description: str) -> str:
+    """Upper-cased description with processor prefixes, notes and numbers removed."""
+    key = _PROCESSOR_PREFIX.sub("", description.strip().upper())
+    for pattern, repl in _KEY_CLEANUP:
+        key = pattern.sub(repl, key)
+    return key.strip()
+
+
+class MerchantResolver:
+    """
+    Maps descriptions to merchant names, backed by the JSON cache at
+    cache_path (None keeps the cache in memory only).
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = cache_path
+        self._cache: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}          # canonical key → merchant
+        self._blocks: Dict[str, List[str]] = {}  # key prefix → keys
+        self._dirty = False
+        for raw, merchant in self._load().items():
+            self._cache[raw] = merchant
+            self._remember(merchant_key(raw) or raw.upper(), merchant)
+
+    def _load(self) -> Dict[str, str]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, "r") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"   > Warning: ignoring unreadable merchant cache ({e})")
+            return {}
+        if payload.get("version") != CACHE_VERSION:
+            return {}
+        return payload.get("merchants", {})
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _remember(self, key: str, merchant: str) -> None:
+        if key in self._keys:
+            return
+        self._keys[key] = merchant
+        self._blocks.setdefault(key[:BLOCK_PREFIX], []).append(key)
+
+    def _cluster(self, raw: str) -> str:
+        if not raw:
+            return UNKNOWN_MERCHANT
+        key = merchant_key(raw) or raw.upper()
+        merchant = None
+        for pattern, name in RULES:
+            if pattern.search(key):
+                merchant = name
+                break
+        if merchant is None:
+            merchant = self._keys.get(key)
+        if merchant is None:
+            words = key.split(" ")
+            for n in range(len(words) - 1, 0, -1):
+                merchant = self._keys.get(" ".join(words[:n]))
+                if merchant is not None:
+                    break
+        if merchant is None:
+            best = SIMILARITY_CUTOFF
+            for candidate in self._blocks.get(key[:BLOCK_PREFIX], ()):
+                matcher = SequenceMatcher(None, key, candidate)
+                if matcher.real_quick_ratio() >= best and matcher.quick_ratio() >= best:
+                    ratio = matcher.ratio()
+                    if ratio >= best:
+                        best, merchant = ratio, self._keys[candidate]
+        if merchant is None:
+            merchant = raw
+        self._remember(key, merchant)
+        return merchant
+
+    def resolve(self, descriptions: pd.Series) -> pd.Series:
+        """Merchant name per description; only unseen descriptions are clustered."""
+        raw = descriptions.fillna("").astype(str).str.strip()
+        for text in raw.value_counts(sort=True).index:
+            if text not in self._cache:
+                self._cache[text] = self._cluster(text)
+                self._dirty = True
+        return raw.map(self._cache)
+
+    def save(self) -> None:
+        """Writes the cache (temp file + rename) if anything new was resolved."""
+        if self.cache_path is None or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "merchants": self._cache}, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
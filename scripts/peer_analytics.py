@@ -0,0 +1,81 @@
+"""
+Peer comparisons over a date × ticker close matrix (a slice of
+price_matrix.PriceMatrices.close), for the Stock Peer Analysis page.
+
+Every function works on the whole matrix at once, so comparing 50+ tickers
+costs a few array operations rather than a loop per ticker:
+
+    normalize          one broadcast divide by each column's first valid close
+    peer_averages      leave-one-out means as (row_sum - x) / (count - 1)
+    relative_strength  each ticker's return against its peers', ranked
+    return_correlation pairwise correlation of daily returns
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def normalize(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Each column divided by its first valid value, so every series starts at
+    1.0. Rows before a ticker's first close stay NaN; all-NaN columns are
+    dropped.
+    """
+    prices = prices.loc[:, prices.notna().any()]
+    values = prices.to_numpy(dtype="float64")
+    if values.size == 0:
+        return prices.astype("float64")
+    first = np.isfinite(values).argmax(axis=0)
+    base = values[first, np.arange(values.shape[1])]
+    return pd.DataFrame(values / base, index=prices.index, columns=prices.columns)
+
+
+def peer_averages(normalized: pd.DataFrame) -> pd.DataFrame:
+    """
+    For every ticker and date, the mean of the other tickers with a value on
+    that date (NaN when there are none), i.e. the same matrix as
+    normalized.drop(columns=[t]).mean(axis=1) for each t, from one row sum.
+    """
+    values = normalized.to_numpy(dtype="float64")
+    present = ~np.isnan(values)
+    row_sum = np.where(present, values, 0.0).sum(axis=1, keepdims=True)
+    others = present.sum(axis=1, keepdims=True) - present
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = (row_sum - np.where(present, values, 0.0)) / others
+    averages[others == 0] = np.nan
+    return pd.DataFrame(averages, index=normalized.index, columns=normalized.columns)
+
+
+def relative_strength(normalized: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per ticker, ranked best first:
+      return_pct       change since the ticker's first close in the window
+      peer_return_pct  mean return of the other tickers
+      relative_strength  (1 + return) / (1 + peer return); above 1 = beating peers
+      rank             1 = best return
+    Each ticker's latest valid value is used, so a ticker whose history ends
+    early is compared on its own last close.
+    """
+    latest = normalized.ffill().iloc[-1:] if not normalized.empty else normalized
+    if latest.empty:
+        return pd.DataFrame(columns=["stock", "return_pct", "peer_return_pct", "relative_strength", "rank"])
+    latest_values = latest.iloc[0]
+    peers = peer_averages(latest).iloc[0]
+    table = pd.DataFrame({
+        "stock": latest_values.index,
+        "return_pct": (latest_values.to_numpy() - 1) * 100,
+        "peer_return_pct": (peers.to_numpy() - 1) * 100,
+        "relative_strength": latest_values.to_numpy() / peers.to_numpy(),
+    })
+    table = table.dropna(subset=["return_pct"]).sort_values("return_pct", ascending=False, kind="stable")
+    table["rank"] = np.arange(1, len(table) + 1)
+    return table.reset_index(drop=True)
+
+
+def return_correlation(prices: pd.DataFrame, min_periods: int = 20) -> pd.DataFrame:
+    """
+    Pairwise Pearson correlation of daily returns. Pairs with fewer than
+    min_periods overlapping returns are NaN.
+    """
+    returns = prices.pct_change(fill_method=None)
+    return returns.corr(min_periods=min_periods)
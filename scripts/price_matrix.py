@@ -0,0 +1,114 @@
+"""
+Wide date × ticker views of the daily holdings history.
+
+The long daily_stocks table (one row per ticker per day) is pivoted once per
+data version into float64 matrices, one per field, all sharing a sorted
+DatetimeIndex and the same sorted ticker columns:
+
+    close          closing price
+    shares_held    shares held at the close
+    market_value   shares_held × close
+    equity         cost basis of the position
+
+One ticker's history is a column (matrices.series("AAPL")) and one day
+across the portfolio is a row (matrices.on(date)). Both are slices of the
+matrix, not boolean-mask scans of the long table. A (ticker, date) pair with
+no row in the history is NaN.
+
+data_processing.load_price_matrices() builds the matrices and shares one
+instance across pages and sessions. Callers must treat the frames as
+read-only and .copy() anything they want to modify.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("close", "shares_held", "market_value", "equity")
+
+
+class PriceMatrices:
+    """Date × ticker float64 matrices for each of FIELDS."""
+
+    def __init__(self, close: pd.DataFrame, shares_held: pd.DataFrame,
+                 market_value: pd.DataFrame, equity: pd.DataFrame):
+        self.close = close
+        self.shares_held = shares_held
+        self.market_value = market_value
+        self.equity = equity
+
+    def __getitem__(self, field: str) -> pd.DataFrame:
+        if field not in FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    @property
+    def empty(self) -> bool:
+        return self.close.empty
+
+    @property
+    def tickers(self) -> list:
+        return self.close.columns.tolist()
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return self.close.index
+
+    def series(self, ticker: str, field: str = "close") -> pd.Series:
+        """One ticker's history of field, without the days it has no row."""
+        matrix = self[field]
+        if ticker not in matrix.columns:
+            return pd.Series(dtype="float64", index=pd.DatetimeIndex([], name="date"), name=ticker)
+        return matrix[ticker].dropna()
+
+    def window(self, start=None, end=None, tickers: Optional[Iterable[str]] = None,
+               field: str = "close") -> pd.DataFrame:
+        """Rows from start to end (inclusive) for the given tickers (default: all)."""
+        matrix = self[field]
+        rows = matrix.loc[start:end]
+        if tickers is None:
+            return rows
+        return rows[[t for t in tickers if t in matrix.columns]]
+
+    def on(self, date=None, field: str = "close") -> pd.Series:
+        """The cross-section on the last date on or before date (default: the latest)."""
+        matrix = self[field]
+        if matrix.empty:
+            return pd.Series(dtype="float64", name=field)
+        if date is None:
+            return matrix.iloc[-1]
+        pos = matrix.index.searchsorted(pd.Timestamp(date), side="right") - 1
+        if pos < 0:
+            return pd.Series(np.nan, index=matrix.columns, name=field)
+        return matrix.iloc[pos]
+
+
+def build_price_matrices(daily_stocks: pd.DataFrame) -> PriceMatrices:
+    """
+    Pivots the long history into one matrix per field in a single pass: the
+    dates and tickers are factorized once, and every field is scattered into
+    a NaN-filled array at those (row, column) positions. Fields missing from
+    daily_stocks come out all-NaN. For duplicate (date, ticker) rows the
+    later row wins.
+    """
+    if daily_stocks.empty or not {"date", "stock"}.issubset(daily_stocks.columns):
+        index = pd.DatetimeIndex([], name="date")
+        columns = pd.Index([], dtype="object", name="stock")
+        return PriceMatrices(**{f: pd.DataFrame(index=index, columns=columns, dtype="float64") for f in FIELDS})
+
+    dates = pd.to_datetime(daily_stocks["date"], errors="coerce")
+    valid = dates.notna().to_numpy() & daily_stocks["stock"].notna().to_numpy()
+    row_codes, row_labels = pd.factorize(dates[valid], sort=True)
+    col_codes, col_labels = pd.factorize(daily_stocks["stock"][valid].astype(str), sort=True)
+    index = pd.DatetimeIndex(row_labels, name="date")
+    columns = pd.Index(col_labels, name="stock")
+
+    frames = {}
+    for field in FIELDS:
+        values = np.full((len(index), len(columns)), np.nan)
+        if field in daily_stocks.columns:
+            values[row_codes, col_codes] = pd.to_numeric(
+                daily_stocks[field][valid], errors="coerce").to_numpy(dtype="float64")
+        frames[field] = pd.DataFrame(values, index=index, columns=columns, copy=False)
+    return PriceMatrices(**frames)
@@ -1,15 +1,30 @@
+import hashlib
+import json
+import numpy as np
 import pandas as pd
 import os
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date
+from itertools import repeat
 from pathlib import Path
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.budget_cube import BUDGET_CUBE_PATH, build_budget_cube, merge_cubes, write_budget_cube  # noqa: E402
+from scripts.budget_store import TypedTransactionWriter, parquet_path_for, write_typed_transactions  # noqa: E402
+from scripts.merchants import MERCHANT_CACHE_PATH, MerchantResolver  # noqa: E402
 
 # ----------------- CONFIGURATION ----------------- #
 
 # Resolve paths relative to this script
 CURRENT_DIR = Path(__file__).resolve().parent
-PROJECT_ROOT = CURRENT_DIR.parent
 DATA_DIR = PROJECT_ROOT / 'data'
 
 # Input File Path
@@ -21,6 +36,11 @@ INCOME_CSV = DATA_DIR / 'income.csv'
 EXPENSES_CSV = DATA_DIR / 'expenses.csv'
 MONTHLY_BUDGET_CSV = DATA_DIR / 'monthly_budget.csv'
 
+# Per-sheet content hashes + the rows each "Monthly Budget" sheet produced.
+# Unchanged sheets are served from here on incremental runs.
+BUDGET_MANIFEST = DATA_DIR / 'budget_manifest.json'
+MANIFEST_VERSION = 1
+
 
 # ----------------- HELPER FUNCTIONS ----------------- #
 
@@ -50,16 +70,285 @@ def get_cutoff_date(csv_path):
         return None
 
 
-def process_budget_excel(budget_file, income_csv_path, expenses_csv_path, monthly_budget_csv_path, full_refresh=False):
+# Expense / income blocks sit side by side under one header row on every
+# "Monthly Budget" sheet. The header is normally on row 14 (skiprows=13); a
+# few sheets are shifted down one row.
+HEADER_SKIPROWS = (13, 14)
+EXPENSE_COLUMNS = ['Amount', 'Date', 'Expense Category', 'Description']
+# The income block's "Amount" is the sheet's second Amount column → "Amount.1"
+INCOME_COLUMNS = ['Source', 'Amount.1', 'Date Received']
+# "Budget v Actual": header on row 2, columns A:K (Date, Rent ... Disposable)
+TARGETS_HEADER_ROW = 1
+TARGETS_COLUMNS = list(range(11))
+
+
+def _cell_value(cell):
+    """Converts one openpyxl cell exactly as pandas' openpyxl reader does."""
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        val = int(cell.value)
+        return val if val == cell.value else float(cell.value)
+    return cell.value
+
+
+def _sheet_rows(sheet):
+    """
+    Reads every cell of a worksheet once into a list of rows, trimmed and
+    padded the same way pd.read_excel does, so the blocks sliced from it
+    match what the per-block read_excel calls used to return.
+    """
+    sheet.reset_dimensions()
+    rows = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(sheet.rows):
+        converted = [_cell_value(cell) for cell in row]
+        while converted and converted[-1] == "":
+            converted.pop()
+        if converted:
+            last_row_with_data = row_number
+        rows.append(converted)
+    rows = rows[: last_row_with_data + 1]
+    if rows:
+        width = max(len(r) for r in rows)
+        rows = [r + [""] * (width - len(r)) for r in rows]
+    return rows
+
+
+def _read_block(rows, usecols, header=0, skiprows=None):
+    """
+    Builds a DataFrame from already-loaded sheet rows, with pd.read_excel's
+    header / skiprows / usecols semantics (including "Amount.1" de-duplication
+    of repeated header names). Raises ValueError if usecols aren't all present.
+    """
+    if not rows:
+        return pd.DataFrame()
+    parser = TextParser(
+        [list(r) for r in rows],
+        header=header,
+        skiprows=skiprows,
+        usecols=usecols,
+        skip_blank_lines=False,
+    )
+    return parser.read()
+
+
+def _read_transaction_block(rows, usecols):
+    """Tries each known header position in turn; empty frame if none match."""
+    for skiprows in HEADER_SKIPROWS:
+        try:
+            return _read_block(rows, usecols, skiprows=skiprows)
+        except Exception:
+            continue
+    return pd.DataFrame()
+
+
+def _concat_nonempty(frames, columns):
+    """
+    One concat over the non-empty frames (pandas warns when empty frames take
+    part in dtype resolution); no rows at all → an empty frame with columns.
+    """
+    frames = [f for f in frames if not f.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def _expenses_from_rows(rows, cutoff_date=None):
+    expenses = _read_transaction_block(rows, EXPENSE_COLUMNS)
+    if expenses.empty:
+        return expenses
+    expenses = expenses.rename(columns={'Expense Category': 'Expense_Category'})
+    expenses = expenses.dropna(how='any')
+    expenses['Date'] = pd.to_datetime(expenses['Date'], errors='coerce')
+    expenses = expenses.dropna(subset=['Date'])
+
+    # INCREMENTAL FILTER
+    if cutoff_date:
+        expenses = expenses[expenses['Date'] >= cutoff_date]
+    return expenses
+
+
+def _income_from_rows(rows, cutoff_date=None):
+    income = _read_transaction_block(rows, INCOME_COLUMNS)
+    if income.empty:
+        return income
+    income = income.rename(columns={'Amount.1': 'Amount', 'Date Received': 'Date'})
+    income = income.dropna(how='any')
+    income['Date'] = pd.to_datetime(income['Date'], errors='coerce')
+    income = income.dropna(subset=['Date'])
+
+    # INCREMENTAL FILTER
+    if cutoff_date:
+        income = income[income['Date'] >= cutoff_date]
+    return income
+
+
+def _budget_targets_from_rows(rows):
+    """
+    Parses the 'Budget v Actual' rows into long format [Date, Category,
+    Budget_Amount]. Returns None (after printing why) if the sheet is unusable.
+    """
+    try:
+        budget_targets = _read_block(rows, TARGETS_COLUMNS, header=TARGETS_HEADER_ROW)
+
+        # Rename for consistency
+        budget_targets.rename(columns=lambda x: x.strip() if isinstance(x, str) else x, inplace=True)
+
+        if 'Date' not in budget_targets.columns:
+            print("   > Warning: 'Date' column not found in 'Budget v Actual' sheet.")
+            return None
+
+        # Ensure Date is parsed
+        budget_targets['Date'] = pd.to_datetime(budget_targets['Date'], errors='coerce')
+        budget_targets = budget_targets.dropna(subset=['Date'])
+
+        # Melt into Long Format: [Date, Category, Budget_Amount]
+        # This makes plotting easier (Category as color)
+        return budget_targets.melt(
+            id_vars=['Date'],
+            var_name='Category',
+            value_name='Budget_Amount'
+        )
+    except Exception as e:
+        print(f"   > Error processing Budget v Actual sheet: {e}")
+        return None
+
+
+# ----------------- SHEET MANIFEST ----------------- #
+
+def _sheet_digest(rows):
+    """Content hash over a sheet's cell values (as read by _sheet_rows)."""
+    payload = json.dumps(rows, default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _frame_to_records(df):
+    if df.empty:
+        return []
+    out = df.copy()
+    out['Date'] = out['Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    return out.to_dict('records')
+
+
+def _records_to_frame(records):
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame.from_records(records)
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df
+
+
+def load_sheet_manifest(manifest_path):
+    """{sheet_name: {"hash", "expenses", "income"}} from the last run, or {}."""
+    if manifest_path is None or not manifest_path.exists():
+        return {}
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"   > Warning: could not read sheet manifest ({e}). Re-parsing all sheets.")
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('sheets', {})
+
+
+def save_sheet_manifest(manifest_path, sheets):
+    if manifest_path is None:
+        return
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'sheets': sheets}, f, default=str)
+    os.replace(tmp_path, manifest_path)
+
+
+# ----------------- SHEET PARSING ----------------- #
+
+def _parse_monthly_sheet(rows, known_hash=None):
+    """
+    (digest, expenses, income) for one "Monthly Budget" sheet's rows. When the
+    digest equals known_hash the sheet is unchanged and isn't parsed:
+    expenses and income come back as None.
+    """
+    digest = _sheet_digest(rows)
+    if digest == known_hash:
+        return digest, None, None
+    return digest, _expenses_from_rows(rows), _income_from_rows(rows)
+
+
+def _parse_sheet_group(budget_file, sheet_names, known_hashes):
+    """Process-pool task: parses a group of sheets from its own read-only handle."""
+    workbook = load_workbook(budget_file, read_only=True, data_only=True, keep_links=False)
+    try:
+        return {
+            name: _parse_monthly_sheet(_sheet_rows(workbook[name]), known_hashes.get(name))
+            for name in sheet_names
+        }
+    finally:
+        workbook.close()
+
+
+def iter_parsed_sheets(budget_file, workbook, sheet_names, known_hashes, workers=1):
+    """
+    Yields (sheet_name, digest, expenses, income) for each sheet, in order.
+
+    With workers > 1 the sheets are dealt round-robin into one group per
+    worker and parsed in a ProcessPoolExecutor; each worker opens the file
+    read-only itself and sends back only the compact parsed frames. Otherwise
+    the sheets are parsed one at a time from the already-open workbook.
+    """
+    workers = min(workers, len(sheet_names))
+    if workers <= 1:
+        for name in sheet_names:
+            yield (name, *_parse_monthly_sheet(_sheet_rows(workbook[name]), known_hashes.get(name)))
+        return
+
+    groups = [sheet_names[i::workers] for i in range(workers)]
+    parsed = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_parse_sheet_group, repeat(budget_file), groups, repeat(known_hashes)):
+            parsed.update(result)
+    for name in sheet_names:
+        yield (name, *parsed[name])
+
+
+def process_budget_excel(budget_file, income_csv_path, expenses_csv_path, monthly_budget_csv_path, full_refresh=False,
+                         manifest_path=None, workers=1, cube_path=None, merchant_cache_path=None):
     """
     Parses the Budget Excel file incrementally or fully.
     Now also scrapes the 'Budget v Actual' sheet for budget targets.
+
+    The workbook is opened once and each sheet's cells are read once; the
+    expense, income and target blocks are sliced from those rows rather than
+    re-parsing the .xlsx for every block and header-row retry.
+
+    With a manifest_path, each "Monthly Budget" sheet's content hash and rows
+    are recorded there. Incremental runs then rebuild the transaction CSVs
+    sheet by sheet: unchanged sheets come straight from the manifest and only
+    edited or new sheets are parsed, so edits to old months are picked up.
+    Without a manifest (or on the first run) the cutoff-date logic is used.
+
+    workers > 1 parses the monthly sheets in a process pool (see
+    iter_parsed_sheets); results are merged in workbook order either way.
+
+    With a cube_path, the month × type × category rollup the budget pages
+    read (scripts/budget_cube.py) is rebuilt from the saved transactions.
+
+    Expense merchants (scripts/merchants.py) are resolved into the typed
+    Parquet copy; with a merchant_cache_path, resolutions are cached there so
+    only new descriptions are clustered on later runs.
     """
     print(f"Processing Budget Data (Mode: {'FULL' if full_refresh else 'INCREMENTAL'})...")
 
+    manifest = {} if full_refresh else load_sheet_manifest(manifest_path)
+
     # 1. Determine Cutoff Date
     cutoff_date = None
-    if not full_refresh:
+    if manifest:
+        print(f"   > Sheet manifest found ({len(manifest)} sheets). Re-parsing only changed sheets.")
+    elif not full_refresh:
         inc_cutoff = get_cutoff_date(income_csv_path)
         exp_cutoff = get_cutoff_date(expenses_csv_path)
 
@@ -100,15 +389,14 @@ def process_budget_excel(budget_file, income_csv_path, expenses_csv_path, monthl
             history_expenses = history_expenses.iloc[0:0]  # clear
             history_income = history_income.iloc[0:0]  # clear
 
-    # 3. Parse Excel (New Data)
+    # 3. Parse Excel (New Data) — one pass over the workbook
     print(f"   > Reading Excel file: {budget_file}")
     if not budget_file.exists():
         print(f"CRITICAL ERROR: File not found at {budget_file}")
         return
 
     try:
-        # Load all sheets
-        budget_xlsx = pd.read_excel(budget_file, engine='openpyxl', sheet_name=None)
+        workbook = load_workbook(budget_file, read_only=True, data_only=True, keep_links=False)
     except Exception as e:
         print(f"Error reading Excel file: {e}")
         return
@@ -116,117 +404,76 @@ def process_budget_excel(budget_file, income_csv_path, expenses_csv_path, monthl
     # --- PART A: TRANSACTION LOGS ---
     new_expenses_list = []
     new_income_list = []
+    new_manifest = {}
+    reused_sheets = 0
+    budget_long = None
+    has_targets_sheet = False
 
-    for sheet_name, _ in budget_xlsx.items():
-        # Only process sheets containing "Monthly Budget"
-        if 'Monthly Budget' in sheet_name:
-
-            # --- PROCESS EXPENSES ---
-            try:
-                # Try standard format (skiprows=13)
-                expenses = pd.read_excel(
-                    budget_file, engine='openpyxl', sheet_name=sheet_name,
-                    skiprows=13, usecols=['Amount', 'Date', 'Expense Category', 'Description']
-                )
-            except ValueError:
-                try:
-                    # Fallback for slight format shift (skiprows=14)
-                    expenses = pd.read_excel(
-                        budget_file, engine='openpyxl', sheet_name=sheet_name,
-                        skiprows=14, usecols=['Amount', 'Date', 'Expense Category', 'Description']
-                    )
-                except Exception:
-                    expenses = pd.DataFrame()
-
-            if not expenses.empty:
-                expenses = expenses.rename(columns={'Expense Category': 'Expense_Category'})
-                expenses = expenses.dropna(how='any')
-                expenses['Date'] = pd.to_datetime(expenses['Date'], errors='coerce')
-                expenses = expenses.dropna(subset=['Date'])
-
-                # INCREMENTAL FILTER
-                if cutoff_date:
-                    expenses = expenses[expenses['Date'] >= cutoff_date]
-
+    try:
+        monthly_sheets = [name for name in workbook.sheetnames if 'Monthly Budget' in name]
+        known_hashes = {name: entry.get('hash') for name, entry in manifest.items()}
+        parsed_sheets = iter_parsed_sheets(budget_file, workbook, monthly_sheets, known_hashes, workers=workers)
+
+        for sheet_name, digest, expenses, income in parsed_sheets:
+            if expenses is None:
+                # Unchanged since the last run: reuse its rows as-is
+                cached = manifest[sheet_name]
+                new_manifest[sheet_name] = cached
+                expenses = _records_to_frame(cached['expenses'])
+                income = _records_to_frame(cached['income'])
+                reused_sheets += 1
+            else:
+                new_manifest[sheet_name] = {
+                    'hash': digest,
+                    'expenses': _frame_to_records(expenses),
+                    'income': _frame_to_records(income),
+                }
+
+            # INCREMENTAL FILTER (no-manifest mode only)
+            if cutoff_date:
                 if not expenses.empty:
-                    new_expenses_list.append(expenses)
-
-            # --- PROCESS INCOME ---
-            try:
-                income = pd.read_excel(
-                    budget_file, engine='openpyxl', sheet_name=sheet_name,
-                    skiprows=13, usecols=['Source', 'Amount.1', 'Date Received']
-                )
-            except ValueError:
-                try:
-                    income = pd.read_excel(
-                        budget_file, engine='openpyxl', sheet_name=sheet_name,
-                        skiprows=14, usecols=['Source', 'Amount.1', 'Date Received']
-                    )
-                except Exception:
-                    income = pd.DataFrame()
-
-            if not income.empty:
-                income = income.rename(columns={'Amount.1': 'Amount', 'Date Received': 'Date'})
-                income = income.dropna(how='any')
-                income['Date'] = pd.to_datetime(income['Date'], errors='coerce')
-                income = income.dropna(subset=['Date'])
-
-                # INCREMENTAL FILTER
-                if cutoff_date:
+                    expenses = expenses[expenses['Date'] >= cutoff_date]
+                if not income.empty:
                     income = income[income['Date'] >= cutoff_date]
 
-                if not income.empty:
-                    new_income_list.append(income)
+            if not expenses.empty:
+                new_expenses_list.append(expenses)
+            if not income.empty:
+                new_income_list.append(income)
+
+        if 'Budget v Actual' in workbook.sheetnames:
+            has_targets_sheet = True
+            budget_long = _budget_targets_from_rows(_sheet_rows(workbook['Budget v Actual']))
+    finally:
+        workbook.close()
+
+    if manifest:
+        print(f"   > {reused_sheets} unchanged sheets reused, "
+              f"{len(new_manifest) - reused_sheets} parsed.")
+        # Sheets since removed from the workbook keep their rows until a --full
+        # refresh, the same way pre-cutoff history is retained from the CSVs
+        for sheet_name, cached in manifest.items():
+            if sheet_name in new_manifest:
+                continue
+            new_manifest[sheet_name] = cached
+            for records, target in ((cached['expenses'], new_expenses_list), (cached['income'], new_income_list)):
+                if records:
+                    target.append(_records_to_frame(records))
 
     # --- PART B: BUDGET TARGETS (Budget v Actual) ---
     print("   > Processing Budget Targets (Budget v Actual)...")
-    if 'Budget v Actual' in budget_xlsx:
-        try:
-            # Read Columns A:K (Date, Rent... Disposable)
-            # Header is in row 2 (index 1), so skiprows=1
-            budget_targets = pd.read_excel(
-                budget_file,
-                engine='openpyxl',
-                sheet_name='Budget v Actual',
-                header=1,  # Row 2 is header
-                usecols="A:K"
-            )
-
-            # Rename for consistency
-            budget_targets.rename(columns=lambda x: x.strip() if isinstance(x, str) else x, inplace=True)
-
-            # Ensure Date is parsed
-            if 'Date' in budget_targets.columns:
-                budget_targets['Date'] = pd.to_datetime(budget_targets['Date'], errors='coerce')
-                budget_targets = budget_targets.dropna(subset=['Date'])
-
-                # Melt into Long Format: [Date, Category, Budget_Amount]
-                # This makes plotting easier (Category as color)
-                budget_long = budget_targets.melt(
-                    id_vars=['Date'],
-                    var_name='Category',
-                    value_name='Budget_Amount'
-                )
-
-                # Save
-                budget_long.to_csv(monthly_budget_csv_path, index=False)
-                print(f"   > Saved {len(budget_long)} budget target records to {monthly_budget_csv_path}")
-            else:
-                print("   > Warning: 'Date' column not found in 'Budget v Actual' sheet.")
-        except Exception as e:
-            print(f"   > Error processing Budget v Actual sheet: {e}")
-    else:
+    if not has_targets_sheet:
         print("   > Warning: 'Budget v Actual' sheet not found.")
+    elif budget_long is not None:
+        budget_long.to_csv(monthly_budget_csv_path, index=False)
+        print(f"   > Saved {len(budget_long)} budget target records to {monthly_budget_csv_path}")
 
     # 4. Merge & Deduplicate Transactions
-    new_expenses_df = pd.concat(new_expenses_list, ignore_index=True) if new_expenses_list else pd.DataFrame()
-    new_income_df = pd.concat(new_income_list, ignore_index=True) if new_income_list else pd.DataFrame()
+    print(f"   > Parsed {sum(map(len, new_income_list))} new income rows and "
+          f"{sum(map(len, new_expenses_list))} new expense rows.")
 
-    print(f"   > Parsed {len(new_income_df)} new income rows and {len(new_expenses_df)} new expense rows.")
-
-    final_expenses = pd.concat([history_expenses, new_expenses_df], ignore_index=True)
-    final_income = pd.concat([history_income, new_income_df], ignore_index=True)
+    final_expenses = _concat_nonempty([history_expenses, *new_expenses_list], history_expenses.columns)
+    final_income = _concat_nonempty([history_income, *new_income_list], history_income.columns)
 
     # Clean up
     final_expenses.drop_duplicates(inplace=True)
@@ -235,17 +482,181 @@ def process_budget_excel(budget_file, income_csv_path, expenses_csv_path, monthl
     final_expenses.sort_values('Date', ascending=False, inplace=True)
     final_income.sort_values('Date', ascending=False, inplace=True)
 
-    # 5. Save Output
+    # 5. Save Output (CSV + typed Parquet copy the app reads)
     final_expenses.to_csv(expenses_csv_path, index=False)
     final_income.to_csv(income_csv_path, index=False)
+    merchants = MerchantResolver(merchant_cache_path)
+    write_typed_transactions(final_expenses, "expense", parquet_path_for(expenses_csv_path), merchants)
+    write_typed_transactions(final_income, "income", parquet_path_for(income_csv_path))
+    merchants.save()
+    save_sheet_manifest(manifest_path, new_manifest)
+    if cube_path is not None:
+        cube = build_budget_cube(final_expenses, final_income)
+        write_budget_cube(cube, cube_path)
+        print(f"   > Saved {len(cube)} budget cube rows to {cube_path}")
 
     print(f"Done. Saved transaction data to {expenses_csv_path} and {income_csv_path}.")
 
 
+# ----------------- STREAMING MODE ----------------- #
+
+EXPENSE_OUTPUT_COLUMNS = ['Amount', 'Date', 'Expense_Category', 'Description']
+INCOME_OUTPUT_COLUMNS = ['Source', 'Amount', 'Date']
+
+
+def _row_hashes(df):
+    """
+    One uint64 per row of df. Numeric columns are hashed as float64 so that
+    the same amount parsed as int on one sheet and float on another matches,
+    as it would under drop_duplicates.
+    """
+    numeric = df.select_dtypes(include='number').columns
+    return pd.util.hash_pandas_object(df.astype({c: 'float64' for c in numeric}), index=False).to_numpy()
+
+
+class _IncrementalCsvWriter:
+    """
+    Appends DataFrame chunks to a CSV (and its typed Parquet copy) as they
+    arrive, dropping rows already written (the streaming equivalent of
+    drop_duplicates). Writes go to temporary files that replace the outputs on
+    close(), so an interrupted run never leaves a half-written file behind.
+
+    Rows already written are remembered as one 64-bit hash each (see
+    _row_hashes), not as row tuples. Memory still grows with the number of
+    distinct rows written, but by about one int per row. A 64-bit collision,
+    which would drop a genuinely new row, is negligible at budget-file sizes.
+    """
+
+    def __init__(self, csv_path, columns, kind, merchants=None):
+        self.csv_path = csv_path
+        self.columns = columns
+        self.rows_written = 0
+        self._tmp_path = csv_path.with_suffix(csv_path.suffix + '.tmp')
+        self._seen = set()  # uint64 row hashes
+        pd.DataFrame(columns=columns).to_csv(self._tmp_path, index=False)
+        self._typed = TypedTransactionWriter(parquet_path_for(csv_path), kind, merchants)
+
+    def write(self, chunk):
+        """Appends the chunk's unseen rows; returns the rows actually written."""
+        if chunk.empty:
+            return chunk
+        chunk = chunk[self.columns].sort_values('Date', ascending=False)
+        keys = _row_hashes(chunk)
+        fresh = np.array([key not in self._seen for key in keys.tolist()], dtype=bool)
+        self._seen.update(keys.tolist())
+        chunk = chunk[fresh]
+        chunk = chunk[~chunk.duplicated()]
+        if chunk.empty:
+            return chunk
+        chunk.to_csv(self._tmp_path, mode='a', header=False, index=False)
+        self._typed.write(chunk)
+        self.rows_written += len(chunk)
+        return chunk
+
+    def close(self):
+        os.replace(self._tmp_path, self.csv_path)
+        self._typed.close()
+
+    def discard(self):
+        if self._tmp_path.exists():
+            self._tmp_path.unlink()
+        self._typed.discard()
+
+
+def iter_budget_sheets(workbook):
+    """
+    Yields (sheet_name, expenses, income) for each "Monthly Budget" sheet,
+    reading one sheet's cells at a time; nothing from earlier sheets is kept.
+    """
+    for sheet_name in workbook.sheetnames:
+        if 'Monthly Budget' not in sheet_name:
+            continue
+        rows = _sheet_rows(workbook[sheet_name])
+        expenses = _expenses_from_rows(rows)
+        income = _income_from_rows(rows)
+        del rows
+        yield sheet_name, expenses, income
+
+
+def stream_budget_excel(budget_file, income_csv_path, expenses_csv_path, monthly_budget_csv_path, cube_path=None,
+                        merchant_cache_path=None):
+    """
+    Memory-bounded full rebuild for very large workbooks. The workbook is
+    streamed read-only and each sheet's transactions are appended to the CSVs
+    as soon as that sheet is parsed, so peak memory is one sheet's cells
+    rather than the whole workbook plus every parsed frame.
+
+    Rows are deduplicated across sheets and ordered newest-first within each
+    sheet; sheets are written in workbook order. The budget cube is merged
+    from per-sheet partial cubes, so it never needs all rows at once either.
+    """
+    print("Processing Budget Data (Mode: STREAM)...")
+    print(f"   > Reading Excel file: {budget_file}")
+    if not budget_file.exists():
+        print(f"CRITICAL ERROR: File not found at {budget_file}")
+        return
+
+    try:
+        workbook = load_workbook(budget_file, read_only=True, data_only=True, keep_links=False)
+    except Exception as e:
+        print(f"Error reading Excel file: {e}")
+        return
+
+    merchants = MerchantResolver(merchant_cache_path)
+    expenses_out = _IncrementalCsvWriter(expenses_csv_path, EXPENSE_OUTPUT_COLUMNS, "expense", merchants)
+    income_out = _IncrementalCsvWriter(income_csv_path, INCOME_OUTPUT_COLUMNS, "income")
+    try:
+        sheets = 0
+        partial_cubes = []
+        for sheet_name, expenses, income in iter_budget_sheets(workbook):
+            written_expenses = expenses_out.write(expenses)
+            written_income = income_out.write(income)
+            if cube_path is not None:
+                partial_cubes.append(build_budget_cube(written_expenses, written_income))
+            sheets += 1
+
+        print("   > Processing Budget Targets (Budget v Actual)...")
+        if 'Budget v Actual' in workbook.sheetnames:
+            budget_long = _budget_targets_from_rows(_sheet_rows(workbook['Budget v Actual']))
+            if budget_long is not None:
+                budget_long.to_csv(monthly_budget_csv_path, index=False)
+                print(f"   > Saved {len(budget_long)} budget target records to {monthly_budget_csv_path}")
+        else:
+            print("   > Warning: 'Budget v Actual' sheet not found.")
+    except BaseException:
+        expenses_out.discard()
+        income_out.discard()
+        raise
+    finally:
+        workbook.close()
+
+    expenses_out.close()
+    income_out.close()
+    merchants.save()
+    if cube_path is not None:
+        cube = merge_cubes(partial_cubes)
+        write_budget_cube(cube, cube_path)
+        print(f"   > Saved {len(cube)} budget cube rows to {cube_path}")
+    print(f"   > Streamed {sheets} sheets: {income_out.rows_written} income and "
+          f"{expenses_out.rows_written} expense rows.")
+    print(f"Done. Saved transaction data to {expenses_csv_path} and {income_csv_path}.")
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Process Budget Excel File")
     parser.add_argument('--full', action='store_true', help="Force a full refresh of all data")
+    parser.add_argument('--stream', action='store_true',
+                        help="Memory-bounded full rebuild: stream the workbook one sheet at a time "
+                             "and write the CSVs incrementally")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Parse monthly sheets in N processes (default 1)")
     args = parser.parse_args()
 
     print("BEGINNING BUDGET DATA PROCESSING")
-    process_budget_excel(BUDGET_FILE, INCOME_CSV, EXPENSES_CSV, MONTHLY_BUDGET_CSV, full_refresh=args.full)
\ No newline at end of file
+    if args.stream:
+        stream_budget_excel(BUDGET_FILE, INCOME_CSV, EXPENSES_CSV, MONTHLY_BUDGET_CSV, cube_path=BUDGET_CUBE_PATH,
+                            merchant_cache_path=MERCHANT_CACHE_PATH)
+    else:
+        process_budget_excel(BUDGET_FILE, INCOME_CSV, EXPENSES_CSV, MONTHLY_BUDGET_CSV, full_refresh=args.full,
+                             manifest_path=BUDGET_MANIFEST, workers=args.workers,
+                             cube_path=BUDGET_CUBE_PATH, merchant_cache_path=MERCHANT_CACHE_PATH)
\ No newline at end of file
@@ -1,10 +1,13 @@
 import json
-import time
 import argparse
+import asyncio
+import hashlib
 import sys
+import threading
 import numpy as np
 import pandas as pd
 import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
 from pathlib import Path
@@ -15,14 +18,43 @@ CURRENT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = CURRENT_DIR.parent
 DATA_DIR = PROJECT_ROOT / 'data'
 
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.daily_store import (
+    legacy_csv_path, read_daily_stocks, store_exists, widen_floats, write_daily_stocks,
+)
+from scripts.data_sources import YahooDataSource
+from scripts.indicator_store import update_indicator_store
+from scripts.rate_limiter import TokenBucketLimiter
+from scripts.refresh_checkpoint import CHECKPOINT_DIR, RefreshCheckpoint
+from scripts.response_cache import OfflineCacheMiss, ResponseCache
+
 STOCK_DICT_PATH = DATA_DIR / 'stock_dictionary.json'
 STOCKS_CSV_PATH = DATA_DIR / 'stocks.csv'
-DAILY_STOCKS_CSV_PATH = DATA_DIR / 'daily_stocks.csv'
+DAILY_STOCKS_STORE_DIR = DATA_DIR / 'daily_stocks'
 STOCK_INFO_CSV_PATH = DATA_DIR / 'stock_info.csv'
 
-# Delay between individual yfinance API calls (seconds).
-# 1.5s ≈ 40 req/min, which stays within Yahoo Finance's rate limits.
-API_DELAY = 1.5
+# Where market data comes from. Swapped for a FakeMarketSource (set_data_source)
+# when benchmarking the refresh offline.
+DATA_SOURCE = YahooDataSource()
+
+# Every Yahoo Finance request in a refresh goes through one shared token bucket.
+# 40 req/min (the old fixed 1.5s delay) stays within Yahoo Finance's limits;
+# a small burst lets the first few requests of each phase go out immediately.
+# A 429 halves the rate, which then recovers gradually on successful responses.
+YAHOO_REQUESTS_PER_MINUTE = 40
+YAHOO_BURST = 3
+YAHOO_LIMITER = TokenBucketLimiter(YAHOO_REQUESTS_PER_MINUTE, burst=YAHOO_BURST)
+
+# On-disk cache of successful info / fast_info / history responses
+# (data/.cache/yahoo.sqlite). A re-run after a partial failure only goes to the
+# network for what is missing; --offline serves from it exclusively.
+RESPONSE_CACHE = ResponseCache()
+
+# Journal of per-ticker successes for --resume (data/.checkpoint/). Disabled
+# unless the script is run from the command line.
+CHECKPOINT = RefreshCheckpoint(path=None)
 
 # Fundamentals (sector, PE, target price, etc.) are stable day-to-day.
 # Skip re-fetching any ticker whose stock_info row is younger than this threshold.
@@ -32,6 +64,16 @@ FUNDAMENTALS_STALE_HOURS = 23
 # that phase early and report the issue rather than hanging for minutes.
 CIRCUIT_BREAKER_THRESHOLD = 5
 
+# Start date of every full-history fetch (tickers with no stored history, and
+# every ticker on --full). One common start keeps those tickers in the same
+# batches; days before a ticker's first buy hold no shares and are dropped.
+FULL_HISTORY_START = "2016-01-01"
+
+# Number of tickers requested per yf.download call in the history phase.
+# yfinance still issues one HTTP request per ticker inside the call; batching
+# only saves the per-call overhead and pacing between individual .history() calls.
+HISTORY_BATCH_SIZE = 20
+
 # ----------------- HELPER FUNCTIONS ----------------- #
 
 def load_stock_dictionary(file_path):
@@ -73,6 +115,114 @@ def _replay_transactions(details):
     return total_quantity, total_cost
 
 
+def _parse_txn_date(d_str) -> pd.Timestamp:
+    """Parses a purchase_history date ("M/D/YYYY" or ISO) to a naive Timestamp."""
+    try:
+        return pd.to_datetime(d_str).tz_localize(None)
+    except Exception:
+        return pd.to_datetime(d_str, format="%m/%d/%Y").tz_localize(None)
+
+
+def _build_watermark_index(stock_dictionary, existing_df: pd.DataFrame) -> dict:
+    """
+    Builds the per-ticker watermark index used to plan incremental fetches.
+    No API calls. Returns {ticker: {"last_date", "first_txn", "last_txn",
+    "is_open", "last_held"}} where last_date is the latest stored history row
+    (None if the ticker has no rows on disk), first_txn / last_txn bound its
+    purchase_history and, for a closed position, last_held is the last trading
+    day before its final sell: the last day a stored row can exist, since
+    only days with shares held at the close are kept.
+    """
+    last_dates = {}
+    market_dates = np.array([], dtype="datetime64[ns]")
+    if not existing_df.empty and {"Stock", "Date"}.issubset(existing_df.columns):
+        last_dates = existing_df.groupby("Stock")["Date"].max().to_dict()
+        market_dates = np.unique(pd.to_datetime(existing_df["Date"]).to_numpy(dtype="datetime64[ns]"))
+
+    index = {}
+    for ticker, details in stock_dictionary.items():
+        txn_dates = [_parse_txn_date(t["date"]) for t in details.get("purchase_history", [])]
+        total_quantity, _ = _replay_transactions(details)
+        is_open = total_quantity > 0.001
+        last_txn = max(txn_dates) if txn_dates else None
+        index[ticker] = {
+            "last_date": last_dates.get(ticker),
+            "first_txn": min(txn_dates) if txn_dates else None,
+            "last_txn": last_txn,
+            "is_open": is_open,
+            "last_held": None if is_open or last_txn is None else _last_trading_day_before(last_txn, market_dates),
+        }
+    return index
+
+
+def _last_trading_day_before(day: pd.Timestamp, market_dates: np.ndarray) -> pd.Timestamp:
+    """
+    The last trading day strictly before day. The stored history's dates are
+    the trading calendar when they extend past day (so market holidays are
+    skipped); otherwise the previous business day stands in.
+    """
+    if len(market_dates) and market_dates[-1] >= day.to_datetime64():
+        pos = np.searchsorted(market_dates, day.to_datetime64(), side="left") - 1
+        if pos >= 0:
+            return pd.Timestamp(market_dates[pos])
+    return day - pd.offsets.BDay(1)
+
+
+def _history_start_date(mark: dict, full_refresh=False):
+    """
+    Returns the "YYYY-MM-DD" start date covering exactly the gap in one
+    ticker's stored history, or None when there is nothing to fetch:
+      - no transactions (watchlist ticker) → never produces holdings rows
+      - no stored rows / full refresh     → full history from FULL_HISTORY_START
+      - closed position recorded through
+        its last held day                 → nothing new can appear
+      - otherwise                         → delta from the last stored date
+    """
+    if mark["first_txn"] is None:
+        return None
+    if full_refresh or mark["last_date"] is None:
+        return FULL_HISTORY_START
+    if not mark["is_open"] and mark.get("last_held") is not None and mark["last_date"] >= mark["last_held"]:
+        return None
+    return mark["last_date"].strftime("%Y-%m-%d")
+
+
+def set_data_source(source) -> None:
+    """Points every market-data call at source (YahooDataSource / FakeMarketSource)."""
+    global DATA_SOURCE
+    DATA_SOURCE = source
+
+
+def _is_rate_limit_message(text: str) -> bool:
+    text = str(text).lower()
+    return "429" in text or "too many" in text or "rate limit" in text or "ratelimit" in text
+
+
+def _is_rate_limit_error(e: Exception) -> bool:
+    return isinstance(e, YFRateLimitError) or _is_rate_limit_message(e)
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failures within one phase. Once CIRCUIT_BREAKER_THRESHOLD
+    is reached the phase stops requesting and keeps existing data instead.
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = CIRCUIT_BREAKER_THRESHOLD if threshold is None else threshold
+        self.consecutive_failures = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.consecutive_failures >= self.threshold
+
+    def record_failure(self, count=1):
+        self.consecutive_failures += count
+
+    def record_success(self):
+        self.consecutive_failures = 0
+
+
 def _check_api_available(test_ticker="MSFT") -> bool:
     """
     Quick pre-flight check: try to fetch 2 days of history for one ticker.
@@ -81,7 +231,8 @@ def _check_api_available(test_ticker="MSFT") -> bool:
     """
     print(f"   Pre-flight: checking Yahoo Finance connectivity ({test_ticker})...")
     try:
-        hist = yf.Ticker(test_ticker).history(period="2d")
+        YAHOO_LIMITER.acquire()
+        hist = DATA_SOURCE.recent_history(test_ticker, period="2d")
         if hist.empty:
             print("   Pre-flight FAILED: got empty response — Yahoo Finance may be rate-limiting.")
             return False
@@ -93,160 +244,360 @@ def _check_api_available(test_ticker="MSFT") -> bool:
 
 
 def _safe_ticker_info(ticker: str, retries: int = 2) -> dict:
+    """
+    yf.Ticker(ticker).info through RESPONSE_CACHE: a fresh cached payload is
+    returned without a request; otherwise see _request_ticker_info. Only
+    non-empty payloads are cached, and a stale one is served if the request
+    fails. Returns {} on total failure (or an offline cache miss).
+    """
+    try:
+        return RESPONSE_CACHE.fetch("info", ticker, lambda: _request_ticker_info(ticker, retries),
+                                    cache_if=bool)
+    except OfflineCacheMiss:
+        print(f"     [{ticker}] info not cached (offline)")
+        return {}
+
+
+def _request_ticker_info(ticker: str, retries: int = 2) -> dict:
     """
     Fetch yf.Ticker(ticker).info with retries on JSONDecodeError and 429 rate limits.
-    Uses short backoff (2s / 4s) — enough for transient errors but won't cause
-    multi-hour hangs when Yahoo Finance has fully blocked the session.
+    Each attempt waits its turn on YAHOO_LIMITER; a 429 lowers the shared rate,
+    so the retry (and every other call site) is paced by the limiter rather than
+    a fixed sleep. Bounded retries won't cause multi-hour hangs when Yahoo
+    Finance has fully blocked the session.
     Returns {} on total failure so callers can fall back to cached data.
     """
     for attempt in range(retries + 1):
         try:
-            return yf.Ticker(ticker).info
+            YAHOO_LIMITER.acquire()
+            info = DATA_SOURCE.info(ticker)
+            YAHOO_LIMITER.record_success()
+            return info
         except Exception as e:
-            err = str(e).lower()
+            rate_limited = _is_rate_limit_error(e)
+            if rate_limited:
+                YAHOO_LIMITER.record_rate_limit()
             is_transient = (
-                "429" in err
-                or "too many" in err
-                or "json" in err
+                rate_limited
+                or "json" in str(e).lower()
                 or isinstance(e, (ValueError, json.JSONDecodeError))
             )
             if is_transient and attempt < retries:
-                wait = 2.0 * (2 ** attempt)   # 2s → 4s
-                print(f"     [{ticker}] rate limited — waiting {wait:.0f}s "
+                print(f"     [{ticker}] {'rate limited' if rate_limited else 'transient error'} — "
+                      f"retrying at {YAHOO_LIMITER.rate_per_minute:.0f} req/min "
                       f"(attempt {attempt + 1}/{retries})...")
-                time.sleep(wait)
             else:
                 print(f"     [{ticker}] info fetch failed: {e}")
                 return {}
     return {}
 
 
-# ----------------- CORE LOGIC ----------------- #
+def _fetch_fast_info(ticker: str) -> dict:
+    """
+    Reads the fast_info fields the snapshot and fundamentals builders use
+    (last/previous close and 52-week range) through RESPONSE_CACHE, going to
+    the network (paced by YAHOO_LIMITER) only on a cache miss.
+    Raises on failure so each caller keeps its own fallback.
+    """
+    return RESPONSE_CACHE.fetch("fast_info", ticker, lambda: _request_fast_info(ticker))
+
+
+def _request_fast_info(ticker: str) -> dict:
+    YAHOO_LIMITER.acquire()
+    try:
+        fields = DATA_SOURCE.fast_info(ticker)
+    except Exception as e:
+        if _is_rate_limit_error(e):
+            YAHOO_LIMITER.record_rate_limit()
+        raise
+    YAHOO_LIMITER.record_success()
+    return fields
 
-def create_daily_stock_table(stock_dictionary, csv_path, full_refresh=False):
+
+class QuoteStore:
+    """
+    Per-run memo of each ticker's info and fast_info, shared by the snapshot
+    (stocks.csv) and fundamentals (stock_info.csv) builders so an owned ticker
+    costs one info and one fast_info request per refresh instead of two each.
+
+    Thread-safe and single-flight: concurrent callers asking for the same
+    ticker wait on one in-progress fetch instead of issuing their own.
+    Failures are memoized too (info → {}, fast_info → the raised exception is
+    re-raised), so a failing ticker isn't retried by the second builder.
     """
-    Fetches price history for every ticker and replays transactions to produce
-    per-day holdings, cost basis, market value, and profit rows.
 
-    This is the primary data-fetching phase. Prices for stocks.csv are derived
-    from the latest rows here rather than making a separate round of API calls.
+    def __init__(self):
+        self._results = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def _get(self, kind: str, ticker: str, loader):
+        key = (kind, ticker)
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._results:
+                try:
+                    self._results[key] = (True, loader(ticker))
+                except Exception as e:
+                    self._results[key] = (False, e)
+        ok, value = self._results[key]
+        if not ok:
+            raise value
+        return value
+
+    def info(self, ticker: str) -> dict:
+        return self._get("info", ticker, _safe_ticker_info)
+
+    def fast_info(self, ticker: str) -> dict:
+        return self._get("fast_info", ticker, _fetch_fast_info)
 
-    Incremental mode resumes from the last date already on disk; full refresh
-    starts from 2016-01-01. A circuit breaker stops the fetch early if Yahoo
-    Finance appears to be rate-limiting the entire session.
+    def clear(self):
+        with self._guard:
+            self._results.clear()
+            self._locks.clear()
+
+
+# Quotes fetched during this refresh; both builders read through it
+QUOTES = QuoteStore()
+
+
+# ----------------- CORE LOGIC ----------------- #
+
+def _fetch_history_batch(tickers, start_date):
     """
-    print(f"   > Updating Historical Daily Data (Mode: {'FULL' if full_refresh else 'INCREMENTAL'})...")
+    Fetches daily price history for a group of tickers in one yf.download call
+    (via DATA_SOURCE) and splits the wide (ticker, field) result back into one
+    frame per ticker, shaped like yf.Ticker(ticker).history().
+    Tickers Yahoo returned nothing for map to an empty DataFrame.
+    Returns (frames, errors), where errors holds the per-ticker failure
+    messages yf.download reported instead of raising.
+    Raises on call-level failure so the caller can count the whole batch.
+    """
+    wide = DATA_SOURCE.download(tickers, start_date)
+    errors = dict(wide.attrs.get("errors", {})) if wide is not None else {}
+    frames = {}
+    returned = set(wide.columns.get_level_values(0)) if wide is not None and not wide.empty else set()
+    for ticker in tickers:
+        if ticker not in returned:
+            frames[ticker] = pd.DataFrame()
+            continue
+        hist = wide[ticker].dropna(subset=["Close"])
+        if not hist.empty and hist.index.tz is not None:
+            hist.index = hist.index.tz_localize(None)
+        hist.index.name = "Date"
+        frames[ticker] = hist
+    return frames, errors
+
+
+DAILY_HOLDINGS_COLUMNS = ["Date", "Close", "Stock", "Shares_Held", "Avg_Cost",
+                          "Equity", "Market_Value", "Total_Profit"]
+
+
+def _transaction_steps(details):
+    """
+    Replays a ticker's date-sorted transactions into step series: for each
+    transaction, the quantity held and cost basis immediately after it.
+    Sells reduce cost basis at the average cost at the time of sale, exactly
+    as _replay_transactions does. Loops over transactions only (a handful per
+    ticker), never over trading days.
+    Returns (dates datetime64[ns] array, quantity array, cost array).
+    """
+    txns = sorted(
+        (
+            (_parse_txn_date(t["date"]), float(t["quantity"]), float(t["share_price"]), t["buy_sell"])
+            for t in details.get("purchase_history", [])
+        ),
+        key=lambda x: x[0],
+    )
+    qty_steps = np.empty(len(txns))
+    cost_steps = np.empty(len(txns))
+    current_qty = 0.0
+    current_cost_basis = 0.0
+    for i, (_, qty, price, kind) in enumerate(txns):
+        if kind == "buy":
+            current_cost_basis += qty * price
+            current_qty += qty
+        elif kind == "sell":
+            sell_qty = min(qty, max(current_qty, 0.0))
+            if current_qty > 0 and sell_qty > 0:
+                avg = current_cost_basis / current_qty
+                current_cost_basis -= sell_qty * avg
+            current_qty -= sell_qty
+        qty_steps[i] = current_qty
+        cost_steps[i] = current_cost_basis
+    dates = np.array([t[0] for t in txns], dtype="datetime64[ns]")
+    return dates, qty_steps, cost_steps
+
+
+def _replay_daily_holdings(ticker, details, hist) -> pd.DataFrame:
+    """
+    Aligns a ticker's transaction step series to its price history and returns
+    one row per trading day on which shares were held, computed as whole-array
+    operations: each market date takes the state after the last transaction
+    dated on or before it (np.searchsorted), then Avg_Cost, Market_Value and
+    Total_Profit follow element-wise.
+    """
+    txn_dates, qty_steps, cost_steps = _transaction_steps(details)
+    if len(txn_dates) == 0 or hist.empty:
+        return pd.DataFrame(columns=DAILY_HOLDINGS_COLUMNS)
+
+    hist = hist.reset_index()
+    market_dates = pd.to_datetime(hist["Date"]).dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    closes = hist["Close"].to_numpy(dtype=float)
+
+    pos = np.searchsorted(txn_dates, market_dates, side="right") - 1
+    has_txn = pos >= 0
+    shares = np.where(has_txn, qty_steps[pos.clip(min=0)], 0.0)
+    equity = np.where(has_txn, cost_steps[pos.clip(min=0)], 0.0)
+
+    held = shares > 0.001
+    shares, equity, closes = shares[held], equity[held], closes[held]
+    market_value = shares * closes
+    return pd.DataFrame({
+        "Date": market_dates[held],
+        "Close": closes,
+        "Stock": ticker,
+        "Shares_Held": shares,
+        "Avg_Cost": equity / shares,
+        "Equity": equity,
+        "Market_Value": market_value,
+        "Total_Profit": market_value - equity,
+    }, columns=DAILY_HOLDINGS_COLUMNS)
+
+
+def _load_existing_history(store_dir) -> pd.DataFrame:
+    """
+    Reads the stored holdings history from the Parquet store, or — on the
+    first run after upgrading — from the legacy daily_stocks.csv next to it.
+    """
+    if store_exists(store_dir):
+        return widen_floats(read_daily_stocks(store_dir))
+    csv_path = legacy_csv_path(store_dir)
+    if csv_path.exists():
+        print(f"     Migrating legacy {csv_path.name} into the Parquet store...")
+        return pd.read_csv(csv_path)
+    return pd.DataFrame()
+
 
+def _plan_history_fetch(stock_dictionary, store_dir, full_refresh=False,
+                        batch_size=HISTORY_BATCH_SIZE):
+    """
+    Loads the stored history and groups the tickers that need fetching into
+    batches that share a start date. No API calls.
+    Tickers already journaled in CHECKPOINT (a resumed run) are restored from
+    it instead of being fetched again.
+    Returns (existing_df, batches, to_fetch, resumed) where batches is a list
+    of (start_date, [tickers]), to_fetch is every ticker across all batches
+    and resumed maps restored tickers to their replayed frames.
+    """
     existing_df = pd.DataFrame()
-    start_date = "2016-01-01"
 
-    if not full_refresh and csv_path.exists():
+    if not full_refresh:
         try:
-            existing_df = pd.read_csv(csv_path)
+            existing_df = _load_existing_history(store_dir)
             if not existing_df.empty and "Date" in existing_df.columns:
+                existing_df["Stock"] = existing_df["Stock"].astype(str)
                 existing_df["Date"] = pd.to_datetime(existing_df["Date"])
                 if "Shares_Held" in existing_df.columns:
                     existing_df = existing_df[existing_df["Shares_Held"] > 0]
-                last_date = existing_df["Date"].max()
-                start_date = last_date.strftime("%Y-%m-%d")
-                print(f"     Existing data found. Fetching from {start_date} onward...")
+                print(f"     Existing data found through {existing_df['Date'].max().date()}.")
         except Exception as e:
             print(f"     Error reading existing history ({e}). Falling back to full refresh.")
             existing_df = pd.DataFrame()
 
-    new_rows = []
-    succeeded = 0
-    failed_tickers = []
-    consecutive_failures = 0
-
-    for ticker, details in stock_dictionary.items():
-        if consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD:
-            remaining = list(stock_dictionary.keys())
-            idx = remaining.index(ticker) if ticker in remaining else 0
-            skipped = remaining[idx:]
-            print(f"     Circuit breaker: {CIRCUIT_BREAKER_THRESHOLD} consecutive failures. "
-                  f"Stopping history fetch early. Skipped: {skipped}")
-            break
-
-        try:
-            time.sleep(API_DELAY)
-            hist = yf.Ticker(ticker).history(start=start_date)
-
-            if hist.empty:
-                print(f"     [{ticker}] no price history returned")
-                failed_tickers.append(ticker)
-                consecutive_failures += 1
-                continue
-
-            consecutive_failures = 0  # reset on success
-
-            hist.reset_index(inplace=True)
-            hist["Date"] = hist["Date"].dt.tz_localize(None)
-
-            txns = []
-            for t in details["purchase_history"]:
-                d_str = t["date"]
-                try:
-                    d = pd.to_datetime(d_str).tz_localize(None)
-                except Exception:
-                    d = pd.to_datetime(d_str, format="%m/%d/%Y").tz_localize(None)
-                txns.append({
-                    'date': d,
-                    'qty': float(t['quantity']),
-                    'price': float(t['share_price']),
-                    'type': t['buy_sell']
-                })
-            txns.sort(key=lambda x: x['date'])
-
-            current_qty = 0.0
-            current_cost_basis = 0.0
-            txn_idx = 0
-            stock_rows = []
-
-            for _, row in hist.iterrows():
-                market_date = row["Date"]
-                close_price = row["Close"]
-
-                while txn_idx < len(txns) and txns[txn_idx]['date'] <= market_date:
-                    t = txns[txn_idx]
-                    if t['type'] == 'buy':
-                        current_cost_basis += (t['qty'] * t['price'])
-                        current_qty += t['qty']
-                    elif t['type'] == 'sell':
-                        sell_qty = min(t['qty'], max(current_qty, 0.0))
-                        if current_qty > 0 and sell_qty > 0:
-                            avg = current_cost_basis / current_qty
-                            current_cost_basis -= (sell_qty * avg)
-                        current_qty -= sell_qty
-                    txn_idx += 1
-
-                if current_qty > 0.001:
-                    avg_cost = current_cost_basis / current_qty
-                    market_val = current_qty * close_price
-                    stock_rows.append({
-                        "Date": market_date,
-                        "Close": close_price,
-                        "Stock": ticker,
-                        "Shares_Held": current_qty,
-                        "Avg_Cost": avg_cost,
-                        "Equity": current_cost_basis,
-                        "Market_Value": market_val,
-                        "Total_Profit": market_val - current_cost_basis
-                    })
-
-            new_rows.extend(stock_rows)
-            succeeded += 1
-
-        except Exception as e:
-            print(f"     [{ticker}] history fetch error: {e}")
-            failed_tickers.append(ticker)
-            consecutive_failures += 1
+    # Plan: group tickers by start date so each batch shares one request window
+    watermarks = _build_watermark_index(stock_dictionary, existing_df)
+    by_start = {}
+    up_to_date = []
+    for ticker, mark in watermarks.items():
+        start = _history_start_date(mark, full_refresh)
+        if start is None:
+            up_to_date.append(ticker)
+        else:
+            by_start.setdefault(start, []).append(ticker)
+
+    resumed = {}
+    for start, group in list(by_start.items()):
+        for ticker in CHECKPOINT.done("history") & set(group):
+            resumed[ticker] = CHECKPOINT.get("history", ticker)
+        by_start[start] = [t for t in group if t not in resumed]
+        if not by_start[start]:
+            del by_start[start]
+    if resumed:
+        print(f"     Resuming: {len(resumed)} ticker(s) restored from checkpoint")
+
+    to_fetch = [t for group in by_start.values() for t in group]
+    backfill = [t for t in to_fetch if watermarks[t]["last_date"] is None]
+    if not full_refresh:
+        print(f"     Plan: {len(to_fetch) - len(backfill)} delta, {len(backfill)} full-history backfill, "
+              f"{len(up_to_date)} skipped (up to date or no transactions)")
+        if backfill:
+            print(f"     Backfilling: {backfill}")
+
+    batch_size = max(int(batch_size), 1)
+    batches = [
+        (start, group[i:i + batch_size])
+        for start, group in sorted(by_start.items())
+        for i in range(0, len(group), batch_size)
+    ]
+    print(f"     Fetching {len(to_fetch)} tickers in {len(batches)} batch(es) of up to {batch_size}...")
+    return existing_df, batches, to_fetch, resumed
+
+
+def _fetch_history_request(batch, start_date) -> dict:
+    """
+    History for a batch, served per ticker from RESPONSE_CACHE where possible;
+    only the tickers missing from the cache go out, as one yf.download call
+    that takes one YAHOO_LIMITER token per ticker (yfinance sends one request
+    each). yf.download reports 429s per ticker rather than raising, so those
+    messages lower the shared rate too. Offline, uncached tickers come back
+    empty. Raises on call-level failure.
+    """
+    frames = {}
+    missing = []
+    for ticker in batch:
+        cached = RESPONSE_CACHE.get("history", f"{ticker}:{start_date}", allow_stale=RESPONSE_CACHE.offline)
+        if cached is None:
+            missing.append(ticker)
+        else:
+            frames[ticker] = cached
+    if not missing:
+        return frames
+    if RESPONSE_CACHE.offline:
+        print(f"     [{', '.join(missing)}] history not cached (offline)")
+        frames.update({t: pd.DataFrame() for t in missing})
+        return frames
+
+    YAHOO_LIMITER.acquire(len(missing))
+    try:
+        fetched, errors = _fetch_history_batch(missing, start_date)
+    except Exception as e:
+        if _is_rate_limit_error(e):
+            YAHOO_LIMITER.record_rate_limit()
+        raise
+    rate_limited = [t for t, message in errors.items() if _is_rate_limit_message(message)]
+    if rate_limited:
+        YAHOO_LIMITER.record_rate_limit()
+        print(f"     [{', '.join(rate_limited)}] rate-limited, "
+              f"slowing to {YAHOO_LIMITER.rate_per_minute:.0f} req/min")
+    else:
+        YAHOO_LIMITER.record_success()
+    for ticker, hist in fetched.items():
+        if not hist.empty:
+            RESPONSE_CACHE.put("history", f"{ticker}:{start_date}", hist)
+    frames.update(fetched)
+    return frames
 
-    total = len(stock_dictionary)
-    print(f"     History: {succeeded}/{total} tickers OK"
-          + (f" | Failed: {failed_tickers}" if failed_tickers else ""))
 
-    new_df = pd.DataFrame(new_rows)
+def _finalize_history(existing_df: pd.DataFrame, new_frames) -> pd.DataFrame:
+    """
+    Merges freshly replayed per-ticker frames into the stored history,
+    forward-fills tickers missing the latest market date and recomputes the
+    Daily_Profit / Daily_Pct_Profit columns. No API calls.
+    """
+    new_frames = [f for f in new_frames if not f.empty]
+    new_df = pd.concat(new_frames, ignore_index=True) if new_frames else pd.DataFrame()
 
     if not existing_df.empty:
         if new_df.empty:
@@ -288,47 +639,164 @@ def create_daily_stock_table(stock_dictionary, csv_path, full_refresh=False):
     return combined
 
 
-def _fetch_ticker_metadata(ticker: str, pos: dict, latest_prices: dict) -> dict:
+def create_daily_stock_table(stock_dictionary, store_dir, full_refresh=False,
+                             batch_size=HISTORY_BATCH_SIZE):
     """
-    Fetches 52-week range, company name, and pct_change for a single ticker.
-    Designed to run inside a ThreadPoolExecutor worker — sleeps API_DELAY before
-    making any network calls to keep per-thread request rate inside Yahoo's limits.
-    Returns a flat dict of all columns needed for stocks.csv.
-    Raises on unrecoverable failure so the caller can append a fallback row.
+    Fetches price history for every ticker and replays transactions to produce
+    per-day holdings, cost basis, market value, and profit rows.
+
+    This is the primary data-fetching phase. Prices for stocks.csv are derived
+    from the latest rows here rather than making a separate round of API calls.
+
+    Tickers are fetched batch_size at a time with one yf.download call per
+    batch. yfinance still makes one HTTP request per ticker inside that call,
+    so a 92-ticker refresh is still 92 requests; batching only removes the
+    per-call overhead and pacing between them.
+
+    Each ticker is fetched from its own watermark (see _history_start_date):
+    tickers new to stock_dictionary.json — or that failed last run — get their
+    missing history backfilled, the rest only the delta since their last stored
+    row. Backfills and full refreshes all start from FULL_HISTORY_START, so
+    they batch together regardless of each ticker's first buy. A circuit
+    breaker stops the fetch early if Yahoo Finance appears to be rate-limiting
+    the entire session.
     """
-    total_quantity = pos["total_quantity"]
-    total_cost = pos["total_cost"]
-    company_name = pos["company_name"]
-    current_price = float(latest_prices.get(ticker, 0))
+    print(f"   > Updating Historical Daily Data (Mode: {'FULL' if full_refresh else 'INCREMENTAL'})...")
+
+    existing_df, batches, to_fetch, resumed = _plan_history_fetch(
+        stock_dictionary, store_dir, full_refresh, batch_size
+    )
+
+    new_frames = list(resumed.values())
+    succeeded = 0
+    failed_tickers = []
+    breaker = CircuitBreaker()
+
+    for batch_idx, (start_date, batch) in enumerate(batches):
+        if breaker.is_open:
+            skipped = [t for _, b in batches[batch_idx:] for t in b]
+            print(f"     Circuit breaker: {CIRCUIT_BREAKER_THRESHOLD} consecutive failures. "
+                  f"Stopping history fetch early. Skipped: {skipped}")
+            for ticker in skipped:
+                CHECKPOINT.mark_failed("history", ticker)
+            break
+
+        try:
+            frames = _fetch_history_request(batch, start_date)
+        except Exception as e:
+            print(f"     [{', '.join(batch)}] history batch error: {e}")
+            failed_tickers.extend(batch)
+            breaker.record_failure(len(batch))
+            continue
+
+        for ticker in batch:
+            hist = frames.get(ticker, pd.DataFrame())
+            if hist.empty:
+                print(f"     [{ticker}] no price history returned")
+                failed_tickers.append(ticker)
+                breaker.record_failure()
+                continue
+
+            breaker.record_success()
+
+            try:
+                frame = _replay_daily_holdings(ticker, stock_dictionary[ticker], hist)
+                new_frames.append(frame)
+                CHECKPOINT.record("history", ticker, frame)
+                succeeded += 1
+            except Exception as e:
+                print(f"     [{ticker}] history processing error: {e}")
+                failed_tickers.append(ticker)
+
+    for ticker in failed_tickers:
+        CHECKPOINT.mark_failed("history", ticker)
+    total = len(to_fetch)
+    print(f"     History: {succeeded}/{total} tickers OK"
+          + (f" | Failed: {failed_tickers}" if failed_tickers else ""))
 
-    high_52 = 0.0
-    low_52 = 0.0
-    pct_change = 0.0
+    return _finalize_history(existing_df, new_frames)
 
-    time.sleep(API_DELAY)
-    stock = yf.Ticker(ticker)
+
+def _active_positions(stock_dictionary) -> dict:
+    """Replays transactions (no API calls) → {ticker: quantity, cost, name} for open positions."""
+    active_positions = {}
+    for ticker, details in stock_dictionary.items():
+        total_quantity, total_cost = _replay_transactions(details)
+        if total_quantity > 0.001:
+            active_positions[ticker] = {
+                "total_quantity": total_quantity,
+                "total_cost": total_cost,
+                "company_name": details.get("stock_name", ticker),
+            }
+    return active_positions
+
+
+def _latest_prices(daily_df: pd.DataFrame) -> dict:
+    """{ticker: most recent Close} from the holdings history (no API calls)."""
+    if daily_df.empty or "Stock" not in daily_df.columns or "Close" not in daily_df.columns:
+        return {}
+    daily_df_copy = daily_df.copy()
+    daily_df_copy["Date"] = pd.to_datetime(daily_df_copy["Date"])
+    latest = (
+        daily_df_copy.sort_values("Date")
+        .groupby("Stock")
+        .last()
+        .reset_index()[["Stock", "Close"]]
+    )
+    return dict(zip(latest["Stock"], latest["Close"]))
+
+
+def _fetch_ticker_quote(ticker: str, company_name: str) -> dict:
+    """
+    Network half of the snapshot metadata: 52-week range and fallback price
+    from fast_info, company name and 52-week change from info, both read
+    through QUOTES so the fundamentals builder reuses them. Each request waits
+    on the shared YAHOO_LIMITER, so any number of workers stays inside Yahoo's
+    limits. A failed fast_info or info call leaves its fields at 0.
+    Complete quotes are journaled in CHECKPOINT and served from it on resume.
+    """
+    journaled = CHECKPOINT.get("quote", ticker)
+    if journaled is not None:
+        return journaled
+
+    quote = {"company_name": company_name, "pct_change": 0.0,
+             "high_52": 0.0, "low_52": 0.0, "fast_price": 0.0}
+    complete = True
 
     # 52wk range via fast_info (lightweight call)
     try:
-        fi = stock.fast_info
-        high_52 = getattr(fi, "year_high", None) or 0.0
-        low_52 = getattr(fi, "year_low", None) or 0.0
-        # Use fast_info price only if daily history gave us nothing
-        if current_price == 0:
-            current_price = float(
-                getattr(fi, "last_price", None) or
-                getattr(fi, "previous_close", None) or 0
-            )
+        fi = QUOTES.fast_info(ticker)
+        quote["high_52"] = fi["year_high"] or 0.0
+        quote["low_52"] = fi["year_low"] or 0.0
+        quote["fast_price"] = float(fi["last_price"] or fi["previous_close"] or 0)
     except Exception:
-        pass
+        complete = False
 
     # Company name and 52-week change from full info
     try:
-        info = _safe_ticker_info(ticker)
-        company_name = info.get("longName", company_name)
-        pct_change = (info.get("52WeekChange", 0) or 0) * 100
+        info = QUOTES.info(ticker)
+        quote["company_name"] = info.get("longName", company_name)
+        quote["pct_change"] = (info.get("52WeekChange", 0) or 0) * 100
+        complete = complete and bool(info)
     except Exception:
-        pass
+        complete = False
+
+    if complete:
+        CHECKPOINT.record("quote", ticker, quote)
+    else:
+        CHECKPOINT.mark_failed("quote", ticker)
+    return quote
+
+
+def _summary_row(ticker: str, pos: dict, quote: dict, history_price: float) -> dict:
+    """
+    Pure half of the snapshot metadata: combines a position, its quote and the
+    latest price from daily history into one flat stocks.csv row dict.
+    The fast_info price is used only if daily history gave us nothing.
+    """
+    total_quantity = pos["total_quantity"]
+    total_cost = pos["total_cost"]
+    current_price = float(history_price or 0) or quote["fast_price"]
 
     avg_cost = total_cost / total_quantity if total_quantity > 0 else 0
     market_value = total_quantity * current_price
@@ -336,18 +804,70 @@ def _fetch_ticker_metadata(ticker: str, pos: dict, latest_prices: dict) -> dict:
 
     return {
         "ticker": ticker,
-        "company_name": company_name,
+        "company_name": quote["company_name"],
         "current_price": current_price,
         "total_quantity": total_quantity,
         "avg_cost": avg_cost,
         "market_value": market_value,
-        "pct_change": pct_change,
+        "pct_change": quote["pct_change"],
         "equity_change": equity_change,
-        "high_52": high_52,
-        "low_52": low_52,
+        "high_52": quote["high_52"],
+        "low_52": quote["low_52"],
     }
 
 
+def _fetch_ticker_metadata(ticker: str, pos: dict, latest_prices: dict) -> dict:
+    """
+    Fetches 52-week range, company name, and pct_change for a single ticker.
+    Designed to run inside a ThreadPoolExecutor worker — every network call waits
+    on the shared YAHOO_LIMITER, so the pool as a whole stays inside Yahoo's limits.
+    Returns a flat dict of all columns needed for stocks.csv.
+    Raises on unrecoverable failure so the caller can append a fallback row.
+    """
+    quote = _fetch_ticker_quote(ticker, pos["company_name"])
+    return _summary_row(ticker, pos, quote, latest_prices.get(ticker, 0))
+
+
+def _summary_list_row(r: dict) -> list:
+    return [
+        r["ticker"], r["company_name"], r["current_price"],
+        r["total_quantity"], r["avg_cost"], r["market_value"],
+        r["pct_change"], r["equity_change"], r["high_52"], r["low_52"],
+        "Stock"
+    ]
+
+
+def _fallback_summary_row(ticker: str, pos: dict, price: float) -> list:
+    """Zero-filled fallback so a ticker whose metadata failed still appears in stocks.csv."""
+    tq = pos["total_quantity"]
+    tc = pos["total_cost"]
+    cp = float(price or 0)
+    return [
+        ticker, pos["company_name"], cp, tq,
+        tc / tq if tq > 0 else 0,
+        tq * cp, 0.0, tq * cp - tc, 0.0, 0.0, "Stock"
+    ]
+
+
+SUMMARY_COLUMNS = ["Stock", "Company", "Price", "Quantity", "Avg_Cost", "Market_Value",
+                   "Percent_Change", "Equity_Change", "52_Week_High", "52_Week_Low", "Asset_Type"]
+
+
+def _summary_frame(stock_data) -> pd.DataFrame:
+    """Assembles stocks.csv rows into the final frame (diversity, direction, rounding)."""
+    df = pd.DataFrame(stock_data, columns=SUMMARY_COLUMNS)
+
+    if not df.empty:
+        total_mv = df["Market_Value"].sum()
+        df["Portfolio_Diversity"] = round(df["Market_Value"] * 100 / total_mv, 2) if total_mv > 0 else 0
+        df["Direction"] = np.where(df["Percent_Change"] > 0, 'Up', 'Down')
+        for c in ["Price", "Quantity", "Avg_Cost", "Market_Value", "Equity_Change", "52_Week_High", "52_Week_Low"]:
+            df[c] = df[c].round(2)
+        return df.sort_values(by="Market_Value", ascending=False)
+
+    return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+
 def build_summary_dataframe(stock_dictionary, daily_df: pd.DataFrame) -> pd.DataFrame:
     """
     Builds the current-holdings snapshot (stocks.csv) by:
@@ -363,15 +883,7 @@ def build_summary_dataframe(stock_dictionary, daily_df: pd.DataFrame) -> pd.Data
     print("   > Building Current Holdings Snapshot...")
 
     # Phase 1: transaction replay
-    active_positions = {}
-    for ticker, details in stock_dictionary.items():
-        total_quantity, total_cost = _replay_transactions(details)
-        if total_quantity > 0.001:
-            active_positions[ticker] = {
-                "total_quantity": total_quantity,
-                "total_cost": total_cost,
-                "company_name": details.get("stock_name", ticker),
-            }
+    active_positions = _active_positions(stock_dictionary)
 
     if not active_positions:
         print("     No active positions found.")
@@ -382,24 +894,14 @@ def build_summary_dataframe(stock_dictionary, daily_df: pd.DataFrame) -> pd.Data
           f"({len(stock_dictionary) - len(active_tickers)} sold/inactive skipped)")
 
     # Phase 2: derive latest price from daily_df (zero extra API calls)
-    latest_prices = {}
-    if not daily_df.empty and "Stock" in daily_df.columns and "Close" in daily_df.columns:
-        daily_df_copy = daily_df.copy()
-        daily_df_copy["Date"] = pd.to_datetime(daily_df_copy["Date"])
-        latest = (
-            daily_df_copy.sort_values("Date")
-            .groupby("Stock")
-            .last()
-            .reset_index()[["Stock", "Close"]]
-        )
-        latest_prices = dict(zip(latest["Stock"], latest["Close"]))
+    latest_prices = _latest_prices(daily_df)
+    if latest_prices:
         found = sum(1 for t in active_tickers if latest_prices.get(t, 0) > 0)
         print(f"     Prices sourced from history: {found}/{len(active_tickers)}")
 
     # Phase 3: per-ticker metadata (52wk range, pct_change) — parallel fetch
-    # 3 workers × API_DELAY sleep per worker ≈ 3× throughput vs sequential.
-    # Submissions are staggered 0.5s apart so the first batch of workers doesn't
-    # burst all three API calls at the same instant.
+    # Workers overlap network latency; the shared token bucket, not per-worker
+    # sleeps, caps the request rate, so no submission stagger is needed.
     print(f"     Fetching metadata for {len(active_tickers)} tickers "
           f"(parallel, max_workers=3)...")
     stock_data = []
@@ -408,7 +910,6 @@ def build_summary_dataframe(stock_dictionary, daily_df: pd.DataFrame) -> pd.Data
     with ThreadPoolExecutor(max_workers=3) as executor:
         futures = {}
         for ticker in active_tickers:
-            time.sleep(0.5)  # stagger submissions to prevent initial burst
             fut = executor.submit(
                 _fetch_ticker_metadata, ticker, active_positions[ticker], latest_prices
             )
@@ -417,60 +918,27 @@ def build_summary_dataframe(stock_dictionary, daily_df: pd.DataFrame) -> pd.Data
         for fut in as_completed(futures):
             ticker = futures[fut]
             try:
-                r = fut.result()
-                stock_data.append([
-                    r["ticker"], r["company_name"], r["current_price"],
-                    r["total_quantity"], r["avg_cost"], r["market_value"],
-                    r["pct_change"], r["equity_change"], r["high_52"], r["low_52"],
-                    "Stock"
-                ])
+                stock_data.append(_summary_list_row(fut.result()))
             except Exception as e:
                 print(f"     [{ticker}] metadata fetch failed: {e}")
                 total_failures += 1
-                # Zero-filled fallback so the ticker still appears in stocks.csv
-                pos = active_positions[ticker]
-                tq = pos["total_quantity"]
-                tc = pos["total_cost"]
-                cp = float(latest_prices.get(ticker, 0))
-                stock_data.append([
-                    ticker, pos["company_name"], cp, tq,
-                    tc / tq if tq > 0 else 0,
-                    tq * cp, 0.0, tq * cp - tc, 0.0, 0.0, "Stock"
-                ])
+                stock_data.append(
+                    _fallback_summary_row(ticker, active_positions[ticker], latest_prices.get(ticker, 0))
+                )
 
     if total_failures >= CIRCUIT_BREAKER_THRESHOLD:
         print(f"     Warning: {total_failures} tickers failed metadata fetch — "
               f"Yahoo Finance may be rate-limiting. Prices from daily history "
               f"are still accurate; metadata (52W range, pct_change) may be stale.")
 
-    cols = ["Stock", "Company", "Price", "Quantity", "Avg_Cost", "Market_Value",
-            "Percent_Change", "Equity_Change", "52_Week_High", "52_Week_Low", "Asset_Type"]
-
-    df = pd.DataFrame(stock_data, columns=cols)
-
-    if not df.empty:
-        total_mv = df["Market_Value"].sum()
-        df["Portfolio_Diversity"] = round(df["Market_Value"] * 100 / total_mv, 2) if total_mv > 0 else 0
-        df["Direction"] = np.where(df["Percent_Change"] > 0, 'Up', 'Down')
-        for c in ["Price", "Quantity", "Avg_Cost", "Market_Value", "Equity_Change", "52_Week_High", "52_Week_Low"]:
-            df[c] = df[c].round(2)
-        return df.sort_values(by="Market_Value", ascending=False)
-
-    return pd.DataFrame(columns=cols)
+    return _summary_frame(stock_data)
 
 
-def create_stock_info_table(stock_dict, csv_path, full_refresh=False):
+def _plan_fundamentals(stock_dict, csv_path, full_refresh=False):
     """
-    Fetches fundamentals (sector, PE, target price, etc.) for all tickers.
-
-    Incremental mode skips any ticker whose Last Updated is within
-    FUNDAMENTALS_STALE_HOURS — fundamentals don't change daily, so re-fetching
-    them on every run is the primary driver of 429 rate limits.
-    Falls back to existing data for any ticker whose fetch fails.
-    A circuit breaker stops early if the entire session appears rate-limited.
+    Loads the existing stock_info.csv and decides which tickers are stale.
+    No API calls. Returns (existing_df, tickers_to_fetch, fresh_tickers).
     """
-    print("   > Updating Fundamentals...")
-
     existing_df = pd.DataFrame()
     if not full_refresh and csv_path.exists():
         try:
@@ -505,6 +973,107 @@ def create_stock_info_table(stock_dict, csv_path, full_refresh=False):
         except Exception as e:
             print(f"     Staleness check failed ({e}); fetching all tickers.")
 
+    return existing_df, tickers_to_fetch, fresh_tickers
+
+
+def _fetch_fundamentals_row(ticker: str) -> dict:
+    """
+    Fetches one ticker's fundamentals (info + fast_info, via QUOTES) and
+    returns its stock_info.csv row. Raises if info comes back empty so the caller can
+    preserve the existing row instead. Rows are journaled in CHECKPOINT and
+    served from it on resume.
+    """
+    journaled = CHECKPOINT.get("fundamentals", ticker)
+    if journaled is not None:
+        return journaled
+
+    info = QUOTES.info(ticker)
+    if not info:
+        CHECKPOINT.mark_failed("fundamentals", ticker)
+        raise ValueError(f"Empty info for {ticker}")
+
+    def get(key, default=0):
+        return info.get(key, default)
+
+    # Current price + 52W range from fast_info
+    price = 0
+    week_high_52 = 0
+    week_low_52 = 0
+    try:
+        fi = QUOTES.fast_info(ticker)
+        price = float(
+            fi["last_price"] or
+            fi["previous_close"] or
+            get("currentPrice", 0)
+        )
+        week_high_52 = fi["year_high"] or 0
+        week_low_52 = fi["year_low"] or 0
+    except Exception:
+        price = float(get("currentPrice", 0))
+
+    row = {
+        "Stock": ticker,
+        "Company": get("longName", ticker),
+        "CEO": (get("companyOfficers", [{}])[0].get("name", "N/A")
+                if get("companyOfficers") else "N/A"),
+        "Country": get("country", "N/A"),
+        "State": get("state", "N/A"),
+        "City": get("city", "N/A"),
+        "Sector": get("sector", "N/A"),
+        "Industry": get("industry", "N/A"),
+        "Market Cap (B)": (get("marketCap", 0) or 0) / 1e9,
+        "PE Ratio": get("trailingPE", 0),
+        "PB Ratio": get("priceToBook", 0),
+        "Beta": get("beta", 0),
+        "Dividend Yield": get("dividendYield", 0),
+        "Target Mean Price": get("targetMeanPrice", 0),
+        "Description": get("longBusinessSummary", "N/A"),
+        "Last Updated": date.today(),
+        "Audit Risk": get("auditRisk", 5),
+        "Board Risk": get("boardRisk", 5),
+        "Compensation Risk": get("compensationRisk", 5),
+        "Shareholder Rights Risk": get("shareHolderRightsRisk", 5),
+        "Overall Risk": get("overallRisk", 5),
+        "Price": price,
+        "52 Week High": week_high_52,
+        "52 Week Low":  week_low_52,
+    }
+    CHECKPOINT.record("fundamentals", ticker, row)
+    return row
+
+
+def _existing_fundamentals_row(existing_df: pd.DataFrame, ticker: str):
+    """The ticker's previous stock_info.csv row as a dict, or None."""
+    if existing_df.empty or "Stock" not in existing_df.columns:
+        return None
+    match = existing_df[existing_df["Stock"] == ticker]
+    return match.iloc[0].to_dict() if not match.empty else None
+
+
+def _merge_fundamentals(existing_df: pd.DataFrame, data_list, fresh_tickers) -> pd.DataFrame:
+    """Appends the untouched fresh rows to the newly fetched / preserved ones."""
+    new_df = pd.DataFrame(data_list)
+    if not existing_df.empty and fresh_tickers:
+        fresh_rows = existing_df[existing_df["Stock"].isin(fresh_tickers)]
+        new_df = pd.concat([new_df, fresh_rows], ignore_index=True)
+        new_df = new_df.drop_duplicates(subset=["Stock"], keep="first")
+    return new_df
+
+
+def create_stock_info_table(stock_dict, csv_path, full_refresh=False):
+    """
+    Fetches fundamentals (sector, PE, target price, etc.) for all tickers.
+
+    Incremental mode skips any ticker whose Last Updated is within
+    FUNDAMENTALS_STALE_HOURS — fundamentals don't change daily, so re-fetching
+    them on every run is the primary driver of 429 rate limits.
+    Falls back to existing data for any ticker whose fetch fails.
+    A circuit breaker stops early if the entire session appears rate-limited.
+    """
+    print("   > Updating Fundamentals...")
+
+    existing_df, tickers_to_fetch, fresh_tickers = _plan_fundamentals(stock_dict, csv_path, full_refresh)
+
     if not tickers_to_fetch:
         print("     All fundamentals are up to date — nothing to fetch.")
         return existing_df
@@ -512,100 +1081,261 @@ def create_stock_info_table(stock_dict, csv_path, full_refresh=False):
     data_list = []
     succeeded = 0
     failed_tickers = []
-    consecutive_failures = 0
+    breaker = CircuitBreaker()
 
     for ticker in tickers_to_fetch:
-        if consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD:
+        if breaker.is_open:
             remaining = tickers_to_fetch[tickers_to_fetch.index(ticker):]
             print(f"     Circuit breaker: stopping fundamentals fetch after "
                   f"{CIRCUIT_BREAKER_THRESHOLD} consecutive failures. "
                   f"Preserving existing data for {len(remaining)} remaining tickers.")
             # Preserve existing rows for skipped tickers
-            if not existing_df.empty and "Stock" in existing_df.columns:
-                for t in remaining:
-                    match = existing_df[existing_df["Stock"] == t]
-                    if not match.empty:
-                        data_list.append(match.iloc[0].to_dict())
+            for t in remaining:
+                CHECKPOINT.mark_failed("fundamentals", t)
+                row = _existing_fundamentals_row(existing_df, t)
+                if row is not None:
+                    data_list.append(row)
             break
 
         try:
-            time.sleep(API_DELAY)
-            info = _safe_ticker_info(ticker)
-            if not info:
-                raise ValueError(f"Empty info for {ticker}")
-
-            def get(key, default=0):
-                return info.get(key, default)
-
-            # Current price + 52W range from fast_info
-            price = 0
-            week_high_52 = 0
-            week_low_52 = 0
-            try:
-                fi = yf.Ticker(ticker).fast_info
-                price = float(
-                    getattr(fi, "last_price", None) or
-                    getattr(fi, "previous_close", None) or
-                    get("currentPrice", 0)
-                )
-                week_high_52 = getattr(fi, "year_high", None) or 0
-                week_low_52 = getattr(fi, "year_low", None) or 0
-            except Exception:
-                price = float(get("currentPrice", 0))
-
-            row = {
-                "Stock": ticker,
-                "Company": get("longName", ticker),
-                "CEO": (get("companyOfficers", [{}])[0].get("name", "N/A")
-                        if get("companyOfficers") else "N/A"),
-                "Country": get("country", "N/A"),
-                "State": get("state", "N/A"),
-                "City": get("city", "N/A"),
-                "Sector": get("sector", "N/A"),
-                "Industry": get("industry", "N/A"),
-                "Market Cap (B)": (get("marketCap", 0) or 0) / 1e9,
-                "PE Ratio": get("trailingPE", 0),
-                "PB Ratio": get("priceToBook", 0),
-                "Beta": get("beta", 0),
-                "Dividend Yield": get("dividendYield", 0),
-                "Target Mean Price": get("targetMeanPrice", 0),
-                "Description": get("longBusinessSummary", "N/A"),
-                "Last Updated": date.today(),
-                "Audit Risk": get("auditRisk", 5),
-                "Board Risk": get("boardRisk", 5),
-                "Compensation Risk": get("compensationRisk", 5),
-                "Shareholder Rights Risk": get("shareHolderRightsRisk", 5),
-                "Overall Risk": get("overallRisk", 5),
-                "Price": price,
-                "52 Week High": week_high_52,
-                "52 Week Low":  week_low_52,
-            }
-
-            data_list.append(row)
+            data_list.append(_fetch_fundamentals_row(ticker))
             succeeded += 1
-            consecutive_failures = 0
+            breaker.record_success()
 
         except Exception as e:
             print(f"     [{ticker}] fundamentals fetch failed: {e}")
             failed_tickers.append(ticker)
-            consecutive_failures += 1
+            breaker.record_failure()
             # Preserve existing row
-            if not existing_df.empty and "Stock" in existing_df.columns:
-                match = existing_df[existing_df["Stock"] == ticker]
-                if not match.empty:
-                    data_list.append(match.iloc[0].to_dict())
+            row = _existing_fundamentals_row(existing_df, ticker)
+            if row is not None:
+                data_list.append(row)
 
     print(f"     Fundamentals: {succeeded}/{len(tickers_to_fetch)} fetched"
           + (f" | Failed: {failed_tickers}" if failed_tickers else "")
           + (f" | {len(fresh_tickers)} skipped (fresh)" if fresh_tickers else ""))
 
-    new_df = pd.DataFrame(data_list)
-    if not existing_df.empty and fresh_tickers:
-        fresh_rows = existing_df[existing_df["Stock"].isin(fresh_tickers)]
-        new_df = pd.concat([new_df, fresh_rows], ignore_index=True)
-        new_df = new_df.drop_duplicates(subset=["Stock"], keep="first")
+    return _merge_fundamentals(existing_df, data_list, fresh_tickers)
 
-    return new_df
+
+# ----------------- ASYNC PIPELINE ----------------- #
+
+# Upper bound on Yahoo requests in flight at once across all three phases.
+# Throughput is set by YAHOO_LIMITER; this only caps open connections/threads.
+REFRESH_CONCURRENCY = 6
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of making a request once the phase's circuit breaker is open."""
+
+
+async def _run_blocking(slots: asyncio.Semaphore, fn, *args, breaker=None):
+    """
+    Runs one blocking (network) call in a worker thread while holding a slot.
+    The breaker is checked after the slot is granted, so requests that queued
+    up before a phase started failing are skipped rather than sent.
+    """
+    async with slots:
+        if breaker is not None and breaker.is_open:
+            raise CircuitOpenError("circuit breaker open")
+        return await asyncio.to_thread(fn, *args)
+
+
+async def refresh_pipeline(stock_dictionary, store_dir, info_csv_path, full_refresh=False,
+                           batch_size=HISTORY_BATCH_SIZE, max_concurrency=REFRESH_CONCURRENCY):
+    """
+    Runs the history, snapshot-metadata and fundamentals phases as one asyncio
+    pipeline instead of three back-to-back phases. Every network call from all
+    three goes through a single bounded-concurrency scheduler (a semaphore over
+    worker threads, paced by YAHOO_LIMITER), and each ticker's downstream work
+    starts as soon as its own data arrives:
+
+      - a history batch's tickers are replayed the moment the batch returns
+      - a ticker's stocks.csv row is assembled once both its quote and its
+        replayed history are in, regardless of how other tickers are doing
+      - fundamentals requests start immediately; they need nothing upstream
+
+    History batches are queued first so snapshot rows are never starved, and
+    run one at a time: yf.download keeps its results in yfinance module
+    globals (shared._DFS / shared._ERRORS, reset on every call), so two
+    concurrent downloads would overwrite each other. Queued batches wait on
+    their own one-slot semaphore without holding a shared slot, so quote and
+    fundamentals requests stay concurrent alongside them.
+    Each phase keeps its own circuit breaker; once one opens, that phase's
+    remaining requests are skipped (existing data is preserved exactly as in
+    the sequential functions). Output matches create_daily_stock_table,
+    build_summary_dataframe and create_stock_info_table.
+
+    Returns (daily_df, stocks_df, info_df).
+    """
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max(int(max_concurrency), 1))
+    history_slot = asyncio.Semaphore(1)
+
+    print(f"   > Refreshing investment data (Mode: {'FULL' if full_refresh else 'INCREMENTAL'}, "
+          f"pipelined, max_concurrency={max_concurrency})...")
+
+    existing_df, batches, to_fetch, resumed = _plan_history_fetch(
+        stock_dictionary, store_dir, full_refresh, batch_size
+    )
+    active_positions = _active_positions(stock_dictionary)
+    info_existing, info_to_fetch, fresh_tickers = _plan_fundamentals(
+        stock_dictionary, info_csv_path, full_refresh
+    )
+
+    # One future per active ticker, resolved with its latest Close as soon as its
+    # history is known. Tickers not being fetched resolve from stored history now.
+    stored_prices = _latest_prices(existing_df)
+    price_ready = {t: loop.create_future() for t in active_positions}
+
+    def _resolve_price(ticker, frame=None):
+        fut = price_ready.get(ticker)
+        if fut is None or fut.done():
+            return
+        price = stored_prices.get(ticker, 0)
+        if frame is not None and not frame.empty:
+            held = frame[frame["Shares_Held"] > 0]
+            if not held.empty:
+                price = held.sort_values("Date")["Close"].iloc[-1]
+        fut.set_result(price)
+
+    for ticker, frame in resumed.items():
+        _resolve_price(ticker, frame)
+    pending_history = set(to_fetch)
+    for ticker in price_ready:
+        if ticker not in pending_history:
+            _resolve_price(ticker)
+
+    # ---- history: fetch a batch, replay its tickers immediately ----
+    new_frames = list(resumed.values())
+    history_failed = []
+    history_ok = 0
+    history_breaker = CircuitBreaker()
+
+    async def history_task(start_date, batch):
+        nonlocal history_ok
+        try:
+            try:
+                async with history_slot:
+                    frames = await _run_blocking(slots, _fetch_history_request, batch, start_date,
+                                                 breaker=history_breaker)
+            except CircuitOpenError:
+                history_failed.extend(batch)
+                return
+            except Exception as e:
+                print(f"     [{', '.join(batch)}] history batch error: {e}")
+                history_failed.extend(batch)
+                history_breaker.record_failure(len(batch))
+                return
+
+            for ticker in batch:
+                hist = frames.get(ticker, pd.DataFrame())
+                if hist.empty:
+                    print(f"     [{ticker}] no price history returned")
+                    history_failed.append(ticker)
+                    history_breaker.record_failure()
+                    continue
+                history_breaker.record_success()
+                try:
+                    frame = _replay_daily_holdings(ticker, stock_dictionary[ticker], hist)
+                except Exception as e:
+                    print(f"     [{ticker}] history processing error: {e}")
+                    history_failed.append(ticker)
+                    continue
+                new_frames.append(frame)
+                _resolve_price(ticker, frame)
+                # The journal write (Parquet + fsync) runs off the event loop so
+                # snapshot and fundamentals tasks keep moving meanwhile
+                await asyncio.to_thread(CHECKPOINT.record, "history", ticker, frame)
+                history_ok += 1
+        finally:
+            for ticker in batch:
+                _resolve_price(ticker)
+
+    # ---- snapshot: quote fetch overlaps history; row waits for this ticker's price ----
+    stock_data = []
+    metadata_failures = 0
+
+    async def summary_task(ticker):
+        nonlocal metadata_failures
+        pos = active_positions[ticker]
+        try:
+            quote = await _run_blocking(slots, _fetch_ticker_quote, ticker, pos["company_name"])
+        except Exception as e:
+            print(f"     [{ticker}] metadata fetch failed: {e}")
+            metadata_failures += 1
+            stock_data.append(_fallback_summary_row(ticker, pos, await price_ready[ticker]))
+            return
+        price = await price_ready[ticker]
+        stock_data.append(_summary_list_row(_summary_row(ticker, pos, quote, price)))
+
+    # ---- fundamentals: independent of history, start right away ----
+    info_rows = {}
+    info_ok = 0
+    info_failed = []
+    info_breaker = CircuitBreaker()
+
+    async def fundamentals_task(ticker):
+        nonlocal info_ok
+        try:
+            info_rows[ticker] = await _run_blocking(slots, _fetch_fundamentals_row, ticker,
+                                                    breaker=info_breaker)
+            info_ok += 1
+            info_breaker.record_success()
+        except CircuitOpenError:
+            CHECKPOINT.mark_failed("fundamentals", ticker)
+            row = _existing_fundamentals_row(info_existing, ticker)
+            if row is not None:
+                info_rows[ticker] = row
+        except Exception as e:
+            print(f"     [{ticker}] fundamentals fetch failed: {e}")
+            info_failed.append(ticker)
+            info_breaker.record_failure()
+            row = _existing_fundamentals_row(info_existing, ticker)
+            if row is not None:
+                info_rows[ticker] = row
+
+    history_tasks = [asyncio.create_task(history_task(s, b)) for s, b in batches]
+    other_tasks = [asyncio.create_task(summary_task(t)) for t in active_positions]
+    other_tasks += [asyncio.create_task(fundamentals_task(t)) for t in info_to_fetch]
+
+    await asyncio.gather(*history_tasks)
+    for ticker in history_failed:
+        CHECKPOINT.mark_failed("history", ticker)
+    print(f"     History: {history_ok}/{len(to_fetch)} tickers OK"
+          + (f" | Failed: {history_failed}" if history_failed else ""))
+    if history_breaker.is_open:
+        print(f"     Circuit breaker: {CIRCUIT_BREAKER_THRESHOLD} consecutive history failures — "
+              f"remaining batches skipped.")
+    daily_df = await asyncio.to_thread(_finalize_history, existing_df, new_frames)
+
+    await asyncio.gather(*other_tasks)
+
+    if not active_positions:
+        print("     No active positions found.")
+        stocks_df = pd.DataFrame()
+    else:
+        if metadata_failures >= CIRCUIT_BREAKER_THRESHOLD:
+            print(f"     Warning: {metadata_failures} tickers failed metadata fetch — "
+                  f"Yahoo Finance may be rate-limiting. Prices from daily history "
+                  f"are still accurate; metadata (52W range, pct_change) may be stale.")
+        stocks_df = _summary_frame(stock_data)
+
+    if not info_to_fetch:
+        print("     All fundamentals are up to date — nothing to fetch.")
+        info_df = info_existing
+    else:
+        print(f"     Fundamentals: {info_ok}/{len(info_to_fetch)} fetched"
+              + (f" | Failed: {info_failed}" if info_failed else "")
+              + (f" | {len(fresh_tickers)} skipped (fresh)" if fresh_tickers else ""))
+        if info_breaker.is_open:
+            print(f"     Circuit breaker: {CIRCUIT_BREAKER_THRESHOLD} consecutive fundamentals "
+                  f"failures — existing data preserved for the rest.")
+        # Keep stock_dictionary order, like the sequential builder
+        data_list = [info_rows[t] for t in info_to_fetch if t in info_rows]
+        info_df = _merge_fundamentals(info_existing, data_list, fresh_tickers)
+
+    return daily_df, stocks_df, info_df
 
 
 # ----------------- MAIN ----------------- #
@@ -613,7 +1343,30 @@ def create_stock_info_table(stock_dict, csv_path, full_refresh=False):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--full', action='store_true', help="Force full refresh of all data")
+    parser.add_argument('--batch-size', type=int, default=HISTORY_BATCH_SIZE,
+                        help="Tickers per batched price-history request (1 = one request per ticker)")
+    parser.add_argument('--rpm', type=float, default=YAHOO_REQUESTS_PER_MINUTE,
+                        help="Maximum Yahoo Finance requests per minute across all workers")
+    parser.add_argument('--burst', type=int, default=YAHOO_BURST,
+                        help="Requests allowed back-to-back before the rate limit applies")
+    parser.add_argument('--concurrency', type=int, default=REFRESH_CONCURRENCY,
+                        help="Maximum Yahoo Finance requests in flight at once (pipelined mode)")
+    parser.add_argument('--sequential', action='store_true',
+                        help="Run history, snapshot and fundamentals as separate back-to-back phases")
+    parser.add_argument('--offline', action='store_true',
+                        help="Serve Yahoo responses from the local cache only; never touch the network")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Bypass the local Yahoo response cache")
+    parser.add_argument('--cache-max-mb', type=int, default=RESPONSE_CACHE.max_bytes // (1024 * 1024),
+                        help="Size cap for the response cache; least-recently-used entries are evicted")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted refresh from its checkpoint journal")
     args = parser.parse_args()
+    YAHOO_LIMITER.reconfigure(args.rpm, burst=args.burst)
+    if args.no_cache:
+        RESPONSE_CACHE = ResponseCache(path=None)
+    RESPONSE_CACHE.offline = args.offline
+    RESPONSE_CACHE.max_bytes = args.cache_max_mb * 1024 * 1024
 
     print("--- INVESTMENT DATA UPDATE STARTED ---")
 
@@ -624,32 +1377,65 @@ if __name__ == "__main__":
     stock_dict = load_stock_dictionary(STOCK_DICT_PATH)
     print(f"   Loaded {len(stock_dict)} tickers from stock_dictionary.json")
 
+    # Journal every per-ticker success; a journal is only resumed for the same
+    # mode and the same stock_dictionary.json (replayed frames depend on it)
+    CHECKPOINT = RefreshCheckpoint(CHECKPOINT_DIR)
+    run_params = {
+        "full_refresh": args.full,
+        "stock_dictionary": hashlib.sha1(json.dumps(stock_dict, sort_keys=True).encode()).hexdigest(),
+    }
+    carried = CHECKPOINT.begin(run_params, resume=args.resume)
+    if args.resume:
+        print(f"   Resume: {carried} journaled result(s) carried over" if carried
+              else "   Resume: no matching checkpoint found — starting fresh")
+
     # Pre-flight: verify Yahoo Finance is accessible before grinding through 92 tickers
-    if not _check_api_available():
+    if args.offline:
+        print(f"   Offline mode: serving from the response cache ({RESPONSE_CACHE.stats()['entries']} entries)")
+    elif not _check_api_available():
         print("\nYahoo Finance is rate-limiting this session.")
         print("Wait 15–30 minutes and try again. Existing CSV data has been preserved.")
         sys.exit(1)
 
-    # 1. Daily history — primary data fetch; prices for snapshot are derived from this
-    daily_df = create_daily_stock_table(stock_dict, DAILY_STOCKS_CSV_PATH, args.full)
+    if args.sequential:
+        # 1. Daily history — primary data fetch; prices for snapshot are derived from this
+        daily_df = create_daily_stock_table(stock_dict, DAILY_STOCKS_STORE_DIR, args.full,
+                                            batch_size=args.batch_size)
+        # 2. Holdings snapshot — prices come from daily_df, no extra API round
+        stocks_df = build_summary_dataframe(stock_dict, daily_df)
+        # 3. Fundamentals — skips fresh tickers; circuit-breaker stops early if rate-limited
+        info_df = create_stock_info_table(stock_dict, STOCK_INFO_CSV_PATH, args.full)
+    else:
+        # All three phases share one scheduler; per-ticker work starts as data arrives
+        daily_df, stocks_df, info_df = asyncio.run(refresh_pipeline(
+            stock_dict, DAILY_STOCKS_STORE_DIR, STOCK_INFO_CSV_PATH, args.full,
+            batch_size=args.batch_size, max_concurrency=args.concurrency,
+        ))
+
     if not daily_df.empty:
-        daily_df.to_csv(DAILY_STOCKS_CSV_PATH, index=False)
-        print(f"   > Saved daily_stocks.csv ({len(daily_df)} rows)")
+        written = write_daily_stocks(daily_df, DAILY_STOCKS_STORE_DIR, prune=args.full)
+        print(f"   > Saved daily history store ({len(daily_df)} rows, "
+              f"{len(written)} ticker partition(s) rewritten)")
+        extended, rebuilt = update_indicator_store(daily_df, DAILY_STOCKS_STORE_DIR, full_refresh=args.full)
+        print(f"   > Updated indicator state ({extended} ticker(s) extended, {rebuilt} rebuilt)")
     else:
-        print("   > Warning: daily_stocks.csv result empty. Skipping save.")
+        print("   > Warning: daily history result empty. Skipping save.")
 
-    # 2. Holdings snapshot — prices come from daily_df, no extra API round
-    stocks_df = build_summary_dataframe(stock_dict, daily_df)
     if not stocks_df.empty:
         stocks_df.to_csv(STOCKS_CSV_PATH, index=False)
         print(f"   > Saved stocks.csv ({len(stocks_df)} rows)")
     else:
         print("   > Warning: stocks.csv result empty. Skipping save.")
 
-    # 3. Fundamentals — skips fresh tickers; circuit-breaker stops early if rate-limited
-    info_df = create_stock_info_table(stock_dict, STOCK_INFO_CSV_PATH, args.full)
     if not info_df.empty:
         info_df.to_csv(STOCK_INFO_CSV_PATH, index=False)
         print(f"   > Saved stock_info.csv ({len(info_df)} rows)")
 
+    # Outputs are saved; keep the journal only if something is left to finish
+    if CHECKPOINT.failed:
+        print(f"   > {len(CHECKPOINT.failed)} fetch(es) unfinished — checkpoint kept. "
+              f"Run again with --resume to fetch only what is missing.")
+    else:
+        CHECKPOINT.clear()
+
     print("--- UPDATE COMPLETE ---")
@@ -0,0 +1,85 @@
+"""
+Token-bucket rate limiter shared by every Yahoo Finance call in a refresh.
+
+One limiter instance replaces the per-phase fixed sleeps: callers invoke
+acquire() immediately before each request, which returns at once while burst
+tokens remain and otherwise waits exactly until the next token accrues, so
+requests go out back-to-back at the allowed rate. record_rate_limit() (on a
+429) multiplicatively lowers the rate and drains the bucket; record_success()
+creeps it back toward the configured ceiling (AIMD).
+
+Thread-safe: tokens are reserved under a lock and the wait happens outside it,
+so concurrent workers queue up in arrival order instead of bursting together.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucketLimiter:
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        burst: int = 1,
+        min_requests_per_minute: Optional[float] = None,
+        backoff_factor: float = 0.5,
+        recovery_fraction: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._sleep = sleep
+        self.backoff_factor = backoff_factor
+        self.recovery_fraction = recovery_fraction
+        self.reconfigure(requests_per_minute, burst, min_requests_per_minute)
+
+    def reconfigure(self, requests_per_minute: float, burst: int = 1,
+                    min_requests_per_minute: Optional[float] = None) -> None:
+        """Resets the ceiling, current rate and burst size (e.g. from CLI flags)."""
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        with self._lock:
+            self.max_rate = float(requests_per_minute)
+            self.min_rate = float(min_requests_per_minute or max(requests_per_minute / 8, 1.0))
+            self.rate = self.max_rate
+            self.burst = max(int(burst), 1)
+            self._tokens = float(self.burst)
+            self._last = self._clock()
+
+    @property
+    def rate_per_minute(self) -> float:
+        return self.rate
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate / 60.0)
+        self._last = now
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Blocks until tokens requests may be sent (e.g. one per ticker of a
+        yf.download batch). Returns the seconds waited.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= float(tokens)
+            wait = 0.0 if self._tokens >= 0 else -self._tokens * 60.0 / self.rate
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def record_rate_limit(self) -> None:
+        """A 429 came back: cut the rate and discard any banked burst."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self._tokens = min(self._tokens, 0.0)
+
+    def record_success(self) -> None:
+        """Additive recovery toward the configured ceiling after a good response."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_fraction)
@@ -0,0 +1,144 @@
+"""
+Checkpoint journal for process_investment_data.py (data/.checkpoint/).
+
+Every ticker that succeeds in a phase is journaled immediately, so a refresh
+that trips its circuit breaker, crashes or is interrupted keeps everything it
+already paid for in rate limit. `--resume` then continues from the first
+unfinished ticker in each phase instead of starting over:
+
+    data/.checkpoint/
+        _manifest.json              run parameters + start time
+        journal.jsonl               one line per success: {"phase", "ticker", "data"}
+        history/<ticker>.parquet    replayed holdings frame per ticker
+
+Dict payloads (snapshot quotes, fundamentals rows) live inline in the
+journal; DataFrames are written next to it as Parquet. Lines are flushed and
+fsynced as they are written; a torn last line from a crash is ignored on load.
+A journal is only reused when its run parameters match and it is younger
+than MAX_AGE_HOURS, so --resume never splices in yesterday's prices.
+"""
+
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CHECKPOINT_DIR = PROJECT_ROOT / "data" / ".checkpoint"
+
+MANIFEST_NAME = "_manifest.json"
+JOURNAL_NAME = "journal.jsonl"
+FRAMES_DIR = "history"
+
+# A journal older than this is discarded rather than resumed
+MAX_AGE_HOURS = 12
+
+
+class RefreshCheckpoint:
+
+    def __init__(self, path: Optional[Path] = CHECKPOINT_DIR):
+        """path=None disables journaling (nothing is read or written)."""
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, object]] = {}
+        self.failed = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def begin(self, params: dict, resume: bool = False) -> int:
+        """
+        Starts a run. With resume=True a matching, recent journal is loaded;
+        otherwise (or if it doesn't match) the directory is wiped.
+        Returns the number of journaled successes carried over.
+        """
+        self._entries = {}
+        self.failed = set()
+        if not self.enabled:
+            return 0
+        if resume and self._matches(params):
+            self._load()
+            return sum(len(v) for v in self._entries.values())
+        self.clear()
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest = {"params": params, "started": datetime.now().isoformat(timespec="seconds")}
+        with open(self.path / MANIFEST_NAME, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        return 0
+
+    def _matches(self, params: dict) -> bool:
+        try:
+            with open(self.path / MANIFEST_NAME, "r") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        age_h = (datetime.now() - datetime.fromisoformat(manifest["started"])).total_seconds() / 3600
+        return manifest.get("params") == params and age_h < MAX_AGE_HOURS
+
+    def _load(self) -> None:
+        journal = self.path / JOURNAL_NAME
+        if not journal.exists():
+            return
+        with open(journal, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from an interrupted run
+                self._entries.setdefault(entry["phase"], {})[entry["ticker"]] = entry["data"]
+
+    def _frame_path(self, ticker: str) -> Path:
+        return self.path / FRAMES_DIR / f"{quote(str(ticker), safe='')}.parquet"
+
+    def record(self, phase: str, ticker: str, data) -> None:
+        """Journals one success. DataFrames go to Parquet, everything else inline."""
+        if not self.enabled:
+            return
+        with self._lock:
+            payload = data
+            if isinstance(data, pd.DataFrame):
+                frame_path = self._frame_path(ticker)
+                frame_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = frame_path.with_suffix(".tmp")
+                data.to_parquet(tmp_path, index=False, engine="pyarrow")
+                os.replace(tmp_path, frame_path)
+                payload = {"frame": frame_path.name}
+            line = json.dumps({"phase": phase, "ticker": ticker, "data": payload}, default=str)
+            with open(self.path / JOURNAL_NAME, "a") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries.setdefault(phase, {})[ticker] = payload
+
+    def mark_failed(self, phase: str, ticker: str) -> None:
+        """Notes a ticker left unfinished this run (so the journal is kept for --resume)."""
+        with self._lock:
+            self.failed.add((phase, ticker))
+
+    def done(self, phase: str) -> set:
+        """Tickers already journaled for a phase."""
+        with self._lock:
+            return set(self._entries.get(phase, {}))
+
+    def get(self, phase: str, ticker: str, default=None):
+        """The journaled payload for one ticker (DataFrames are read back), or default."""
+        with self._lock:
+            payload = self._entries.get(phase, {}).get(ticker)
+        if payload is None:
+            return default
+        if isinstance(payload, dict) and set(payload) == {"frame"}:
+            return pd.read_parquet(self.path / FRAMES_DIR / payload["frame"], engine="pyarrow")
+        return payload
+
+    def clear(self) -> None:
+        """Deletes the journal (after a run whose outputs are safely saved)."""
+        self._entries = {}
+        if self.enabled:
+            shutil.rmtree(self.path, ignore_errors=True)
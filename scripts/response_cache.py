@@ -0,0 +1,173 @@
+"""
+On-disk cache for Yahoo Finance responses (data/.cache/yahoo.sqlite).
+
+Sits in front of the info, fast_info and history calls in
+process_investment_data.py so a re-run after a partial failure (circuit
+breaker trip, 429 storm) replays every cached success instantly and only goes
+to the network for the gaps.
+
+  - Each endpoint has its own TTL. Entries older than their TTL are not served
+    normally, but are kept as a stale fallback when the network call fails
+    (yfinance exposes no ETag / conditional requests, so stale-if-error is the
+    closest revalidation available).
+  - Total payload size is capped; least-recently-used entries are evicted
+    first once the cap is exceeded.
+  - Offline mode serves anything in the cache regardless of age and raises
+    OfflineCacheMiss instead of touching the network.
+
+Payloads are pickled (dicts and DataFrames). The database is opened lazily,
+so importing this module never creates files.
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_PATH = PROJECT_ROOT / "data" / ".cache" / "yahoo.sqlite"
+
+# Seconds each endpoint's entries stay fresh
+DEFAULT_TTLS = {
+    "info": 23 * 3600,       # fundamentals barely move day to day
+    "fast_info": 3600,
+    "history": 3600,
+}
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_MISS = object()
+
+
+class OfflineCacheMiss(LookupError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+class ResponseCache:
+
+    def __init__(
+        self,
+        path: Optional[Path] = CACHE_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        offline: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        """path=None disables the cache: every call goes straight to the loader."""
+        self.path = Path(path) if path is not None else None
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " endpoint TEXT NOT NULL, key TEXT NOT NULL, payload BLOB NOT NULL,"
+                " size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (endpoint, key))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, endpoint: str, key: str, allow_stale: bool = False, default=None):
+        """Returns the cached payload, or default on a miss / expired entry."""
+        if not self.enabled:
+            return default
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT payload, fetched_at FROM responses WHERE endpoint = ? AND key = ?",
+                (endpoint, key),
+            ).fetchone()
+            if row is None:
+                return default
+            payload, fetched_at = row
+            now = self._clock()
+            if not allow_stale and now - fetched_at > self.ttls.get(endpoint, 0):
+                return default
+            db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE endpoint = ? AND key = ?",
+                (now, endpoint, key),
+            )
+            db.commit()
+        return pickle.loads(payload)
+
+    def put(self, endpoint: str, key: str, value) -> None:
+        if not self.enabled:
+            return
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = self._clock()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (endpoint, key, payload, len(payload), now, now),
+            )
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Drops least-recently-used entries until the total size fits max_bytes."""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for endpoint, key, size in db.execute(
+            "SELECT endpoint, key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM responses WHERE endpoint = ? AND key = ?", (endpoint, key))
+            total -= size
+
+    def fetch(self, endpoint: str, key: str, loader: Callable[[], object],
+              cache_if: Callable[[object], bool] = lambda v: True):
+        """
+        Serves a fresh cached response, otherwise calls loader() and stores the
+        result when cache_if(result) holds (so failures like {} aren't cached).
+        If loader() raises or its result is rejected by cache_if, a stale entry
+        is served when one exists. In offline mode only the cache is consulted
+        (any age).
+        """
+        hit = self.get(endpoint, key, allow_stale=self.offline, default=_MISS)
+        if hit is not _MISS:
+            return hit
+        if self.offline:
+            raise OfflineCacheMiss(f"{endpoint}:{key} not cached (offline mode)")
+        try:
+            value = loader()
+        except Exception:
+            stale = self.get(endpoint, key, allow_stale=True, default=_MISS)
+            if stale is not _MISS:
+                return stale
+            raise
+        if cache_if(value):
+            self.put(endpoint, key, value)
+            return value
+        return self.get(endpoint, key, allow_stale=True, default=value)
+
+    def stats(self) -> Dict[str, int]:
+        """{"entries", "bytes"} currently stored."""
+        if not self.enabled or not self.path.exists():
+            return {"entries": 0, "bytes": 0}
+        with self._lock:
+            entries, size = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": entries, "bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,104 @@
+"""
+Per-ticker price returns over lookback windows, for the Portfolio Overview
+"Movers & Shakers" tables.
+
+build_return_anchors() runs once per data load (cached as the
+"return_anchors" dataset). It finds every ticker's start close for each
+standard window (1 Day … 1 Year, YTD) with a single merge_asof over the
+history, so switching windows on the page is a lookup (returns_for) rather
+than a re-sort and scan of daily_stocks. window_returns() gives the same
+table for any start / end dates.
+
+A window's start price is the ticker's last close on or before the cutoff
+date; the end price is its close on the latest date in the history. Tickers
+without a close on or before the cutoff are left out of that window.
+"""
+
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Standard lookbacks in calendar days; YTD is added from the latest date
+LOOKBACKS: Dict[str, int] = {
+    "1 Day": 1,
+    "1 Week": 7,
+    "1 Month": 30,
+    "3 Months": 90,
+    "1 Year": 365,
+}
+YTD = "YTD"
+
+RETURN_COLUMNS = ["stock", "start_date", "Start_Price", "End_Price", "Abs_Change", "Pct_Change"]
+
+
+def _prices(daily_stocks: pd.DataFrame) -> pd.DataFrame:
+    """[stock, date, close] with valid dates and closes, sorted by date for merge_asof."""
+    if daily_stocks.empty or not {"stock", "date", "close"}.issubset(daily_stocks.columns):
+        return pd.DataFrame(columns=["stock", "date", "close"])
+    prices = daily_stocks[["stock", "date", "close"]].copy()
+    prices["stock"] = prices["stock"].astype(str)
+    prices["date"] = pd.to_datetime(prices["date"], errors="coerce")
+    prices["close"] = pd.to_numeric(prices["close"], errors="coerce")
+    return prices.dropna(subset=["date", "close"]).sort_values("date", kind="stable")
+
+
+def _end_prices(prices: pd.DataFrame, end: pd.Timestamp) -> pd.DataFrame:
+    """Each ticker's last close on or before end."""
+    upto = prices[prices["date"] <= end]
+    return upto.drop_duplicates("stock", keep="last")[["stock", "close"]].rename(columns={"close": "End_Price"})
+
+
+def _returns_at(prices: pd.DataFrame, ends: pd.DataFrame, cutoffs: Dict[str, pd.Timestamp]) -> pd.DataFrame:
+    """One merge_asof for every (window, ticker) pair; indexed by window."""
+    if prices.empty or ends.empty or not cutoffs:
+        return pd.DataFrame(columns=RETURN_COLUMNS, index=pd.Index([], name="window"))
+
+    queries = pd.concat(
+        [ends.assign(window=label, date=pd.Timestamp(cutoff)) for label, cutoff in cutoffs.items()],
+        ignore_index=True,
+    ).astype({"date": prices["date"].dtype}).sort_values("date", kind="stable")
+    starts = pd.merge_asof(
+        queries, prices.rename(columns={"date": "start_date", "close": "Start_Price"}),
+        left_on="date", right_on="start_date", by="stock", direction="backward",
+    ).dropna(subset=["Start_Price"])
+
+    starts["Abs_Change"] = starts["End_Price"] - starts["Start_Price"]
+    starts["Pct_Change"] = starts["Abs_Change"] / starts["Start_Price"] * 100
+    starts["window"] = pd.Categorical(starts["window"], categories=list(cutoffs))
+    starts = starts.sort_values(["window", "stock"])
+    starts["window"] = starts["window"].astype(str)
+    return starts.set_index("window")[RETURN_COLUMNS]
+
+
+def build_return_anchors(daily_stocks: pd.DataFrame) -> pd.DataFrame:
+    """Returns for every ticker over every standard window, indexed by window label."""
+    prices = _prices(daily_stocks)
+    if prices.empty:
+        return _returns_at(prices, prices, {})
+    latest = prices["date"].max()
+    cutoffs = {label: latest - pd.Timedelta(days=days) for label, days in LOOKBACKS.items()}
+    cutoffs[YTD] = pd.Timestamp(latest.year, 1, 1)
+    # Only tickers priced on the latest date (as of the most recent refresh)
+    ends = prices[prices["date"] == latest].drop_duplicates("stock", keep="last")
+    return _returns_at(prices, ends[["stock", "close"]].rename(columns={"close": "End_Price"}), cutoffs)
+
+
+def returns_for(anchors: pd.DataFrame, window: str) -> pd.DataFrame:
+    """The rows of one window from build_return_anchors (empty if it has none)."""
+    if window not in anchors.index:
+        return pd.DataFrame(columns=RETURN_COLUMNS)
+    return anchors.loc[[window]].reset_index(drop=True)
+
+
+def window_returns(daily_stocks: pd.DataFrame, start, end: Optional[object] = None) -> pd.DataFrame:
+    """
+    Returns from start to end (default: the latest date) for every ticker,
+    using the same rules as the standard windows. Each ticker's end price is
+    its last close on or before end.
+    """
+    prices = _prices(daily_stocks)
+    if prices.empty:
+        return pd.DataFrame(columns=RETURN_COLUMNS)
+    end = prices["date"].max() if end is None else pd.Timestamp(end)
+    table = _returns_at(prices, _end_prices(prices, end), {"custom": pd.Timestamp(start)})
+    return table.reset_index(drop=True)
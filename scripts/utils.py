@@ -11,10 +11,16 @@ _DATA_DIR = _PROJECT_ROOT / "data"
 
 
 def _latest_csv_mtime() -> float:
-    """Return the most recent modification time of any CSV in data/."""
+    """
+    Return the most recent modification time of any data file in data/: the
+    CSVs plus the daily history Parquet store (whose manifest is rewritten
+    whenever any ticker partition changes).
+    """
     try:
+        candidates = [f for f in _DATA_DIR.iterdir() if f.suffix == ".csv"]
+        candidates.append(_DATA_DIR / "daily_stocks" / "_manifest.json")
         return max(
-            (f.stat().st_mtime for f in _DATA_DIR.iterdir() if f.suffix == ".csv"),
+            (f.stat().st_mtime for f in candidates if f.exists()),
             default=0.0,
         )
     except Exception:
@@ -175,12 +181,20 @@ def run_subprocess_refresh(
     st.rerun()
 
 
+def _is_plain_numeric(values: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+
+
 def clean_amount_column(df: pd.DataFrame, amount_col: str = "amount") -> pd.DataFrame:
     """
     Coerces an amount column to numeric, handling formatted strings such as
     '$1,234.56', '1,234', and accounting-style negatives like '(500.00)'.
+    Already-numeric columns (the typed budget tables) skip the string scrub.
     """
-    if amount_col in df.columns:
+    if amount_col in df.columns and _is_plain_numeric(df[amount_col]):
+        df = df.copy()
+        df[amount_col] = df[amount_col].fillna(0.0)
+    elif amount_col in df.columns:
         s = df[amount_col].astype(str)
         s = s.str.replace(r"[$,]", "", regex=True)
         s = s.str.replace(r"^\((.*)\)$", r"-\1", regex=True)
@@ -214,6 +228,8 @@ def _coerce_amount_numeric(df: pd.DataFrame, amount_col: str = "amount") -> pd.D
         raise KeyError(f"Required column '{amount_col}' not found")
 
     df = df.copy()
+    if _is_plain_numeric(df[amount_col]):
+        return df
     s = df[amount_col].astype(str)
 
     # Remove $ and commas
@@ -239,7 +255,8 @@ def calculate_average_monthly_total(
             raise KeyError(f"Required column '{date_col}' not found")
 
         df = _coerce_amount_numeric(df, amount_col=amount_col)
-        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+        if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
 
         current_year = pd.Timestamp.now().year
         df_year = df[df[date_col].dt.year == current_year]
@@ -272,7 +289,8 @@ def calculate_yearly_total(
             raise KeyError(f"Required column '{date_col}' not found")
 
         df = _coerce_amount_numeric(df, amount_col=amount_col)
-        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+        if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
 
         current_year = pd.Timestamp.now().year
         df_year = df[df[date_col].dt.year == current_year]
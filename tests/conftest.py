@@ -37,6 +37,7 @@ def _transparent_cache_data(*args, **kwargs):
 
 _st_stub = MagicMock()
 _st_stub.cache_data = _transparent_cache_data
+_st_stub.cache_resource = _transparent_cache_data
 
 # Force the stub in before streamlit (or anything that imports it) is loaded.
 sys.modules["streamlit"] = _st_stub
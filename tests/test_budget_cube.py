@@ -0,0 +1,147 @@
+"""
+tests/test_budget_cube.py — unit tests for scripts/budget_cube.py, the month ×
+type × category rollup behind the Budget Overview, Income and Expenses pages.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.budget_cube import (
+    build_budget_cube,
+    category_names,
+    category_totals,
+    merge_cubes,
+    monthly_totals,
+    prepare_transactions,
+    read_budget_cube,
+    rollup,
+    write_budget_cube,
+)
+
+
+def _expenses(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 540, n), unit="D")
+    return pd.DataFrame({
+        "Amount": rng.uniform(1, 500, n).round(2),
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Expense_Category": rng.choice(["Groceries", "Dining", "Rent", "Fun"], n),
+        "Description": rng.choice(["Uber", "Costco", "Landlord"], n),
+    })
+
+
+def _income(n=60, seed=1):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 540, n), unit="D")
+    return pd.DataFrame({
+        "Source": rng.choice(["Salary", "Bonus", "Rover"], n),
+        "Amount": rng.uniform(50, 5000, n).round(2),
+        "Date": dates.strftime("%Y-%m-%d"),
+    })
+
+
+def _raw_totals(tx, start, end, cats=None):
+    mask = (tx["date"].dt.date >= start) & (tx["date"].dt.date <= end)
+    if cats is not None:
+        mask &= tx["category"].isin(cats)
+    return tx.loc[mask]
+
+
+class TestBuildBudgetCube:
+
+    def test_typed_columns(self):
+        cube = build_budget_cube(_expenses(), _income())
+        assert list(cube.columns) == ["month", "type", "category", "total", "count", "min", "max"]
+        assert cube["month"].dtype == "datetime64[ns]"
+        assert isinstance(cube["type"].dtype, pd.CategoricalDtype)
+        assert isinstance(cube["category"].dtype, pd.CategoricalDtype)
+        assert cube["count"].dtype == "int64"
+        assert (cube["month"].dt.day == 1).all()
+
+    def test_totals_match_transactions(self):
+        expenses = _expenses()
+        cube = build_budget_cube(expenses, _income())
+        tx = prepare_transactions(expenses, "expense")
+        expected = tx.groupby("category")["amount"].agg(["sum", "count", "min", "max"])
+        got = cube[cube["type"] == "expense"].groupby("category", observed=True).agg(
+            sum=("total", "sum"), count=("count", "sum"), min=("min", "min"), max=("max", "max"))
+        got.index = got.index.astype(str)
+        pd.testing.assert_frame_equal(got.sort_index(), expected.sort_index(),
+                                      check_names=False, check_index_type=False)
+
+    def test_formatted_amounts_are_cleaned(self):
+        expenses = pd.DataFrame({"amount": ["$1,200.50", "(20)", "junk"],
+                                 "date": ["2025-01-02", "2025-01-03", "2025-01-04"],
+                                 "expense_category": ["Rent", "Rent", "Rent"]})
+        cube = build_budget_cube(expenses, pd.DataFrame())
+        assert cube["total"].iloc[0] == pytest.approx(1180.50)
+        assert cube["count"].iloc[0] == 3
+
+    def test_empty_inputs(self):
+        cube = build_budget_cube(pd.DataFrame(), pd.DataFrame())
+        assert cube.empty
+        assert category_names(cube, "expense") == []
+
+    def test_merged_chunks_equal_single_build(self):
+        expenses, income = _expenses(), _income()
+        whole = build_budget_cube(expenses, income)
+        merged = merge_cubes([
+            build_budget_cube(expenses.iloc[:150], income.iloc[:20]),
+            build_budget_cube(expenses.iloc[150:], income.iloc[20:]),
+        ])
+        pd.testing.assert_frame_equal(merged, whole)
+
+    def test_parquet_round_trip(self, tmp_path):
+        cube = build_budget_cube(_expenses(), _income())
+        write_budget_cube(cube, tmp_path / "cube.parquet")
+        pd.testing.assert_frame_equal(read_budget_cube(tmp_path / "cube.parquet"), cube)
+        assert read_budget_cube(tmp_path / "missing.parquet").empty
+
+
+class TestRollup:
+
+    @pytest.mark.parametrize("start, end", [
+        (date(2024, 1, 1), date(2025, 6, 30)),    # whole months only
+        (date(2024, 2, 10), date(2024, 11, 20)),  # partial first and last month
+        (date(2024, 3, 5), date(2024, 3, 25)),    # inside one month
+        (date(2024, 3, 31), date(2024, 4, 1)),    # two adjacent partial months
+    ])
+    def test_day_precise_totals(self, start, end):
+        expenses = _expenses()
+        cube = build_budget_cube(expenses, _income())
+        tx = prepare_transactions(expenses, "expense")
+        cats = ["Groceries", "Rent"]
+
+        rolled = rollup(cube, tx, "expense", start, end, categories=cats)
+        raw = _raw_totals(tx, start, end, cats)
+        assert rolled["total"].sum() == pytest.approx(raw["amount"].sum())
+        assert rolled["count"].sum() == len(raw)
+
+        by_cat = category_totals(rolled).set_index("category")["total"]
+        expected = raw.groupby("category")["amount"].sum()
+        pd.testing.assert_series_equal(by_cat.sort_index(), expected.sort_index(),
+                                       check_names=False, check_index_type=False)
+
+    def test_monthly_totals_match_resample(self):
+        income = _income()
+        cube = build_budget_cube(_expenses(), income)
+        tx = prepare_transactions(income, "income")
+        start, end = date(2024, 2, 10), date(2025, 3, 3)
+
+        got = monthly_totals(rollup(cube, tx, "income", start, end), value_name="Income")
+        expected = (
+            _raw_totals(tx, start, end).set_index("date").resample("MS")["amount"].sum()
+                .reset_index().rename(columns={"amount": "Income"})
+        )
+        pd.testing.assert_frame_equal(got, expected, check_freq=False)
+
+    def test_no_matching_rows(self):
+        cube = build_budget_cube(_expenses(), _income())
+        rolled = rollup(cube, prepare_transactions(_expenses(), "expense"), "expense",
+                        date(2030, 1, 1), date(2030, 2, 1))
+        assert rolled.empty
+        assert monthly_totals(rolled).empty
+        assert category_totals(rolled).empty
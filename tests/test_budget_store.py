@@ -0,0 +1,109 @@
+"""
+tests/test_budget_store.py — unit tests for scripts/budget_store.py, the typed
+Parquet copies of income.csv / expenses.csv, and for the app-side reader in
+scripts/data_processing.py that prefers them over the CSVs.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from scripts.budget_store import (
+    SCHEMA_VERSION_KEY,
+    TypedTransactionWriter,
+    coerce_amounts,
+    parquet_path_for,
+    read_typed_transactions,
+    to_typed_transactions,
+    write_typed_transactions,
+)
+from scripts.data_processing import read_transactions
+
+
+def _expenses():
+    return pd.DataFrame({
+        "Amount": ["$1,200.50", "(20)", 3, "junk"],
+        "Date": ["2025-01-02", "2025-01-03", "not a date", "2025-01-05"],
+        "Expense_Category": ["Rent", "Dining", "Rent", 42],
+        "Description": ["Landlord", None, "x", "Misc"],
+    })
+
+
+class TestTypedTransactions:
+
+    def test_schema(self):
+        typed = to_typed_transactions(_expenses(), "expense")
+        assert list(typed.columns) == ["Amount", "Date", "Expense_Category", "Description", "Merchant"]
+        assert typed["Amount"].dtype == "float64"
+        assert typed["Date"].dtype == "datetime64[ns]"
+        assert isinstance(typed["Expense_Category"].dtype, pd.CategoricalDtype)
+        assert list(typed["Amount"]) == pytest.approx([1200.50, -20.0, 0.0])
+        assert list(typed["Expense_Category"].astype(str)) == ["Rent", "Dining", "42"]
+        assert pd.isna(typed["Description"].iloc[1])
+        assert isinstance(typed["Merchant"].dtype, pd.CategoricalDtype)
+        assert typed["Merchant"].iloc[1] == "Unknown"
+
+    def test_coerce_amounts_numeric_fast_path(self):
+        values = pd.Series([1, 2, None], dtype="float64")
+        assert list(coerce_amounts(values)) == [1.0, 2.0, 0.0]
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "expenses.parquet"
+        typed = write_typed_transactions(_expenses(), "expense", path)
+        pd.testing.assert_frame_equal(read_typed_transactions(path), typed)
+
+    def test_income_schema(self, tmp_path):
+        income = pd.DataFrame({"Source": ["Salary"], "Amount": [2000], "Date": ["2025-01-15"]})
+        path = tmp_path / "income.parquet"
+        write_typed_transactions(income, "income", path)
+        typed = read_typed_transactions(path)
+        assert list(typed.columns) == ["Source", "Amount", "Date"]
+        assert typed["Amount"].dtype == "float64"
+
+    def test_other_schema_version_is_ignored(self, tmp_path):
+        path = tmp_path / "expenses.parquet"
+        write_typed_transactions(_expenses(), "expense", path)
+        table = pq.read_table(path)
+        pq.write_table(table.replace_schema_metadata({SCHEMA_VERSION_KEY: b"0"}), path)
+        assert read_typed_transactions(path) is None
+        assert read_typed_transactions(tmp_path / "missing.parquet") is None
+
+    def test_incremental_writer_matches_single_write(self, tmp_path):
+        expenses = _expenses()
+        writer = TypedTransactionWriter(tmp_path / "streamed.parquet", "expense")
+        writer.write(expenses.iloc[:2])
+        writer.write(expenses.iloc[:0])
+        writer.write(expenses.iloc[2:])
+        writer.close()
+        expected = write_typed_transactions(expenses, "expense", tmp_path / "whole.parquet")
+        pd.testing.assert_frame_equal(read_typed_transactions(tmp_path / "streamed.parquet"), expected,
+                                      check_categorical=False)
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestReadTransactions:
+
+    def test_prefers_typed_copy(self, tmp_path):
+        csv_path = tmp_path / "expenses.csv"
+        _expenses().to_csv(csv_path, index=False)
+        write_typed_transactions(_expenses(), "expense", parquet_path_for(csv_path))
+        df = read_transactions(csv_path, "expenses")
+        assert df["Date"].dtype == "datetime64[ns]"
+        assert len(df) == 3
+
+    def test_stale_typed_copy_falls_back_to_csv(self, tmp_path):
+        csv_path = tmp_path / "expenses.csv"
+        write_typed_transactions(_expenses(), "expense", parquet_path_for(csv_path))
+        _expenses().to_csv(csv_path, index=False)
+        old = parquet_path_for(csv_path).stat().st_mtime - 60
+        os.utime(parquet_path_for(csv_path), (old, old))
+        df = read_transactions(csv_path, "expenses")
+        assert df["Amount"].dtype == object
+        assert len(df) == 4
+
+    def test_missing_everything_gives_schema_columns(self, tmp_path):
+        df = read_transactions(tmp_path / "income.csv", "income")
+        assert df.empty
+        assert list(df.columns) == ["date", "category", "amount", "description"]
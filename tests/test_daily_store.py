@@ -0,0 +1,117 @@
+"""
+tests/test_daily_store.py — unit tests for scripts/daily_store.py, the
+Parquet-backed daily holdings history.
+
+Coverage:
+  - write_daily_stocks  — typed partitions, change detection, pruning
+  - read_daily_stocks   — round trip and ticker / date / column pushdown
+"""
+
+import pandas as pd
+import pytest
+
+from scripts.daily_store import (
+    COLUMNS,
+    read_daily_stocks,
+    read_manifest,
+    store_exists,
+    write_daily_stocks,
+)
+
+
+def _history(tickers=("AAA", "BBB"), periods=5, start="2026-01-01"):
+    frames = []
+    for i, t in enumerate(tickers):
+        dates = pd.bdate_range(start, periods=periods)
+        close = [10.0 * (i + 1) + d for d in range(periods)]
+        frames.append(pd.DataFrame({
+            "Date": dates,
+            "Close": close,
+            "Stock": t,
+            "Shares_Held": 2.0,
+            "Avg_Cost": 5.0,
+            "Equity": 10.0,
+            "Market_Value": [c * 2 for c in close],
+            "Total_Profit": [c * 2 - 10.0 for c in close],
+            "Daily_Profit": 0.0,
+            "Daily_Pct_Profit": 0.0,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestWriteDailyStocks:
+
+    def test_round_trip_with_typed_columns(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        df = _history()
+        write_daily_stocks(df, store)
+        result = read_daily_stocks(store)
+        assert store_exists(store)
+        assert list(result.columns) == COLUMNS
+        assert len(result) == len(df)
+        assert str(result["Date"].dtype).startswith("datetime64")
+        assert result["Close"].dtype == "float32"
+        assert isinstance(result["Stock"].dtype, pd.CategoricalDtype)
+
+    def test_unchanged_tickers_are_not_rewritten(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        df = _history()
+        assert write_daily_stocks(df, store) == ["AAA", "BBB"]
+        changed = df.copy()
+        changed.loc[changed["Stock"] == "BBB", "Close"] += 1
+        assert write_daily_stocks(changed, store) == ["BBB"]
+        assert write_daily_stocks(changed, store) == []
+
+    def test_manifest_tracks_rows_and_last_date(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        write_daily_stocks(_history(periods=3), store)
+        manifest = read_manifest(store)
+        assert manifest["AAA"]["rows"] == 3
+        assert manifest["AAA"]["last_date"] == "2026-01-05"
+
+    def test_prune_removes_dropped_tickers(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        write_daily_stocks(_history(("AAA", "BBB")), store)
+        write_daily_stocks(_history(("AAA",)), store, prune=True)
+        assert set(read_daily_stocks(store)["Stock"].astype(str)) == {"AAA"}
+        assert "BBB" not in read_manifest(store)
+
+    def test_ticker_with_special_characters(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        write_daily_stocks(_history(("BRK-B", "BF.B")), store)
+        result = read_daily_stocks(store, tickers=["BF.B"])
+        assert set(result["Stock"].astype(str)) == {"BF.B"}
+
+
+class TestReadDailyStocks:
+
+    def test_missing_store_returns_empty_with_columns(self, tmp_path):
+        result = read_daily_stocks(tmp_path / "nope")
+        assert result.empty
+        assert list(result.columns) == COLUMNS
+
+    def test_ticker_filter(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        write_daily_stocks(_history(("AAA", "BBB", "CCC")), store)
+        result = read_daily_stocks(store, tickers=["AAA", "CCC"])
+        assert set(result["Stock"].astype(str)) == {"AAA", "CCC"}
+
+    def test_date_range_filter(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        write_daily_stocks(_history(periods=5), store)
+        result = read_daily_stocks(store, start="2026-01-02", end="2026-01-05")
+        assert result["Date"].min() == pd.Timestamp("2026-01-02")
+        assert result["Date"].max() == pd.Timestamp("2026-01-05")
+
+    def test_column_projection(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        write_daily_stocks(_history(), store)
+        result = read_daily_stocks(store, columns=["Date", "Stock", "Close"])
+        assert list(result.columns) == ["Date", "Stock", "Close"]
+
+    def test_values_preserved_within_float32_precision(self, tmp_path):
+        store = tmp_path / "daily_stocks"
+        df = _history()
+        write_daily_stocks(df, store)
+        result = read_daily_stocks(store).sort_values(["Stock", "Date"]).reset_index(drop=True)
+        assert result["Market_Value"].tolist() == pytest.approx(df["Market_Value"].tolist(), rel=1e-6)
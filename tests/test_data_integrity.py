@@ -29,9 +29,15 @@ def _load(filename: str, required_cols: Optional[List[str]] = None) -> pd.DataFr
     and skip the test if the file is missing or required columns are absent.
     """
     path = DATA_DIR / filename
-    if not path.exists():
+    store = DATA_DIR / Path(filename).stem
+    if (store / "_manifest.json").exists():
+        # daily_stocks lives in a Parquet store; the CSV is only a legacy fallback
+        from scripts.daily_store import read_daily_stocks
+        df = read_daily_stocks(store)
+    elif not path.exists():
         pytest.skip(f"{filename} not found in data/ — run a data refresh first")
-    df = pd.read_csv(path)
+    else:
+        df = pd.read_csv(path)
     df.columns = [c.strip().replace(" ", "_").lower() for c in df.columns]
     if required_cols:
         missing = [c for c in required_cols if c not in df.columns]
@@ -81,7 +87,7 @@ class TestStocksCsv:
             f"Portfolio diversity sums to {total:.2f}%, expected ~100%"
 
 
-# ── daily_stocks.csv ──────────────────────────────────────────────────────────
+# ── daily_stocks (Parquet store or legacy CSV) ───────────────────────────────────────────────────
 
 class TestDailyStocksCsv:
 
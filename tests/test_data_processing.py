@@ -6,6 +6,8 @@ Functions under test:
   - safe_read_csv                      — missing/empty/normal CSV handling
   - calculate_buying_opportunity_scores — 8-signal scoring engine
   - preprocess_data                    — merge pipeline (no API calls)
+  - load_dataset                       — per-dataset registry over the same stages
+  - dataset_fingerprint                — file-fingerprint cache keys
 
 The Streamlit stub in conftest.py makes @st.cache_data transparent so the
 module can be imported outside a running Streamlit server.
@@ -14,9 +16,17 @@ module can be imported outside a running Streamlit server.
 import pandas as pd
 import pytest
 
+import scripts.data_processing as data_processing
 from scripts.data_processing import (
+    DATASETS,
     EMPTY_SCHEMAS,
+    RAW_READERS,
+    RAW_SOURCES,
     calculate_buying_opportunity_scores,
+    dataset_fingerprint,
+    file_fingerprint,
+    load_dataset,
+    load_price_matrices,
     preprocess_data,
     safe_read_csv,
 )
@@ -344,3 +354,107 @@ class TestPreprocessData:
         sc = result["stocks_complete"]
         assert "invested" in sc.columns
         assert sc.iloc[0]["invested"] == pytest.approx(200.0)  # 5 × 40
+
+
+# ── dataset registry ─────────────────────────────────────────────────────────
+
+def _raw_with_holdings():
+    raw = _empty_raw()
+    raw["stocks"] = pd.DataFrame([_stocks_row(stock="AAA"), _stocks_row(stock="BBB", quantity=0)])
+    raw["stock_info"] = pd.DataFrame({"stock": ["AAA"], "sector": ["Technology"], "industry": ["Software"]})
+    dates = pd.date_range("2026-01-01", periods=20).strftime("%Y-%m-%d").tolist()
+    raw["daily_stocks"] = pd.DataFrame({
+        "date": dates, "close": [float(10 + i) for i in range(20)], "stock": ["AAA"] * 20,
+        "shares_held": [5] * 20, "market_value": [50.0] * 20, "equity": [40.0] * 20,
+    })
+    raw["income"] = pd.DataFrame({"source": ["Salary"], "amount": [1000.0], "date": ["2026-01-15"]})
+    raw["expenses"] = pd.DataFrame({"amount": [12.5], "date": ["2026-01-16"],
+                                    "expense_category": ["Dining"], "description": ["Chipotle"]})
+    raw["budget_cube"] = None
+    raw["indicators"] = None
+    return raw
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Points the raw datasets at in-memory frames and records which were read."""
+    raw = _raw_with_holdings()
+    reads = []
+    names = {"raw_stocks": "stocks", "stored_budget_cube": "budget_cube"}
+    for name, (deps, _) in list(DATASETS.items()):
+        if deps == () and names.get(name, name) in raw:
+            key = names.get(name, name)
+            monkeypatch.setitem(DATASETS, name, ((), lambda key=key: reads.append(key) or raw[key]))
+    return raw, reads
+
+
+class TestDatasetRegistry:
+
+    def test_dependencies_are_registered(self):
+        for name, (deps, _) in DATASETS.items():
+            assert set(deps) <= set(DATASETS), name
+
+    def test_unknown_dataset(self):
+        with pytest.raises(KeyError):
+            load_dataset("nope")
+
+    def test_matches_preprocess_data(self, registry):
+        raw, _ = registry
+        full = preprocess_data(raw)
+        for name in ("stocks", "stocks_complete", "daily_stocks_complete", "daily_equity",
+                     "todays_stocks", "todays_stocks_complete", "sector_values", "industry_values",
+                     "expense_transactions", "income_transactions", "budget_cube"):
+            pd.testing.assert_frame_equal(load_dataset(name), full[name], obj=name)
+
+    def test_budget_datasets_skip_investment_files(self, registry):
+        _, reads = registry
+        load_dataset("income_transactions")
+        assert reads == ["income"]
+        load_dataset("budget_cube")
+        assert "daily_stocks" not in reads and "stocks" not in reads
+
+    def test_stored_indicators_skip_daily_history(self, registry):
+        raw, reads = registry
+        raw["indicators"] = pd.DataFrame({"stock": ["AAA"], "rsi_14": [61.234], "sma_50": [12.0],
+                                          "sma_200": [None], "volatility_20": [18.0], "macd": [0.4],
+                                          "macd_signal": [0.3], "macd_hist": [0.1]})
+        sc = load_dataset("stocks_complete")
+        assert "daily_stocks" not in reads
+        assert sc.iloc[0]["rsi_14"] == pytest.approx(61.23)
+        assert sc.iloc[0]["sma_50"] == pytest.approx(12.0)
+
+    def test_price_matrices_from_daily_history(self, registry):
+        matrices = load_price_matrices()
+        assert matrices.tickers == ["AAA"]
+        assert matrices.series("AAA").tolist() == [float(10 + i) for i in range(20)]
+        assert matrices.on(field="market_value")["AAA"] == 50.0
+
+    def test_stale_indicators_fall_back_to_history(self, registry):
+        _, reads = registry
+        sc = load_dataset("stocks_complete")
+        assert "daily_stocks" in reads
+        assert sc.iloc[0]["rsi_14"] > 50.0
+
+
+# ── cache fingerprints ───────────────────────────────────────────────────────
+
+class TestDatasetFingerprint:
+
+    def test_changes_only_with_its_own_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_processing, "DATA_DIR", tmp_path)
+        (tmp_path / "income.csv").write_text("Source,Amount,Date\nSalary,1000,2026-01-15\n")
+        (tmp_path / "stocks.csv").write_text("stock,quantity\nAAA,1\n")
+
+        income_before = dataset_fingerprint("income_transactions")
+        stocks_before = dataset_fingerprint("stocks_complete")
+        assert dataset_fingerprint("income_transactions") == income_before
+
+        (tmp_path / "income.csv").write_text("Source,Amount,Date\nSalary,1000,2026-01-15\nBonus,5,2026-01-16\n")
+        assert dataset_fingerprint("income_transactions") != income_before
+        assert dataset_fingerprint("stocks_complete") == stocks_before
+
+    def test_missing_file(self, tmp_path):
+        assert file_fingerprint(tmp_path / "nope.csv") == ("nope.csv", None)
+
+    def test_every_raw_dataset_has_sources(self):
+        assert set(RAW_SOURCES) == set(RAW_READERS)
@@ -0,0 +1,120 @@
+"""
+tests/test_data_sources.py — unit tests for scripts/data_sources.py (the
+offline FakeMarketSource and YahooDataSource's serialized downloads) and the
+benchmark harness built on it.
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import scripts.data_sources as data_sources
+import scripts.process_investment_data as pid
+from scripts.benchmark_refresh import run_benchmark
+from scripts.data_sources import FakeMarketSource, YahooDataSource, synthetic_stock_dictionary
+
+END = pd.Timestamp("2026-03-31").date()
+
+
+class TestFakeMarketSource:
+
+    def test_same_seed_same_series_regardless_of_batching(self):
+        a = FakeMarketSource(seed=7, end=END).download(["AAA", "BBB"], "2026-01-01")
+        b = FakeMarketSource(seed=7, end=END).download(["BBB"], "2026-01-01")
+        pd.testing.assert_frame_equal(a["BBB"], b["BBB"])
+        c = FakeMarketSource(seed=8, end=END).download(["BBB"], "2026-01-01")
+        assert not a["BBB"]["Close"].equals(c["BBB"]["Close"])
+
+    def test_download_splits_like_yahoo(self, monkeypatch):
+        monkeypatch.setattr(pid, "DATA_SOURCE", FakeMarketSource(end=END))
+        frames, _ = pid._fetch_history_batch(["AAA", "BBB"], "2026-03-02")
+        assert set(frames) == {"AAA", "BBB"}
+        assert frames["AAA"].index[0] == pd.Timestamp("2026-03-02")
+        assert frames["AAA"].index.name == "Date"
+        assert {"Open", "High", "Low", "Close", "Volume"} <= set(frames["AAA"].columns)
+
+    def test_fast_info_consistent_with_history(self):
+        src = FakeMarketSource(end=END)
+        close = src.download(["AAA"], "2016-01-01")["AAA"]["Close"]
+        fi = src.fast_info("AAA")
+        assert fi["last_price"] == pytest.approx(close.iloc[-1])
+        assert fi["year_high"] == pytest.approx(close.iloc[-252:].max())
+        assert src.info("AAA")["currentPrice"] == pytest.approx(close.iloc[-1])
+
+    def test_simulated_rate_limits_are_recognised(self):
+        src = FakeMarketSource(end=END, rate_limit_rate=1.0)
+        with pytest.raises(RuntimeError) as exc:
+            src.info("AAA")
+        assert pid._is_rate_limit_error(exc.value)
+        assert src.requests == 1
+
+
+class TestYahooDataSource:
+
+    def test_concurrent_downloads_do_not_share_results(self, monkeypatch):
+        # Mimics yf.download: results and errors live in module globals that
+        # every call resets before filling them one ticker at a time
+        shared = data_sources.yf_shared
+
+        def global_state_download(tickers, **kwargs):
+            monkeypatch.setattr(shared, "_DFS", {})
+            monkeypatch.setattr(shared, "_ERRORS", {})
+            for t in tickers:
+                time.sleep(0.005)
+                if t.startswith("BAD"):
+                    shared._ERRORS[t] = "YFRateLimitError('Too Many Requests')"
+                else:
+                    shared._DFS[t] = pd.DataFrame({"Close": [float(len(t))]},
+                                                  index=pd.DatetimeIndex(["2026-01-02"], name="Date"))
+            return pd.concat(shared._DFS, axis=1) if shared._DFS else pd.DataFrame()
+
+        monkeypatch.setattr(data_sources.yf, "download", global_state_download)
+        batches = [["A", "BB", "BAD1"], ["CCC", "DDDD", "BAD22"]]
+        results = [None, None]
+
+        def run(i):
+            results[i] = YahooDataSource().download(batches[i], "2026-01-01")
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for batch, wide in zip(batches, results):
+            good = [t for t in batch if not t.startswith("BAD")]
+            assert set(wide.columns.get_level_values(0)) == set(good)
+            for t in good:
+                assert wide[t]["Close"].iloc[0] == pytest.approx(len(t))
+            assert set(wide.attrs["errors"]) == {t for t in batch if t.startswith("BAD")}
+
+
+class TestSyntheticStockDictionary:
+
+    def test_shape_and_determinism(self):
+        d = synthetic_stock_dictionary(50, seed=3, end=END)
+        assert len(d) == 50
+        assert d == synthetic_stock_dictionary(50, seed=3, end=END)
+        txn = next(iter(d.values()))["purchase_history"][0]
+        assert set(txn) == {"date", "buy_sell", "quantity", "share_price"}
+
+    def test_some_positions_fully_sold(self):
+        d = synthetic_stock_dictionary(200, seed=1, end=END, sold_fraction=0.2)
+        closed = [t for t, v in d.items() if pid._replay_transactions(v)[0] <= 0.001]
+        assert 0 < len(closed) < 200
+
+
+class TestBenchmarkHarness:
+
+    def test_small_run_reports_all_phases(self, monkeypatch):
+        # run_benchmark swaps module globals; let monkeypatch restore them
+        for name in ("DATA_SOURCE", "YAHOO_LIMITER", "RESPONSE_CACHE", "CHECKPOINT", "QUOTES"):
+            monkeypatch.setattr(pid, name, getattr(pid, name))
+        result = run_benchmark(5, years=0.5)
+        assert result["tickers"] == 5
+        assert result["rows"] > 0
+        # 5 tickers at the default batch size → one history batch
+        assert result["batches"] == 1
+        assert result["calls"] >= 5
+        assert min(result["history_s"], result["summary_s"], result["fundamentals_s"]) >= 0
@@ -0,0 +1,134 @@
+"""
+tests/test_expense_search.py — unit tests for scripts/expense_search.py, the
+description index behind the Expenses page search box.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.expense_search import ExpenseSearchIndex, normalize_description, parse_query
+
+DESCRIPTIONS = pd.Series([
+    "Uber Eats", "UBER trip", " Lyft ", "Amazon Prime", "amazon.com", None,
+    "Costco Gas", "Uber Eats", "Trader Joe's", "AB",
+])
+
+
+def _index(descriptions=DESCRIPTIONS):
+    index = ExpenseSearchIndex()
+    index.update(descriptions)
+    return index
+
+
+def _linear(descriptions, needle):
+    clean = normalize_description(descriptions)
+    return np.flatnonzero(clean.str.contains(needle.upper(), regex=False).to_numpy())
+
+
+class TestParseQuery:
+
+    def test_and_or_groups(self):
+        assert parse_query("uber eats OR lyft") == [["UBER", "EATS"], ["LYFT"]]
+        assert parse_query("uber|lyft") == [["UBER"], ["LYFT"]]
+        assert parse_query("uber | lyft") == [["UBER"], ["LYFT"]]
+
+    def test_phrases_and_blanks(self):
+        assert parse_query('"uber eats" costco') == [['"UBER EATS"', "COSTCO"]]
+        assert parse_query("   ") == []
+        assert parse_query("OR uber OR") == [["UBER"]]
+
+
+class TestSearch:
+
+    @pytest.mark.parametrize("term", ["uber", "EATS", "amazon", "co", "a", "zon.c", "joe's", "nothing"])
+    def test_single_term_matches_substring_scan(self, term):
+        np.testing.assert_array_equal(_index().search(term), _linear(DESCRIPTIONS, term))
+
+    def test_and(self):
+        assert _index().search("uber eats").tolist() == [0, 7]
+        assert _index().search("eats uber trip").tolist() == []
+
+    def test_or(self):
+        assert _index().search("lyft OR costco").tolist() == [2, 6]
+        assert _index().search("uber trip | lyft").tolist() == [1, 2]
+
+    def test_prefix(self):
+        assert _index().search("amaz*").tolist() == [3, 4]
+        # prefix is anchored at word starts, unlike a plain substring
+        assert _index().search("mazon*").tolist() == []
+        assert _index().search("com*").tolist() == [4]
+
+    def test_phrase(self):
+        assert _index().search('"uber eats"').tolist() == [0, 7]
+        assert _index().search('"eats uber"').tolist() == []
+
+    def test_empty_query(self):
+        assert _index().search("").tolist() == []
+
+    def test_mask(self):
+        mask = _index().mask("uber", len(DESCRIPTIONS))
+        assert mask.dtype == bool
+        assert np.flatnonzero(mask).tolist() == [0, 1, 7]
+
+    def test_mask_ignores_rows_past_n_rows(self):
+        index = _index()
+        index.update(pd.concat([DESCRIPTIONS, pd.Series(["Uber pool"])], ignore_index=True))
+        # A caller still holding the shorter frame gets a mask that fits it
+        mask = index.mask("uber", len(DESCRIPTIONS))
+        assert np.flatnonzero(mask).tolist() == [0, 1, 7]
+
+
+class TestUpdate:
+
+    def test_only_new_descriptions_are_indexed(self):
+        index = _index()
+        distinct = len(index)
+        grown = pd.concat([DESCRIPTIONS, pd.Series(["Uber Eats", "Whole Foods"])], ignore_index=True)
+        assert index.update(grown) == 1
+        assert len(index) == distinct + 1
+        assert index.search("uber eats").tolist() == [0, 7, 10]
+        assert index.search("whole").tolist() == [11]
+
+    def test_rows_remap_when_log_shrinks(self):
+        index = _index()
+        index.update(DESCRIPTIONS.iloc[2:].reset_index(drop=True))
+        assert index.update(DESCRIPTIONS.iloc[2:].reset_index(drop=True)) == 0
+        assert index.search("uber").tolist() == [5]
+
+    def test_same_version_is_skipped(self):
+        index = ExpenseSearchIndex()
+        index.update(DESCRIPTIONS, version="v1")
+        index.update(pd.Series(["Lyft"]), version="v1")
+        assert index.search("uber").tolist() == [0, 1, 7]
+
+    def test_search_during_update_sees_one_version(self):
+        few = pd.Series(["Uber"] * 10 + ["Lyft"] * 90)
+        many = pd.Series(["Uber"] * 90 + ["Lyft"] * 10)
+        expected = ({*range(10)}, {*range(90)})
+        index = _index(few)
+        stop = threading.Event()
+
+        def flip():
+            while not stop.is_set():
+                index.update(many)
+                index.update(few)
+
+        writer = threading.Thread(target=flip)
+        writer.start()
+        try:
+            for _ in range(500):
+                assert set(index.search("uber").tolist()) in expected
+        finally:
+            stop.set()
+            writer.join()
+
+    def test_large_log_matches_linear_scan(self):
+        rng = np.random.default_rng(0)
+        merchants = np.array([f"MERCHANT {i} STORE #{i % 97}" for i in range(2000)])
+        descriptions = pd.Series(rng.choice(merchants, 100_000))
+        index = _index(descriptions)
+        for phrase in ["STORE #5", "MERCHANT 19", "T 1", "#9"]:
+            np.testing.assert_array_equal(index.search(f'"{phrase}"'), _linear(descriptions, phrase))
@@ -0,0 +1,153 @@
+"""
+tests/test_indicator_store.py — unit tests for scripts/indicator_store.py,
+the incremental indicator state kept next to the daily history.
+
+Coverage:
+  - extend_state / finished_values — match the pandas formulations
+  - update_indicator_store         — incremental extension, rebuilds, pruning
+  - read_indicators                — staleness against the daily manifest
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.daily_store import write_daily_stocks
+from scripts.indicator_store import (
+    INDICATOR_COLUMNS,
+    INDICATOR_FILE,
+    empty_state,
+    extend_state,
+    finished_values,
+    load_indicator_states,
+    read_indicators,
+    update_indicator_store,
+)
+
+
+def _closes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def _history(lengths, start="2025-01-01", seed=0):
+    frames = []
+    for i, n in enumerate(lengths):
+        close = _closes(n, seed + i)
+        frames.append(pd.DataFrame({
+            "Date": pd.bdate_range(start, periods=n),
+            "Close": close,
+            "Stock": f"T{i}",
+            "Shares_Held": 1.0, "Avg_Cost": 50.0, "Equity": 50.0,
+            "Market_Value": close, "Total_Profit": close - 50.0,
+            "Daily_Profit": 0.0, "Daily_Pct_Profit": 0.0,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _reference(closes: np.ndarray) -> dict:
+    """The same indicators with pandas over the whole series."""
+    s = pd.Series(closes)
+    delta = s.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+    macd = s.ewm(span=12, adjust=False).mean() - s.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    return {
+        "rsi_14": 100 - 100 / (1 + gain / loss),
+        "sma_50": s.rolling(50).mean().iloc[-1],
+        "sma_200": s.rolling(200).mean().iloc[-1],
+        "volatility_20": s.pct_change().rolling(20).std().iloc[-1] * np.sqrt(252) * 100,
+        "macd": macd.iloc[-1],
+        "macd_signal": signal.iloc[-1],
+        "macd_hist": macd.iloc[-1] - signal.iloc[-1],
+    }
+
+
+class TestRecurrences:
+
+    def test_matches_pandas(self):
+        closes = _closes(400)
+        values = finished_values(extend_state(empty_state(), closes, "2026-01-01"))
+        for name, expected in _reference(closes).items():
+            assert values[name] == pytest.approx(expected, rel=1e-9), name
+
+    def test_extending_equals_one_pass(self):
+        closes = _closes(300, seed=3)
+        state = empty_state()
+        for chunk in np.array_split(closes, 7):
+            state = extend_state(state, chunk, None)
+        once = extend_state(empty_state(), closes, None)
+        assert finished_values(state) == pytest.approx(finished_values(once), rel=1e-12)
+        assert len(state["closes"]) == 200
+
+    def test_short_history(self):
+        values = finished_values(extend_state(empty_state(), [10.0, 11.0, 12.0], None))
+        assert values["rsi_14"] == 50.0
+        assert values["sma_50"] is None and values["sma_200"] is None and values["volatility_20"] is None
+        assert values["macd"] is not None
+
+    def test_missing_closes_are_skipped(self):
+        closes = _closes(60)
+        with_gaps = np.insert(closes, [10, 30], np.nan)
+        a = finished_values(extend_state(empty_state(), with_gaps, None))
+        b = finished_values(extend_state(empty_state(), closes, None))
+        assert a == pytest.approx(b)
+
+
+class TestUpdateIndicatorStore:
+
+    def test_incremental_matches_full_rebuild(self, tmp_path):
+        history = _history([260, 120])
+        cutoff = history["Date"] < history["Date"].max() - pd.Timedelta(days=10)
+        assert update_indicator_store(history[cutoff], tmp_path) == (0, 2)
+        assert update_indicator_store(history, tmp_path) == (2, 0)
+        incremental = json.loads((tmp_path / INDICATOR_FILE).read_text())["tickers"]
+
+        update_indicator_store(history, tmp_path, full_refresh=True)
+        rebuilt = json.loads((tmp_path / INDICATOR_FILE).read_text())["tickers"]
+        for ticker in rebuilt:
+            assert incremental[ticker]["values"] == pytest.approx(rebuilt[ticker]["values"], rel=1e-12)
+
+    def test_revised_history_rebuilds_ticker(self, tmp_path):
+        history = _history([80, 80])
+        update_indicator_store(history, tmp_path)
+        revised = history.copy()
+        revised.loc[revised["Stock"] == "T0", "Close"] *= 1.1
+        assert update_indicator_store(revised, tmp_path) == (1, 1)
+
+    def test_float32_round_trip_still_extends(self, tmp_path):
+        history = _history([80])
+        update_indicator_store(history, tmp_path)
+        narrowed = history.assign(Close=history["Close"].astype("float32").astype("float64"))
+        assert update_indicator_store(narrowed, tmp_path) == (1, 0)
+
+    def test_dropped_tickers_are_removed(self, tmp_path):
+        history = _history([40, 40])
+        update_indicator_store(history, tmp_path)
+        update_indicator_store(history[history["Stock"] == "T1"], tmp_path)
+        assert set(load_indicator_states(tmp_path)) == {"T1"}
+
+
+class TestReadIndicators:
+
+    def test_missing_store(self, tmp_path):
+        assert read_indicators(tmp_path) is None
+
+    def test_current_store(self, tmp_path):
+        history = _history([220, 30])
+        write_daily_stocks(history, tmp_path)
+        update_indicator_store(history, tmp_path)
+        df = read_indicators(tmp_path)
+        assert list(df.columns) == ["stock"] + INDICATOR_COLUMNS
+        assert df["stock"].tolist() == ["T0", "T1"]
+        assert np.isnan(df.set_index("stock").loc["T1", "sma_200"])   # 30 closes < 200
+        assert df["rsi_14"].between(0, 100).all()
+
+    def test_stale_when_history_moves_on(self, tmp_path):
+        history = _history([60])
+        update_indicator_store(history.iloc[:-1], tmp_path)
+        write_daily_stocks(history, tmp_path)
+        assert read_indicators(tmp_path) is None
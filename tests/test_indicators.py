@@ -0,0 +1,84 @@
+"""
+tests/test_indicators.py — unit tests for scripts/indicators.py, the
+vectorised multi-ticker indicators used by scripts/data_processing.py.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.indicators import trailing_rows, wilder_rsi
+
+
+def _reference_rsi(closes: pd.Series, period: int = 14) -> float:
+    """The per-ticker EWM formulation wilder_rsi replaces."""
+    if len(closes) < period + 1:
+        return 50.0
+    delta = closes.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
+    rs = gain / loss.replace(0, 1e-10)
+    return float((100 - 100 / (1 + rs)).iloc[-1])
+
+
+def _history(lengths, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, n in enumerate(lengths):
+        dates = pd.bdate_range("2016-01-01", periods=n)
+        frames.append(pd.DataFrame({
+            "date": dates.strftime("%Y-%m-%d"),
+            "stock": f"T{i}",
+            "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))),
+        }))
+    # shuffled, as the RSI pass must not rely on input order
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed)
+
+
+class TestWilderRsi:
+
+    def test_matches_per_ticker_ewm(self):
+        daily = _history([15, 16, 40, 251, 900])
+        got = wilder_rsi(daily)
+        for ticker, grp in daily.groupby("stock"):
+            expected = _reference_rsi(grp.sort_values("date")["close"].reset_index(drop=True))
+            assert got[ticker] == pytest.approx(expected, abs=1e-4), ticker
+
+    def test_short_history_is_neutral(self):
+        got = wilder_rsi(_history([1, 2, 14]))
+        assert got.tolist() == [50.0, 50.0, 50.0]
+
+    def test_window_bounds_error(self):
+        daily = _history([2600])
+        full = _reference_rsi(daily.sort_values("date")["close"].reset_index(drop=True))
+        assert wilder_rsi(daily, window=250).iloc[0] == pytest.approx(full, abs=1e-6)
+        # a tiny window is visibly different: the window really limits the input
+        assert wilder_rsi(daily, window=20).iloc[0] != pytest.approx(full, abs=1e-3)
+
+    def test_all_gains_and_flat(self):
+        up = pd.DataFrame({"stock": "UP", "date": range(20), "close": np.arange(20.0)})
+        flat = pd.DataFrame({"stock": "FLAT", "date": range(20), "close": np.ones(20)})
+        got = wilder_rsi(pd.concat([up, flat]))
+        assert got["UP"] == pytest.approx(100.0)
+        assert got["FLAT"] == pytest.approx(0.0)
+
+    def test_missing_closes_ignored(self):
+        daily = _history([30])
+        with_gaps = pd.concat([daily, pd.DataFrame({"stock": ["T0"], "date": ["2030-01-01"], "close": [np.nan]})])
+        assert wilder_rsi(with_gaps).iloc[0] == pytest.approx(wilder_rsi(daily).iloc[0])
+
+    def test_without_date_column_keeps_order(self):
+        daily = _history([30]).sort_values("date")
+        got = wilder_rsi(daily.drop(columns="date"), date_col=None)
+        assert got.iloc[0] == pytest.approx(_reference_rsi(daily["close"].reset_index(drop=True)), abs=1e-4)
+
+    def test_empty(self):
+        assert wilder_rsi(pd.DataFrame(columns=["stock", "date", "close"])).empty
+
+
+class TestTrailingRows:
+
+    def test_last_rows_per_ticker_contiguous(self):
+        tail = trailing_rows(_history([5, 3]), 2)
+        assert tail["stock"].tolist() == ["T0", "T0", "T1", "T1"]
+        assert tail["date"].tolist() == ["2016-01-06", "2016-01-07", "2016-01-04", "2016-01-05"]
@@ -0,0 +1,89 @@
+"""
+tests/test_merchants.py — unit tests for scripts/merchants.py, the merchant
+canonicalisation behind the Expenses page "Merchant Trends" chart.
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from scripts.merchants import CACHE_VERSION, MerchantResolver, merchant_key
+
+
+class TestMerchantKey:
+
+    @pytest.mark.parametrize("raw, key", [
+        ("UBER *TRIP 123", "UBER"),
+        ("SQ *Blue Bottle #4521", "BLUE BOTTLE"),
+        ("Costco - alcohol", "COSTCO"),
+        ("  Giant (mimosa supplies) ", "GIANT MIMOSA SUPPLIES"),
+        ("ESPN+", "ESPN+"),
+        ("Uber to DC", "UBER TO DC"),
+    ])
+    def test_keys(self, raw, key):
+        assert merchant_key(raw) == key
+
+
+class TestResolve:
+
+    def test_statement_variants_collapse(self):
+        merchants = MerchantResolver().resolve(pd.Series(["UBER *TRIP 123", "UBER *TRIP 456", "Uber home"]))
+        assert merchants.tolist() == ["Uber", "Uber", "Uber"]
+
+    def test_rules_keep_distinct_uber_products(self):
+        merchants = MerchantResolver().resolve(pd.Series(["Uber Eats - Boru Ramen", "UberEats", "Uber One", "Ubers"]))
+        assert merchants.tolist() == ["Uber Eats", "Uber Eats", "Uber One", "Uber"]
+
+    def test_leading_words_and_case(self):
+        descriptions = pd.Series(["Giant", "Giant", "Giant groceries", "giant", "Monthly Rent", "monthly rent"])
+        assert MerchantResolver().resolve(descriptions).tolist() == [
+            "Giant", "Giant", "Giant", "Giant", "Monthly Rent", "Monthly Rent"]
+
+    def test_named_after_most_common_spelling(self):
+        descriptions = pd.Series(["monthly parking", "Monthly Parking", "Monthly Parking"])
+        assert set(MerchantResolver().resolve(descriptions)) == {"Monthly Parking"}
+
+    def test_similar_spellings(self):
+        merchants = MerchantResolver().resolve(pd.Series(["Chipotle", "Chipotle", "Chipolte"]))
+        assert set(merchants) == {"Chipotle"}
+
+    def test_unrelated_stay_apart(self):
+        merchants = MerchantResolver().resolve(pd.Series(["Netflix", "Spotify", "Gas", "Parking"]))
+        assert merchants.nunique() == 4
+
+    def test_blank_descriptions(self):
+        assert MerchantResolver().resolve(pd.Series([None, "  "])).tolist() == ["Unknown", "Unknown"]
+
+
+class TestCache:
+
+    def test_round_trip_and_incremental(self, tmp_path):
+        path = tmp_path / "merchant_cache.json"
+        first = MerchantResolver(path)
+        first.resolve(pd.Series(["Costco", "Costco pizza"]))
+        first.save()
+        assert json.loads(path.read_text())["merchants"] == {"Costco": "Costco", "Costco pizza": "Costco"}
+
+        second = MerchantResolver(path)
+        assert len(second) == 2
+        # a new spelling joins the cached merchant without re-clustering the old ones
+        assert second.resolve(pd.Series(["Costco membership"])).tolist() == ["Costco"]
+        assert len(second) == 3
+
+    def test_cached_answer_wins(self, tmp_path):
+        path = tmp_path / "merchant_cache.json"
+        path.write_text(json.dumps({"version": CACHE_VERSION, "merchants": {"Giant": "Grocery store"}}))
+        assert MerchantResolver(path).resolve(pd.Series(["Giant", "Giant food"])).tolist() == [
+            "Grocery store", "Grocery store"]
+
+    def test_other_version_is_ignored(self, tmp_path):
+        path = tmp_path / "merchant_cache.json"
+        path.write_text(json.dumps({"version": CACHE_VERSION + 1, "merchants": {"Giant": "X"}}))
+        assert MerchantResolver(path).resolve(pd.Series(["Giant"])).tolist() == ["Giant"]
+
+    def test_save_without_path_is_noop(self, tmp_path):
+        resolver = MerchantResolver()
+        resolver.resolve(pd.Series(["Costco"]))
+        resolver.save()
+        assert list(tmp_path.iterdir()) == []
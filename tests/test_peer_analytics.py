@@ -0,0 +1,98 @@
+"""
+tests/test_peer_analytics.py — unit tests for scripts/peer_analytics.py, the
+whole-matrix peer comparisons behind the Stock Peer Analysis page.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.peer_analytics import normalize, peer_averages, relative_strength, return_correlation
+
+
+def _prices(n_tickers=6, n_days=120, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2025-06-02", periods=n_days)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_days, n_tickers)), axis=0))
+    prices = pd.DataFrame(values, index=dates, columns=[f"T{i}" for i in range(n_tickers)])
+    gaps = [slice(None, 15), slice(40, 45), slice(-10, None)]   # listed late, gap, ended early
+    for col, rows in zip(range(1, n_tickers), gaps):
+        prices.iloc[rows, col] = np.nan
+    return prices
+
+
+def _loop_normalize(prices):
+    """The per-ticker loop normalize() replaces."""
+    normalized = pd.DataFrame(index=prices.index)
+    for t in prices.columns:
+        s = prices[t].dropna()
+        if not s.empty:
+            normalized[t] = (s / s.iloc[0]).reindex(prices.index)
+    return normalized
+
+
+class TestNormalize:
+
+    def test_matches_loop(self):
+        prices = _prices()
+        pd.testing.assert_frame_equal(normalize(prices), _loop_normalize(prices), check_freq=False)
+
+    def test_starts_at_one(self):
+        normalized = normalize(_prices())
+        first = normalized.apply(lambda s: s.dropna().iloc[0])
+        assert first.tolist() == pytest.approx([1.0] * normalized.shape[1])
+
+    def test_all_nan_column_dropped(self):
+        prices = _prices().assign(EMPTY=np.nan)
+        assert "EMPTY" not in normalize(prices).columns
+
+
+class TestPeerAverages:
+
+    @pytest.mark.parametrize("n_tickers", [2, 6, 60])
+    def test_matches_drop_and_mean(self, n_tickers):
+        normalized = normalize(_prices(n_tickers=n_tickers))
+        averages = peer_averages(normalized)
+        for t in normalized.columns:
+            expected = normalized.drop(columns=[t]).mean(axis=1)
+            np.testing.assert_allclose(averages[t], expected, rtol=1e-12, equal_nan=True)
+
+    def test_no_peers_is_nan(self):
+        normalized = pd.DataFrame({"A": [1.0, 1.1], "B": [np.nan, 1.2]})
+        averages = peer_averages(normalized)
+        assert np.isnan(averages.loc[0, "A"])
+        assert averages.loc[1, "A"] == pytest.approx(1.2)
+
+
+class TestRelativeStrength:
+
+    def test_ranked_by_return(self):
+        normalized = pd.DataFrame({"A": [1.0, 1.2], "B": [1.0, 0.9], "C": [1.0, 1.5]})
+        table = relative_strength(normalized)
+        assert table["stock"].tolist() == ["C", "A", "B"]
+        assert table["rank"].tolist() == [1, 2, 3]
+        c = table.iloc[0]
+        assert c["return_pct"] == pytest.approx(50.0)
+        assert c["peer_return_pct"] == pytest.approx(5.0)          # mean of 1.2 and 0.9
+        assert c["relative_strength"] == pytest.approx(1.5 / 1.05)
+
+    def test_uses_last_valid_value(self):
+        normalized = pd.DataFrame({"A": [1.0, 1.2, np.nan], "B": [1.0, 1.0, 1.1]})
+        table = relative_strength(normalized).set_index("stock")
+        assert table.loc["A", "return_pct"] == pytest.approx(20.0)
+
+    def test_empty(self):
+        assert relative_strength(pd.DataFrame()).empty
+
+
+class TestReturnCorrelation:
+
+    def test_matches_pandas(self):
+        prices = _prices()
+        expected = prices.pct_change(fill_method=None).corr(min_periods=20)
+        pd.testing.assert_frame_equal(return_correlation(prices), expected)
+
+    def test_identical_series(self):
+        prices = _prices(n_tickers=1)
+        prices["COPY"] = prices["T0"] * 3
+        assert return_correlation(prices).loc["T0", "COPY"] == pytest.approx(1.0)
@@ -0,0 +1,83 @@
+"""
+tests/test_price_matrix.py — unit tests for scripts/price_matrix.py, the
+wide date × ticker matrices shared by the investment pages.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.price_matrix import FIELDS, build_price_matrices
+
+
+def _daily():
+    rows = [
+        # date,        stock, close, shares_held
+        ("2026-01-02", "BBB", 20.0, 1.0),
+        ("2026-01-02", "AAA", 10.0, 2.0),
+        ("2026-01-05", "AAA", 11.0, 2.0),
+        ("2026-01-06", "AAA", 12.0, 3.0),
+        ("2026-01-06", "BBB", 21.0, 1.0),
+        ("2026-01-07", "CCC", 5.0, 4.0),
+    ]
+    df = pd.DataFrame(rows, columns=["date", "stock", "close", "shares_held"])
+    df["market_value"] = df["close"] * df["shares_held"]
+    df["equity"] = 8.0 * df["shares_held"]
+    return df.sample(frac=1, random_state=1)   # the pivot must not depend on row order
+
+
+class TestBuildPriceMatrices:
+
+    def test_matches_pivot_table(self):
+        daily = _daily()
+        matrices = build_price_matrices(daily)
+        for field in FIELDS:
+            expected = daily.assign(date=pd.to_datetime(daily["date"])).pivot_table(
+                index="date", columns="stock", values=field)
+            pd.testing.assert_frame_equal(matrices[field], expected, check_names=False, check_freq=False)
+
+    def test_layout(self):
+        matrices = build_price_matrices(_daily())
+        assert matrices.tickers == ["AAA", "BBB", "CCC"]
+        assert matrices.dates.is_monotonic_increasing
+        assert all(dtype == "float64" for dtype in matrices.close.dtypes)
+        assert np.isnan(matrices.close.loc["2026-01-05", "BBB"])
+
+    def test_missing_field_is_nan(self):
+        matrices = build_price_matrices(_daily().drop(columns=["equity"]))
+        assert matrices.equity.isna().all().all()
+        assert matrices.equity.shape == matrices.close.shape
+
+    def test_empty(self):
+        matrices = build_price_matrices(pd.DataFrame(columns=["date", "stock", "close"]))
+        assert matrices.empty
+        assert matrices.tickers == []
+        assert matrices.series("AAA").empty
+
+    def test_unknown_field(self):
+        with pytest.raises(KeyError):
+            build_price_matrices(_daily())["volume"]
+
+
+class TestQueries:
+
+    def test_series_drops_missing_days(self):
+        series = build_price_matrices(_daily()).series("BBB")
+        assert series.tolist() == [20.0, 21.0]
+        assert series.index.strftime("%Y-%m-%d").tolist() == ["2026-01-02", "2026-01-06"]
+
+    def test_series_is_a_column_view(self):
+        matrices = build_price_matrices(_daily())
+        assert np.shares_memory(matrices.close["AAA"].to_numpy(), matrices.close.to_numpy())
+
+    def test_window(self):
+        window = build_price_matrices(_daily()).window("2026-01-05", "2026-01-06", tickers=["BBB", "ZZZ", "AAA"])
+        assert list(window.columns) == ["BBB", "AAA"]
+        assert window["AAA"].tolist() == [11.0, 12.0]
+
+    def test_cross_section(self):
+        matrices = build_price_matrices(_daily())
+        assert matrices.on()["CCC"] == 5.0
+        row = matrices.on("2026-01-05", field="shares_held")    # last date on or before
+        assert row["AAA"] == 2.0 and np.isnan(row["BBB"])
+        assert matrices.on("2025-12-31").isna().all()
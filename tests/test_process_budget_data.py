@@ -0,0 +1,336 @@
+"""
+tests/test_process_budget_data.py — tests for scripts/process_budget_data.py,
+the Budget.xlsx → income / expenses / monthly_budget CSV parser.
+
+Workbooks are generated with openpyxl in tmp_path, laid out like the real
+Budget.xlsx: expense and income blocks side by side under a header on row 14
+(or row 15 on shifted sheets), and a 'Budget v Actual' sheet with its header
+on row 2.
+"""
+
+import json
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import scripts.process_budget_data as pbd
+
+TARGET_CATEGORIES = ["Rent", "Groceries", "Dining", "Transport", "Utilities",
+                     "Insurance", "Health", "Fun", "Savings", "Disposable"]
+
+
+def _monthly_sheet(wb, title, month, header_row=14, n_expenses=4, n_income=2):
+    ws = wb.create_sheet(title)
+    ws["A1"] = f"{title} summary"
+    ws["B3"] = 1234.5
+    ws.cell(row=header_row, column=1, value="Amount")
+    ws.cell(row=header_row, column=2, value="Date")
+    ws.cell(row=header_row, column=3, value="Expense Category")
+    ws.cell(row=header_row, column=4, value="Description")
+    ws.cell(row=header_row, column=6, value="Source")
+    ws.cell(row=header_row, column=7, value="Amount")
+    ws.cell(row=header_row, column=8, value="Date Received")
+    for i in range(n_expenses):
+        r = header_row + 1 + i
+        ws.cell(row=r, column=1, value=10 * (i + 1) + 0.25 * (i % 2))
+        ws.cell(row=r, column=2, value=datetime(2025, month, 1 + i))
+        ws.cell(row=r, column=3, value=["Groceries", "Dining", "Rent"][i % 3])
+        ws.cell(row=r, column=4, value=f"Purchase {i}")
+    # A half-filled expense row, dropped by dropna(how='any')
+    ws.cell(row=header_row + 1 + n_expenses, column=1, value=5)
+    for i in range(n_income):
+        r = header_row + 1 + i
+        ws.cell(row=r, column=6, value=f"Employer {i}")
+        ws.cell(row=r, column=7, value=2000 + i)
+        ws.cell(row=r, column=8, value=datetime(2025, month, 15 + i))
+    return ws
+
+
+def _targets_sheet(wb):
+    ws = wb.create_sheet("Budget v Actual")
+    ws["A1"] = "Budget targets"
+    ws.append(["Date "] + [f" {c}" for c in TARGET_CATEGORIES] + ["Ignored"])
+    for month in (1, 2, 3):
+        ws.append([datetime(2025, month, 1)] + [100 * month + i for i in range(10)] + [999])
+    ws.append(["not a date"] + [0] * 10)
+    return ws
+
+
+@pytest.fixture
+def budget_xlsx(tmp_path):
+    wb = Workbook()
+    wb.remove(wb.active)
+    _monthly_sheet(wb, "January Monthly Budget", 1)
+    _monthly_sheet(wb, "February Monthly Budget", 2, header_row=15)
+    _monthly_sheet(wb, "March Monthly Budget", 3, n_expenses=0, n_income=0)
+    wb.create_sheet("Notes")["A1"] = "ignored"
+    _targets_sheet(wb)
+    path = tmp_path / "Budget.xlsx"
+    wb.save(path)
+    return path
+
+
+def _rows(path, sheet_name):
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return pbd._sheet_rows(wb[sheet_name])
+    finally:
+        wb.close()
+
+
+class TestSingleSheetRead:
+
+    @pytest.mark.parametrize("sheet_name, skiprows", [
+        ("January Monthly Budget", 13),
+        ("February Monthly Budget", 14),
+    ])
+    @pytest.mark.parametrize("usecols", [pbd.EXPENSE_COLUMNS, pbd.INCOME_COLUMNS])
+    def test_blocks_match_read_excel(self, budget_xlsx, sheet_name, skiprows, usecols):
+        expected = pd.read_excel(budget_xlsx, engine="openpyxl", sheet_name=sheet_name,
+                                 skiprows=skiprows, usecols=usecols)
+        got = pbd._read_transaction_block(_rows(budget_xlsx, sheet_name), usecols)
+        pd.testing.assert_frame_equal(got, expected)
+
+    def test_targets_match_read_excel(self, budget_xlsx):
+        expected = pd.read_excel(budget_xlsx, engine="openpyxl", sheet_name="Budget v Actual",
+                                 header=1, usecols="A:K")
+        got = pbd._read_block(_rows(budget_xlsx, "Budget v Actual"), pbd.TARGETS_COLUMNS,
+                              header=pbd.TARGETS_HEADER_ROW)
+        pd.testing.assert_frame_equal(got, expected)
+
+    def test_missing_header_gives_empty_frame(self, budget_xlsx):
+        rows = _rows(budget_xlsx, "Notes")
+        assert pbd._read_transaction_block(rows, pbd.EXPENSE_COLUMNS).empty
+        assert pbd._read_transaction_block([], pbd.EXPENSE_COLUMNS).empty
+
+
+class TestProcessBudgetExcel:
+
+    def _run(self, tmp_path, budget_xlsx, **kwargs):
+        paths = {name: tmp_path / f"{name}.csv" for name in ("income", "expenses", "monthly_budget")}
+        pbd.process_budget_excel(budget_xlsx, paths["income"], paths["expenses"],
+                                 paths["monthly_budget"], **kwargs)
+        return {name: pd.read_csv(p) for name, p in paths.items()}
+
+    def test_full_refresh_outputs(self, tmp_path, budget_xlsx):
+        out = self._run(tmp_path, budget_xlsx, full_refresh=True)
+
+        expenses = out["expenses"]
+        assert list(expenses.columns) == ["Amount", "Date", "Expense_Category", "Description"]
+        assert len(expenses) == 8
+        assert expenses["Date"].is_monotonic_decreasing
+
+        income = out["income"]
+        assert list(income.columns) == ["Source", "Amount", "Date"]
+        assert len(income) == 4
+        assert set(income["Amount"]) == {2000, 2001}
+
+        typed = pd.read_parquet(tmp_path / "expenses.parquet")
+        assert typed["Date"].dtype == "datetime64[ns]"
+        assert isinstance(typed["Expense_Category"].dtype, pd.CategoricalDtype)
+        assert len(typed) == 8
+
+        targets = out["monthly_budget"]
+        assert list(targets.columns) == ["Date", "Category", "Budget_Amount"]
+        assert len(targets) == 3 * len(TARGET_CATEGORIES)
+        assert set(targets["Category"]) == set(TARGET_CATEGORIES)
+
+    def test_merchants_resolved_and_cached(self, tmp_path, budget_xlsx):
+        cache_path = tmp_path / "merchant_cache.json"
+        self._run(tmp_path, budget_xlsx, full_refresh=True, merchant_cache_path=cache_path)
+
+        cached = json.loads(cache_path.read_text())["merchants"]
+        assert set(cached) == {f"Purchase {i}" for i in range(4)}
+        typed = pd.read_parquet(tmp_path / "expenses.parquet")
+        assert isinstance(typed["Merchant"].dtype, pd.CategoricalDtype)
+        assert typed["Merchant"].astype(str).tolist() == typed["Description"].map(cached).tolist()
+
+    def test_incremental_refresh_keeps_history(self, tmp_path, budget_xlsx):
+        first = self._run(tmp_path, budget_xlsx, full_refresh=True)
+        second = self._run(tmp_path, budget_xlsx)
+        pd.testing.assert_frame_equal(second["expenses"], first["expenses"])
+        pd.testing.assert_frame_equal(second["income"], first["income"])
+
+    @pytest.mark.filterwarnings("error::FutureWarning")
+    def test_merge_skips_empty_frames(self, tmp_path, budget_xlsx):
+        # Concatenating onto the empty seed frames raised pandas' empty-entry FutureWarning
+        full = self._run(tmp_path, budget_xlsx, full_refresh=True)
+        assert len(full["expenses"]) == 8
+        assert len(self._run(tmp_path, budget_xlsx)["income"]) == 4
+
+    def test_workbook_opened_once(self, tmp_path, budget_xlsx, monkeypatch):
+        calls = []
+        real_load = pbd.load_workbook
+        monkeypatch.setattr(pbd, "load_workbook", lambda *a, **k: calls.append(a) or real_load(*a, **k))
+        monkeypatch.setattr(pd, "read_excel", lambda *a, **k: pytest.fail("read_excel called"))
+        self._run(tmp_path, budget_xlsx, full_refresh=True)
+        assert len(calls) == 1
+
+    def test_missing_file_writes_nothing(self, tmp_path):
+        pbd.process_budget_excel(tmp_path / "nope.xlsx", tmp_path / "i.csv", tmp_path / "e.csv",
+                                 tmp_path / "m.csv", full_refresh=True)
+        assert not any(tmp_path.iterdir())
+
+
+class TestSheetManifest:
+
+    def _run(self, tmp_path, budget_xlsx, **kwargs):
+        paths = {name: tmp_path / f"{name}.csv" for name in ("income", "expenses", "monthly_budget")}
+        pbd.process_budget_excel(budget_xlsx, paths["income"], paths["expenses"], paths["monthly_budget"],
+                                 manifest_path=tmp_path / "manifest.json", **kwargs)
+        return {name: pd.read_csv(p) for name, p in paths.items()}
+
+    def _count_parses(self, monkeypatch):
+        parsed = []
+        real = pbd._expenses_from_rows
+        monkeypatch.setattr(pbd, "_expenses_from_rows", lambda rows, *a: parsed.append(rows) or real(rows, *a))
+        return parsed
+
+    def test_unchanged_sheets_served_from_manifest(self, tmp_path, budget_xlsx, monkeypatch):
+        first = self._run(tmp_path, budget_xlsx, full_refresh=True)
+        manifest = pbd.load_sheet_manifest(tmp_path / "manifest.json")
+        assert set(manifest) == {"January Monthly Budget", "February Monthly Budget", "March Monthly Budget"}
+
+        parsed = self._count_parses(monkeypatch)
+        second = self._run(tmp_path, budget_xlsx)
+        assert parsed == []
+        for name in ("expenses", "income"):
+            pd.testing.assert_frame_equal(second[name], first[name])
+
+    def test_edit_to_old_month_is_picked_up(self, tmp_path, budget_xlsx, monkeypatch):
+        self._run(tmp_path, budget_xlsx, full_refresh=True)
+
+        wb = load_workbook(budget_xlsx)
+        wb["January Monthly Budget"]["A15"] = 777.77  # first January expense
+        wb.save(budget_xlsx)
+
+        parsed = self._count_parses(monkeypatch)
+        out = self._run(tmp_path, budget_xlsx)
+        assert len(parsed) == 1
+        expenses = out["expenses"]
+        assert 777.77 in set(expenses["Amount"])
+        assert (expenses["Amount"] == 10).sum() == 1  # February's row is untouched
+        assert len(expenses) == 8
+
+    def test_removed_sheet_rows_retained_until_full_refresh(self, tmp_path, budget_xlsx):
+        self._run(tmp_path, budget_xlsx, full_refresh=True)
+        wb = load_workbook(budget_xlsx)
+        del wb["January Monthly Budget"]
+        wb.save(budget_xlsx)
+
+        assert len(self._run(tmp_path, budget_xlsx)["expenses"]) == 8
+        assert len(self._run(tmp_path, budget_xlsx, full_refresh=True)["expenses"]) == 4
+        assert "January Monthly Budget" not in pbd.load_sheet_manifest(tmp_path / "manifest.json")
+
+    def test_corrupt_manifest_falls_back_to_parsing(self, tmp_path, budget_xlsx):
+        first = self._run(tmp_path, budget_xlsx, full_refresh=True)
+        (tmp_path / "manifest.json").write_text("{not json")
+        second = self._run(tmp_path, budget_xlsx)
+        pd.testing.assert_frame_equal(second["expenses"], first["expenses"])
+
+
+class TestStreamMode:
+
+    def _paths(self, tmp_path, prefix):
+        return [tmp_path / f"{prefix}_{name}.csv" for name in ("income", "expenses", "monthly_budget")]
+
+    def test_matches_in_memory_rebuild(self, tmp_path, budget_xlsx):
+        batch = self._paths(tmp_path, "batch")
+        stream = self._paths(tmp_path, "stream")
+        pbd.process_budget_excel(budget_xlsx, *batch, full_refresh=True)
+        pbd.stream_budget_excel(budget_xlsx, *stream)
+
+        for b, s in zip(batch, stream):
+            expected = pd.read_csv(b)
+            got = pd.read_csv(s)
+            key = list(expected.columns)
+            pd.testing.assert_frame_equal(got.sort_values(key).reset_index(drop=True),
+                                          expected.sort_values(key).reset_index(drop=True))
+        for b, s in zip(batch[:2], stream[:2]):
+            expected = pd.read_parquet(b.with_suffix(".parquet"))
+            got = pd.read_parquet(s.with_suffix(".parquet"))
+            key = list(expected.columns)
+            pd.testing.assert_frame_equal(got.sort_values(key).reset_index(drop=True),
+                                          expected.sort_values(key).reset_index(drop=True),
+                                          check_categorical=False)
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_duplicate_sheets_written_once(self, tmp_path, budget_xlsx):
+        wb = load_workbook(budget_xlsx)
+        wb.copy_worksheet(wb["January Monthly Budget"]).title = "January Monthly Budget (copy)"
+        wb.save(budget_xlsx)
+
+        income, expenses, targets = self._paths(tmp_path, "stream")
+        pbd.stream_budget_excel(budget_xlsx, income, expenses, targets)
+        assert len(pd.read_csv(expenses)) == 8
+        assert len(pd.read_csv(income)) == 4
+
+    def test_writer_dedupes_on_row_hashes(self, tmp_path):
+        out = pbd._IncrementalCsvWriter(tmp_path / "income.csv", pbd.INCOME_OUTPUT_COLUMNS, "income")
+        first = pd.DataFrame({"Source": ["Job", "Gift"], "Amount": [100, 25],
+                              "Date": pd.to_datetime(["2026-01-01", "2026-01-05"])})
+        # Same rows again with Amount parsed as float on a later sheet, plus one new row
+        second = pd.DataFrame({"Source": ["Job", "Job"], "Amount": [100.0, 100.0],
+                               "Date": pd.to_datetime(["2026-01-01", "2026-02-01"])})
+        assert len(out.write(first)) == 2
+        assert len(out.write(second)) == 1
+        out.close()
+        assert len(pd.read_csv(tmp_path / "income.csv")) == 3
+        assert all(isinstance(key, int) for key in out._seen)
+
+    def test_sheets_are_read_one_at_a_time(self, budget_xlsx):
+        wb = load_workbook(budget_xlsx, read_only=True, data_only=True)
+        try:
+            sheets = pbd.iter_budget_sheets(wb)
+            name, expenses, income = next(sheets)
+            assert name == "January Monthly Budget"
+            assert len(expenses) == 4 and len(income) == 2
+            assert [n for n, _, _ in sheets] == ["February Monthly Budget", "March Monthly Budget"]
+        finally:
+            wb.close()
+
+
+class TestParallelSheets:
+
+    def _run(self, tmp_path, budget_xlsx, prefix, **kwargs):
+        paths = [tmp_path / f"{prefix}_{name}.csv" for name in ("income", "expenses", "monthly_budget")]
+        pbd.process_budget_excel(budget_xlsx, *paths, **kwargs)
+        return [pd.read_csv(p) for p in paths]
+
+    def test_workers_match_serial(self, tmp_path, budget_xlsx):
+        serial = self._run(tmp_path, budget_xlsx, "serial", full_refresh=True)
+        parallel = self._run(tmp_path, budget_xlsx, "parallel", full_refresh=True, workers=2)
+        for s, p in zip(serial, parallel):
+            pd.testing.assert_frame_equal(p, s)
+
+    def test_workers_skip_unchanged_sheets(self, tmp_path, budget_xlsx):
+        wb = load_workbook(budget_xlsx, read_only=True, data_only=True)
+        names = [n for n in wb.sheetnames if "Monthly Budget" in n]
+        serial = list(pbd.iter_parsed_sheets(budget_xlsx, wb, names, {}))
+        known = {name: digest for name, digest, _, _ in serial}
+        known["March Monthly Budget"] = "stale"
+        parallel = list(pbd.iter_parsed_sheets(budget_xlsx, wb, names, known, workers=3))
+        wb.close()
+
+        assert [p[0] for p in parallel] == names
+        assert [p[1] for p in parallel] == [s[1] for s in serial]
+        assert parallel[0][2] is None and parallel[1][2] is None
+        assert parallel[2][2] is not None
+
+
+class TestBudgetCubeOutput:
+
+    def test_batch_and_stream_write_the_same_cube(self, tmp_path, budget_xlsx):
+        from scripts.budget_cube import build_budget_cube, read_budget_cube
+
+        paths = [tmp_path / f"{name}.csv" for name in ("income", "expenses", "monthly_budget")]
+        pbd.process_budget_excel(budget_xlsx, *paths, full_refresh=True, cube_path=tmp_path / "batch.parquet")
+        batch = read_budget_cube(tmp_path / "batch.parquet")
+        expected = build_budget_cube(pd.read_csv(paths[1]), pd.read_csv(paths[0]))
+        pd.testing.assert_frame_equal(batch, expected)
+        assert set(batch["type"]) == {"income", "expense"}
+
+        pbd.stream_budget_excel(budget_xlsx, *paths, cube_path=tmp_path / "stream.parquet")
+        pd.testing.assert_frame_equal(read_budget_cube(tmp_path / "stream.parquet"), batch)
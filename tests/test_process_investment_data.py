@@ -0,0 +1,674 @@
+"""
+tests/test_process_investment_data.py — unit tests for the pure / mockable
+parts of scripts/process_investment_data.py.
+
+Functions under test:
+  - _fetch_history_batch      — splitting a wide yf.download frame per ticker
+  - _history_start_date       — per-ticker incremental watermarks
+  - _plan_history_fetch       — closed positions skipped once fully recorded
+  - _replay_daily_holdings    — vectorized replay, parity with the row loop
+  - create_daily_stock_table  — batching and circuit breaker (yfinance mocked)
+  - refresh_pipeline          — asyncio pipeline parity with the sequential phases
+  - _fetch_history_request    — response-cache replay, offline mode, per-ticker pacing
+  - QuoteStore                — one info / fast_info fetch per ticker per run
+  - --resume                  — checkpointed history converges across runs
+
+No network access: every yfinance entry point is monkeypatched.
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scripts.process_investment_data as pid
+from scripts.rate_limiter import TokenBucketLimiter
+from scripts.refresh_checkpoint import RefreshCheckpoint
+from scripts.response_cache import ResponseCache
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+def _wide_download(tickers, dates, closes_by_ticker):
+    """Builds a frame shaped like yf.download(..., group_by="ticker")."""
+    idx = pd.DatetimeIndex(pd.to_datetime(dates), name="Date")
+    parts = {}
+    for t in tickers:
+        closes = closes_by_ticker.get(t, [np.nan] * len(dates))
+        parts[t] = pd.DataFrame({
+            "Open": closes, "High": closes, "Low": closes,
+            "Close": closes, "Volume": [0] * len(dates),
+        }, index=idx)
+    return pd.concat(parts, axis=1)
+
+
+def _buy(date, qty, price):
+    return {"date": date, "buy_sell": "buy", "quantity": qty, "share_price": price}
+
+
+def _sell(date, qty, price):
+    return {"date": date, "buy_sell": "sell", "quantity": qty, "share_price": price}
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    monkeypatch.setattr(pid, "YAHOO_LIMITER", TokenBucketLimiter(60, sleep=lambda *_: None))
+    monkeypatch.setattr(pid, "RESPONSE_CACHE", ResponseCache(path=None))
+    monkeypatch.setattr(pid, "QUOTES", pid.QuoteStore())
+
+
+# ── _fetch_history_batch ─────────────────────────────────────────────────────
+
+class TestFetchHistoryBatch:
+
+    def test_splits_wide_frame_per_ticker(self, monkeypatch):
+        dates = ["2026-01-02", "2026-01-05"]
+        wide = _wide_download(["AAA", "BBB"], dates, {"AAA": [10.0, 11.0], "BBB": [20.0, 21.0]})
+        monkeypatch.setattr(pid.yf, "download", lambda *a, **k: wide)
+        frames, _ = pid._fetch_history_batch(["AAA", "BBB"], "2026-01-01")
+        assert list(frames["AAA"]["Close"]) == [10.0, 11.0]
+        assert list(frames["BBB"]["Close"]) == [20.0, 21.0]
+        assert frames["AAA"].index.name == "Date"
+
+    def test_all_nan_ticker_maps_to_empty_frame(self, monkeypatch):
+        wide = _wide_download(["AAA", "BAD"], ["2026-01-02"], {"AAA": [10.0]})
+        monkeypatch.setattr(pid.yf, "download", lambda *a, **k: wide)
+        frames, _ = pid._fetch_history_batch(["AAA", "BAD"], "2026-01-01")
+        assert frames["BAD"].empty
+        assert not frames["AAA"].empty
+
+    def test_ticker_missing_from_response_maps_to_empty_frame(self, monkeypatch):
+        wide = _wide_download(["AAA"], ["2026-01-02"], {"AAA": [10.0]})
+        monkeypatch.setattr(pid.yf, "download", lambda *a, **k: wide)
+        frames, _ = pid._fetch_history_batch(["AAA", "GONE"], "2026-01-01")
+        assert frames["GONE"].empty
+
+    def test_returns_per_ticker_errors(self, monkeypatch):
+        def download(tickers, **kwargs):
+            monkeypatch.setattr(pid.yf.shared, "_ERRORS", {"BAD": "YFRateLimitError('Too Many Requests')"})
+            return _wide_download(tickers, ["2026-01-02"], {"AAA": [10.0]})
+
+        monkeypatch.setattr(pid.yf, "download", download)
+        frames, errors = pid._fetch_history_batch(["AAA", "BAD"], "2026-01-01")
+        assert frames["BAD"].empty
+        assert errors == {"BAD": "YFRateLimitError('Too Many Requests')"}
+
+
+# ── _history_start_date ──────────────────────────────────────────────────────
+
+def _mark(last_date=None, first_txn="2020-03-01", last_txn="2021-01-01", is_open=True):
+    return {
+        "last_date": pd.Timestamp(last_date) if last_date else None,
+        "first_txn": pd.Timestamp(first_txn) if first_txn else None,
+        "last_txn": pd.Timestamp(last_txn) if last_txn else None,
+        "is_open": is_open,
+        "last_held": pd.Timestamp(last_txn) - pd.offsets.BDay(1) if last_txn and not is_open else None,
+    }
+
+
+class TestHistoryStartDate:
+
+    def test_watchlist_ticker_is_not_fetched(self):
+        assert pid._history_start_date(_mark(first_txn=None, last_txn=None)) is None
+
+    def test_new_ticker_gets_full_history(self):
+        assert pid._history_start_date(_mark()) == pid.FULL_HISTORY_START
+
+    def test_full_history_start_ignores_first_buy(self):
+        mark = _mark(first_txn="2012-05-01")
+        assert pid._history_start_date(mark) == pid.FULL_HISTORY_START
+
+    def test_existing_ticker_fetches_only_delta(self):
+        assert pid._history_start_date(_mark(last_date="2026-02-20")) == "2026-02-20"
+
+    def test_full_refresh_ignores_watermark(self):
+        mark = _mark(last_date="2026-02-20")
+        assert pid._history_start_date(mark, full_refresh=True) == pid.FULL_HISTORY_START
+
+    def test_closed_position_with_unrecorded_sell_is_fetched(self):
+        mark = _mark(last_date="2023-06-01", last_txn="2023-07-01", is_open=False)
+        assert pid._history_start_date(mark) == "2023-06-01"
+
+
+# ── _plan_history_fetch ──────────────────────────────────────────────────────
+
+class TestPlanHistoryFetch:
+
+    @pytest.mark.parametrize("sell_date", ["1/10/2024", "1/16/2024"])   # 1/16 follows a market holiday
+    def test_recorded_closed_position_is_not_refetched(self, tmp_path, sell_date):
+        dates = pd.bdate_range("2024-01-02", "2024-01-31").drop(pd.Timestamp("2024-01-15"))
+        hist = pd.DataFrame({"Close": np.linspace(10, 20, len(dates))}, index=pd.DatetimeIndex(dates, name="Date"))
+        stock_dict = {
+            "SOLD": {"stock_name": "Sold", "purchase_history": [_buy("1/4/2024", 5, 10.0),
+                                                                 _sell(sell_date, 5, 12.0)]},
+            "HELD": {"stock_name": "Held", "purchase_history": [_buy("1/2/2024", 1, 10.0)]},
+        }
+        stored = pd.concat([pid._replay_daily_holdings(t, d, hist) for t, d in stock_dict.items()])
+        stored.to_csv(tmp_path / "daily_stocks.csv", index=False)
+
+        _, batches, to_fetch, _ = pid._plan_history_fetch(stock_dict, tmp_path / "daily_stocks")
+        assert to_fetch == ["HELD"]
+        assert batches == [("2024-01-31", ["HELD"])]
+
+    def test_closed_position_missing_held_days_is_refetched(self, tmp_path):
+        dates = pd.bdate_range("2024-01-02", "2024-01-31")
+        hist = pd.DataFrame({"Close": 10.0}, index=pd.DatetimeIndex(dates, name="Date"))
+        details = {"stock_name": "Sold", "purchase_history": [_buy("1/4/2024", 5, 10.0)]}
+        # Stored while still open, through 1/8; sold on 1/10, so 1/9 is missing
+        stored = pid._replay_daily_holdings("SOLD", details, hist[:"2024-01-08"])
+        stored.to_csv(tmp_path / "daily_stocks.csv", index=False)
+        details["purchase_history"].append(_sell("1/10/2024", 5, 12.0))
+
+        _, batches, _, _ = pid._plan_history_fetch({"SOLD": details}, tmp_path / "daily_stocks")
+        assert batches == [("2024-01-08", ["SOLD"])]
+
+
+# ── _replay_daily_holdings ───────────────────────────────────────────────────
+
+def _reference_replay(ticker, details, hist):
+    """The original hist.iterrows() replay loop, kept verbatim as the oracle."""
+    hist = hist.reset_index()
+    txns = sorted(
+        [{"date": pid._parse_txn_date(t["date"]), "qty": float(t["quantity"]),
+          "price": float(t["share_price"]), "type": t["buy_sell"]}
+         for t in details["purchase_history"]],
+        key=lambda x: x["date"],
+    )
+    current_qty = 0.0
+    current_cost_basis = 0.0
+    txn_idx = 0
+    rows = []
+    for _, row in hist.iterrows():
+        market_date = row["Date"]
+        close_price = row["Close"]
+        while txn_idx < len(txns) and txns[txn_idx]["date"] <= market_date:
+            t = txns[txn_idx]
+            if t["type"] == "buy":
+                current_cost_basis += t["qty"] * t["price"]
+                current_qty += t["qty"]
+            elif t["type"] == "sell":
+                sell_qty = min(t["qty"], max(current_qty, 0.0))
+                if current_qty > 0 and sell_qty > 0:
+                    avg = current_cost_basis / current_qty
+                    current_cost_basis -= sell_qty * avg
+                current_qty -= sell_qty
+            txn_idx += 1
+        if current_qty > 0.001:
+            market_val = current_qty * close_price
+            rows.append({
+                "Date": market_date, "Close": close_price, "Stock": ticker,
+                "Shares_Held": current_qty, "Avg_Cost": current_cost_basis / current_qty,
+                "Equity": current_cost_basis, "Market_Value": market_val,
+                "Total_Profit": market_val - current_cost_basis,
+            })
+    return pd.DataFrame(rows, columns=pid.DAILY_HOLDINGS_COLUMNS)
+
+
+def _random_case(seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-01", periods=120)
+    hist = pd.DataFrame(
+        {"Close": 50 + rng.normal(0, 1, len(dates)).cumsum()},
+        index=pd.DatetimeIndex(dates, name="Date"),
+    )
+    txns = []
+    # Include weekend / pre-history / post-history dates and same-day duplicates
+    for d in rng.choice(pd.date_range("2023-12-01", "2024-07-15"), size=12):
+        d = pd.Timestamp(d)
+        kind = "buy" if rng.random() < 0.6 else "sell"
+        txns.append({"date": f"{d.month}/{d.day}/{d.year}", "buy_sell": kind,
+                     "quantity": float(rng.integers(1, 15)), "share_price": float(rng.uniform(20, 80))})
+    return {"stock_name": "R", "purchase_history": txns}, hist
+
+
+class TestReplayDailyHoldings:
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_parity_with_row_loop(self, seed):
+        details, hist = _random_case(seed)
+        expected = _reference_replay("RND", details, hist)
+        result = pid._replay_daily_holdings("RND", details, hist)
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False)
+
+    def test_final_state_matches_replay_transactions(self):
+        details = {"purchase_history": [
+            _buy("1/2/2024", 10, 10.0), _buy("2/1/2024", 10, 20.0),
+            _sell("3/1/2024", 4, 50.0), _sell("4/1/2024", 100, 50.0),
+            _buy("5/1/2024", 3, 30.0),
+        ]}
+        hist = pd.DataFrame({"Close": [1.0]}, index=pd.DatetimeIndex(["2024-06-03"], name="Date"))
+        row = pid._replay_daily_holdings("X", details, hist).iloc[-1]
+        qty, cost = pid._replay_transactions(details)
+        assert row["Shares_Held"] == pytest.approx(qty)
+        assert row["Equity"] == pytest.approx(cost)
+
+    def test_no_transactions_returns_empty_frame(self):
+        hist = pd.DataFrame({"Close": [1.0]}, index=pd.DatetimeIndex(["2024-06-03"], name="Date"))
+        result = pid._replay_daily_holdings("X", {"purchase_history": []}, hist)
+        assert result.empty
+        assert list(result.columns) == pid.DAILY_HOLDINGS_COLUMNS
+
+
+# ── create_daily_stock_table ─────────────────────────────────────────────────
+
+class TestCreateDailyStockTable:
+
+    def test_one_request_per_batch(self, monkeypatch, tmp_path):
+        calls = []
+
+        def fake_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            return _wide_download(tickers, ["2026-01-02"], {t: [10.0] for t in tickers})
+
+        monkeypatch.setattr(pid.yf, "download", fake_download)
+        stock_dict = {
+            f"T{i}": {"stock_name": f"T{i}", "purchase_history": [_buy("1/1/2026", 1, 5.0)]}
+            for i in range(5)
+        }
+        df = pid.create_daily_stock_table(stock_dict, tmp_path / "daily_stocks", full_refresh=True, batch_size=2)
+        assert [len(c) for c in calls] == [2, 2, 1]
+        assert set(df["Stock"]) == set(stock_dict)
+
+    def test_varied_first_buys_share_full_history_batches(self, monkeypatch, tmp_path):
+        calls = []
+
+        def fake_download(tickers, start=None, **kwargs):
+            calls.append((start, list(tickers)))
+            return _wide_download(tickers, ["2025-12-31", "2026-01-02"], {t: [9.0, 10.0] for t in tickers})
+
+        monkeypatch.setattr(pid.yf, "download", fake_download)
+        stock_dict = {
+            f"T{i}": {"stock_name": f"T{i}", "purchase_history": [_buy(f"1/{i + 1}/2020", 1, 5.0)]}
+            for i in range(5)
+        }
+        stock_dict["LATE"] = {"stock_name": "Late", "purchase_history": [_buy("1/1/2026", 1, 5.0)]}
+        df = pid.create_daily_stock_table(stock_dict, tmp_path / "daily_stocks", full_refresh=True, batch_size=3)
+        assert [len(t) for _, t in calls] == [3, 3]
+        assert {s for s, _ in calls} == {pid.FULL_HISTORY_START}
+        # Rows before a ticker's first buy are still dropped by the replay
+        assert df[df["Stock"] == "LATE"]["Date"].min() == pd.Timestamp("2026-01-02")
+
+    def test_circuit_breaker_skips_remaining_batches(self, monkeypatch, tmp_path):
+        calls = []
+
+        def failing_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            raise RuntimeError("429 Too Many Requests")
+
+        monkeypatch.setattr(pid.yf, "download", failing_download)
+        stock_dict = {
+            f"T{i}": {"stock_name": f"T{i}", "purchase_history": [_buy("1/1/2026", 1, 5.0)]}
+            for i in range(12)
+        }
+        df = pid.create_daily_stock_table(stock_dict, tmp_path / "daily_stocks", full_refresh=True, batch_size=3)
+        assert df.empty
+        # 3 + 3 failures trips the threshold of 5 → third batch never requested
+        assert len(calls) == 2
+
+    def test_partial_sell_uses_average_cost(self, monkeypatch, tmp_path):
+        dates = ["2026-01-02", "2026-01-05", "2026-01-06"]
+        monkeypatch.setattr(
+            pid.yf, "download",
+            lambda tickers, **k: _wide_download(tickers, dates, {"AAA": [10.0, 12.0, 14.0]}),
+        )
+        stock_dict = {"AAA": {"stock_name": "Alpha", "purchase_history": [
+            _buy("1/2/2026", 10, 10.0),
+            _buy("1/5/2026", 10, 20.0),
+            _sell("1/6/2026", 5, 30.0),
+        ]}}
+        df = pid.create_daily_stock_table(stock_dict, tmp_path / "daily_stocks", full_refresh=True)
+        last = df.sort_values("Date").iloc[-1]
+        assert last["Shares_Held"] == pytest.approx(15.0)
+        assert last["Avg_Cost"] == pytest.approx(15.0)
+        assert last["Equity"] == pytest.approx(225.0)
+
+    def test_incremental_fetch_uses_per_ticker_start_dates(self, monkeypatch, tmp_path):
+        csv = tmp_path / "daily_stocks.csv"
+        pd.DataFrame({
+            "Date": ["2026-01-05", "2026-01-02"],
+            "Close": [10.0, 20.0],
+            "Stock": ["OLD", "LAG"],
+            "Shares_Held": [1.0, 1.0],
+            "Avg_Cost": [5.0, 5.0],
+            "Equity": [5.0, 5.0],
+            "Market_Value": [10.0, 20.0],
+            "Total_Profit": [5.0, 15.0],
+        }).to_csv(csv, index=False)
+
+        starts = {}
+
+        def fake_download(tickers, start=None, **kwargs):
+            for t in tickers:
+                starts[t] = start
+            return _wide_download(tickers, ["2026-01-06"], {t: [11.0] for t in tickers})
+
+        monkeypatch.setattr(pid.yf, "download", fake_download)
+        held = {"stock_name": "x", "purchase_history": [_buy("1/2/2025", 1, 5.0)]}
+        stock_dict = {
+            "OLD": held,
+            "LAG": held,
+            "NEW": {"stock_name": "New", "purchase_history": [_buy("6/1/2025", 1, 5.0)]},
+            "WATCH": {"stock_name": "Watch", "purchase_history": []},
+        }
+        # No store yet → the legacy CSV next to it is migrated
+        df = pid.create_daily_stock_table(stock_dict, tmp_path / "daily_stocks")
+        assert starts == {"OLD": "2026-01-05", "LAG": "2026-01-02", "NEW": pid.FULL_HISTORY_START}
+        assert "WATCH" not in set(df["Stock"])
+
+
+# ── refresh_pipeline ─────────────────────────────────────────────────────────
+
+def _fake_info(ticker):
+    return {"longName": f"{ticker} Inc", "52WeekChange": 0.1, "sector": "Tech",
+            "marketCap": 5e9, "currentPrice": 1.0}
+
+
+def _fake_fast_info(ticker):
+    return {"last_price": 99.0, "previous_close": 98.0, "year_high": 120.0, "year_low": 80.0}
+
+
+def _pipeline_dict(n=6):
+    stock_dict = {
+        f"T{i}": {"stock_name": f"T{i}", "purchase_history": [_buy("1/2/2026", i + 1, 5.0)]}
+        for i in range(n)
+    }
+    stock_dict["SOLD"] = {"stock_name": "Sold", "purchase_history": [
+        _buy("1/2/2026", 1, 5.0), _sell("1/5/2026", 1, 6.0)]}
+    return stock_dict
+
+
+class _GlobalStateSource:
+    """
+    Collects results in one shared dict that every download() resets, like
+    yf.download does with yfinance.shared._DFS, so overlapping calls clobber
+    each other. Each ticker T<i> closes at 10 + i.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def download(self, tickers, start):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self._results.clear()
+        for t in tickers:
+            time.sleep(0.005)
+            self._results[t] = 10.0 + (int(t[1:]) if t[1:].isdigit() else 0)
+        wide = _wide_download(list(self._results), ["2026-01-02", "2026-01-05", "2026-01-06"],
+                              {t: [c] * 3 for t, c in self._results.items()})
+        with self._lock:
+            self.active -= 1
+        return wide
+
+
+class TestRefreshPipeline:
+
+    @pytest.fixture(autouse=True)
+    def _mock_yahoo(self, monkeypatch):
+        dates = ["2026-01-02", "2026-01-05", "2026-01-06"]
+        monkeypatch.setattr(
+            pid.yf, "download",
+            lambda tickers, **k: _wide_download(tickers, dates, {t: [10.0, 11.0, 12.0] for t in tickers}),
+        )
+        monkeypatch.setattr(pid, "_safe_ticker_info", _fake_info)
+        monkeypatch.setattr(pid, "_fetch_fast_info", _fake_fast_info)
+
+    def _run(self, stock_dict, tmp_path, **kwargs):
+        return asyncio.run(pid.refresh_pipeline(
+            stock_dict, tmp_path / "daily_stocks", tmp_path / "stock_info.csv",
+            full_refresh=True, batch_size=2, **kwargs,
+        ))
+
+    def test_matches_sequential_phases(self, tmp_path):
+        stock_dict = _pipeline_dict()
+        daily_df, stocks_df, info_df = self._run(stock_dict, tmp_path)
+
+        seq_daily = pid.create_daily_stock_table(stock_dict, tmp_path / "daily_stocks", True, batch_size=2)
+        seq_stocks = pid.build_summary_dataframe(stock_dict, seq_daily)
+        seq_info = pid.create_stock_info_table(stock_dict, tmp_path / "stock_info.csv", True)
+
+        pd.testing.assert_frame_equal(daily_df.reset_index(drop=True), seq_daily.reset_index(drop=True))
+        key = ["Market_Value", "Stock"]
+        pd.testing.assert_frame_equal(
+            stocks_df.sort_values(key).reset_index(drop=True),
+            seq_stocks.sort_values(key).reset_index(drop=True),
+        )
+        pd.testing.assert_frame_equal(info_df, seq_info)
+        assert "SOLD" not in set(stocks_df["Stock"])
+        assert stocks_df.set_index("Stock").loc["T0", "Price"] == pytest.approx(12.0)
+
+    def test_checkpoint_writes_stay_off_the_event_loop(self, monkeypatch, tmp_path):
+        loop_thread = threading.current_thread()
+        writers = []
+        real_record = pid.CHECKPOINT.record
+
+        def recording(phase, ticker, data):
+            writers.append((phase, threading.current_thread()))
+            return real_record(phase, ticker, data)
+
+        monkeypatch.setattr(pid.CHECKPOINT, "record", recording)
+        self._run(_pipeline_dict(), tmp_path, max_concurrency=6)
+        assert {phase for phase, _ in writers} == {"history", "quote", "fundamentals"}
+        assert all(thread is not loop_thread for _, thread in writers)
+
+    def test_other_phases_start_before_history_finishes(self, monkeypatch, tmp_path):
+        events = []
+        real_request = pid._fetch_history_request
+
+        def slow_history(batch, start_date):
+            events.append("history-start")
+            time.sleep(0.05)
+            events.append("history-end")
+            return real_request(batch, start_date)
+
+        def recording_info(ticker):
+            events.append("info")
+            return _fake_info(ticker)
+
+        monkeypatch.setattr(pid, "_fetch_history_request", slow_history)
+        monkeypatch.setattr(pid, "_safe_ticker_info", recording_info)
+        self._run(_pipeline_dict(), tmp_path, max_concurrency=6)
+        last_history = max(i for i, e in enumerate(events) if e == "history-end")
+        assert events.index("info") < last_history
+
+    def test_history_downloads_run_one_at_a_time(self, monkeypatch, tmp_path):
+        source = _GlobalStateSource()
+        monkeypatch.setattr(pid, "DATA_SOURCE", source)
+        stock_dict = _pipeline_dict(8)
+        daily_df, _, info_df = self._run(stock_dict, tmp_path, max_concurrency=6)
+        assert source.max_active == 1
+        closes = daily_df.groupby("Stock")["Close"].last()
+        for i in range(8):
+            assert closes[f"T{i}"] == pytest.approx(10.0 + i)
+        # Quote and fundamentals calls were not serialized with them
+        assert len(info_df) == len(stock_dict)
+
+    def test_history_breaker_keeps_snapshot_and_fundamentals(self, monkeypatch, tmp_path):
+        calls = []
+
+        def failing_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            raise RuntimeError("429 Too Many Requests")
+
+        monkeypatch.setattr(pid.yf, "download", failing_download)
+        stock_dict = _pipeline_dict(12)
+        daily_df, stocks_df, info_df = self._run(stock_dict, tmp_path, max_concurrency=1)
+        assert daily_df.empty
+        # 2 + 2 + 2 failures trips the threshold of 5 → later batches never requested
+        assert len(calls) == 3
+        # Snapshot falls back to the fast_info price; fundamentals are unaffected
+        assert (stocks_df["Price"] == 99.0).all()
+        assert len(info_df) == len(stock_dict)
+
+
+# ── _fetch_history_request (rate limiting) ─────────────────────────────────
+
+class TestFetchHistoryRequest:
+
+    def test_takes_one_token_per_ticker(self, monkeypatch):
+        taken = []
+        monkeypatch.setattr(pid.YAHOO_LIMITER, "acquire", lambda tokens=1: taken.append(tokens) or 0.0)
+        monkeypatch.setattr(pid.yf, "download",
+                            lambda tickers, **k: _wide_download(tickers, ["2026-01-02"], {t: [1.0] for t in tickers}))
+        pid._fetch_history_request(["AAA", "BBB", "CCC"], "2026-01-01")
+        assert taken == [3]
+
+    def test_per_ticker_429_lowers_rate(self, monkeypatch):
+        def download(tickers, **kwargs):
+            monkeypatch.setattr(pid.yf.shared, "_ERRORS", {"BBB": "YFRateLimitError('Too Many Requests. Rate limited.')"})
+            return _wide_download(tickers, ["2026-01-02"], {"AAA": [10.0]})
+
+        monkeypatch.setattr(pid.yf, "download", download)
+        before = pid.YAHOO_LIMITER.rate_per_minute
+        frames = pid._fetch_history_request(["AAA", "BBB"], "2026-01-01")
+        assert frames["BBB"].empty and not frames["AAA"].empty
+        assert pid.YAHOO_LIMITER.rate_per_minute < before
+
+    def test_other_per_ticker_errors_do_not_lower_rate(self, monkeypatch):
+        def download(tickers, **kwargs):
+            monkeypatch.setattr(pid.yf.shared, "_ERRORS", {"BBB": "YFTzMissingError('possibly delisted')"})
+            return _wide_download(tickers, ["2026-01-02"], {"AAA": [10.0]})
+
+        monkeypatch.setattr(pid.yf, "download", download)
+        before = pid.YAHOO_LIMITER.rate_per_minute
+        pid._fetch_history_request(["AAA", "BBB"], "2026-01-01")
+        assert pid.YAHOO_LIMITER.rate_per_minute == before
+
+
+# ── _fetch_history_request (response cache) ─────────────────────────────────
+
+class TestFetchHistoryRequestCache:
+
+    def test_rerun_only_requests_uncached_tickers(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(pid, "RESPONSE_CACHE", ResponseCache(tmp_path / "cache.sqlite"))
+        calls = []
+
+        def fake_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            # First call: Yahoo returns nothing for BBB
+            closes = {"AAA": [10.0]} if len(calls) == 1 else {t: [10.0] for t in tickers}
+            return _wide_download(tickers, ["2026-01-02"], closes)
+
+        monkeypatch.setattr(pid.yf, "download", fake_download)
+        first = pid._fetch_history_request(["AAA", "BBB"], "2026-01-01")
+        assert first["BBB"].empty
+        second = pid._fetch_history_request(["AAA", "BBB"], "2026-01-01")
+        assert calls == [["AAA", "BBB"], ["BBB"]]
+        assert not second["AAA"].empty and not second["BBB"].empty
+
+    def test_offline_serves_cache_and_never_downloads(self, monkeypatch, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        monkeypatch.setattr(pid, "RESPONSE_CACHE", cache)
+        monkeypatch.setattr(
+            pid.yf, "download",
+            lambda tickers, **k: _wide_download(tickers, ["2026-01-02"], {t: [10.0] for t in tickers}),
+        )
+        pid._fetch_history_request(["AAA"], "2026-01-01")
+
+        cache.offline = True
+        monkeypatch.setattr(pid.yf, "download", lambda *a, **k: pytest.fail("network used offline"))
+        frames = pid._fetch_history_request(["AAA", "ZZZ"], "2026-01-01")
+        assert frames["AAA"]["Close"].tolist() == [10.0]
+        assert frames["ZZZ"].empty
+        assert pid._safe_ticker_info("ZZZ") == {}
+
+
+# ── QuoteStore ───────────────────────────────────────────────────────────────
+
+class TestQuoteStore:
+
+    def test_builders_share_one_fetch_per_ticker(self, monkeypatch, tmp_path):
+        counts = {"info": 0, "fast_info": 0}
+
+        def counting(kind, fn):
+            def wrapper(ticker):
+                counts[kind] += 1
+                return fn(ticker)
+            return wrapper
+
+        monkeypatch.setattr(pid, "_safe_ticker_info", counting("info", _fake_info))
+        monkeypatch.setattr(pid, "_fetch_fast_info", counting("fast_info", _fake_fast_info))
+        stock_dict = _pipeline_dict(4)
+        pid.build_summary_dataframe(stock_dict, pd.DataFrame())
+        pid.create_stock_info_table(stock_dict, tmp_path / "stock_info.csv", full_refresh=True)
+        assert counts == {"info": len(stock_dict), "fast_info": len(stock_dict)}
+
+    def test_concurrent_callers_wait_on_one_fetch(self, monkeypatch):
+        calls = []
+
+        def slow_info(ticker):
+            calls.append(ticker)
+            time.sleep(0.02)
+            return {"longName": ticker}
+
+        monkeypatch.setattr(pid, "_safe_ticker_info", slow_info)
+        store = pid.QuoteStore()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store.info("AAA"))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert calls == ["AAA"]
+        assert results == [{"longName": "AAA"}] * 5
+
+    def test_failures_are_memoized(self, monkeypatch):
+        calls = []
+
+        def failing_fast_info(ticker):
+            calls.append(ticker)
+            raise RuntimeError("429 Too Many Requests")
+
+        monkeypatch.setattr(pid, "_fetch_fast_info", failing_fast_info)
+        store = pid.QuoteStore()
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                store.fast_info("AAA")
+        assert calls == ["AAA"]
+
+
+# ── checkpoint / resume ──────────────────────────────────────────────────────
+
+class TestResume:
+
+    def test_resumed_run_fetches_only_unfinished_tickers(self, monkeypatch, tmp_path):
+        params = {"full_refresh": True, "stock_dictionary": "x"}
+        calls = []
+        outage = {"on": True}
+
+        def flaky_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            if outage["on"] and len(calls) > 1:
+                raise RuntimeError("429 Too Many Requests")
+            return _wide_download(tickers, ["2026-01-02"], {t: [10.0] for t in tickers})
+
+        monkeypatch.setattr(pid.yf, "download", flaky_download)
+        stock_dict = {
+            f"T{i}": {"stock_name": f"T{i}", "purchase_history": [_buy("1/1/2026", 1, 5.0)]}
+            for i in range(12)
+        }
+        store = tmp_path / "daily_stocks"
+
+        cp = RefreshCheckpoint(tmp_path / "checkpoint")
+        cp.begin(params)
+        monkeypatch.setattr(pid, "CHECKPOINT", cp)
+        first = pid.create_daily_stock_table(stock_dict, store, full_refresh=True, batch_size=3)
+        assert set(first["Stock"]) == {"T0", "T1", "T2"}
+        assert cp.failed
+
+        outage["on"] = False
+        calls.clear()
+        cp = RefreshCheckpoint(tmp_path / "checkpoint")
+        assert cp.begin(params, resume=True) == 3
+        monkeypatch.setattr(pid, "CHECKPOINT", cp)
+        second = pid.create_daily_stock_table(stock_dict, store, full_refresh=True, batch_size=3)
+        assert sorted(t for c in calls for t in c) == sorted(f"T{i}" for i in range(3, 12))
+        assert set(second["Stock"]) == set(stock_dict)
+        assert not cp.failed
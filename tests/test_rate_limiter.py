@@ -0,0 +1,106 @@
+"""
+tests/test_rate_limiter.py — unit tests for scripts/rate_limiter.py.
+
+A fake clock / sleep pair drives the limiter, so no test actually waits.
+"""
+
+import threading
+
+import pytest
+
+from scripts.rate_limiter import TokenBucketLimiter
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+def _limiter(rpm=60, burst=1, **kwargs):
+    clock = _FakeClock()
+    return TokenBucketLimiter(rpm, burst=burst, clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+class TestAcquire:
+
+    def test_burst_goes_out_without_waiting(self):
+        limiter, clock = _limiter(rpm=60, burst=3)
+        assert [limiter.acquire() for _ in range(3)] == [0, 0, 0]
+        assert clock.sleeps == []
+
+    def test_steady_state_spacing_matches_rate(self):
+        limiter, clock = _limiter(rpm=30, burst=1)
+        limiter.acquire()
+        waits = [limiter.acquire() for _ in range(4)]
+        assert waits == pytest.approx([2.0] * 4)
+        assert clock.now == pytest.approx(8.0)
+
+    def test_idle_time_refills_up_to_burst_only(self):
+        limiter, clock = _limiter(rpm=60, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+        clock.now += 600
+        assert limiter.acquire() == 0
+        assert limiter.acquire() == 0
+        assert limiter.acquire() == pytest.approx(1.0)
+
+    def test_multiple_tokens_wait_for_the_whole_batch(self):
+        limiter, _ = _limiter(rpm=60, burst=2)
+        assert limiter.acquire(5) == pytest.approx(3.0)
+        assert limiter.acquire() == pytest.approx(1.0)
+
+    def test_concurrent_callers_queue_instead_of_bursting(self):
+        # Sleeps are recorded but the clock stands still, as if all five
+        # threads arrived at the same instant
+        sleeps = []
+        limiter = TokenBucketLimiter(60, burst=1, clock=lambda: 0.0, sleep=sleeps.append)
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # One free token, then each caller reserves the next slot: 1s, 2s, 3s, 4s
+        assert sorted(sleeps) == pytest.approx([1.0, 2.0, 3.0, 4.0])
+
+
+class TestAdaptiveRate:
+
+    def test_rate_limit_halves_rate_and_drains_burst(self):
+        limiter, _ = _limiter(rpm=40, burst=3)
+        limiter.record_rate_limit()
+        assert limiter.rate_per_minute == pytest.approx(20)
+        assert limiter.acquire() == pytest.approx(3.0)
+
+    def test_rate_never_drops_below_floor(self):
+        limiter, _ = _limiter(rpm=40, min_requests_per_minute=10)
+        for _ in range(10):
+            limiter.record_rate_limit()
+        assert limiter.rate_per_minute == pytest.approx(10)
+
+    def test_success_recovers_toward_ceiling(self):
+        limiter, _ = _limiter(rpm=40)
+        limiter.record_rate_limit()
+        for _ in range(100):
+            limiter.record_success()
+        assert limiter.rate_per_minute == pytest.approx(40)
+
+    def test_reconfigure_resets_rate_and_burst(self):
+        limiter, _ = _limiter(rpm=40)
+        limiter.record_rate_limit()
+        limiter.reconfigure(90, burst=5)
+        assert limiter.rate_per_minute == pytest.approx(90)
+        assert [limiter.acquire() for _ in range(5)] == [0] * 5
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucketLimiter(0)
@@ -0,0 +1,70 @@
+"""
+tests/test_refresh_checkpoint.py — unit tests for scripts/refresh_checkpoint.py,
+the per-ticker journal behind process_investment_data.py --resume.
+"""
+
+import json
+
+import pandas as pd
+
+from scripts.refresh_checkpoint import JOURNAL_NAME, MANIFEST_NAME, RefreshCheckpoint
+
+PARAMS = {"full_refresh": False, "stock_dictionary": "abc"}
+
+
+def _frame():
+    return pd.DataFrame({"Date": pd.to_datetime(["2026-01-02"]), "Close": [10.0], "Stock": ["AAA"]})
+
+
+class TestRefreshCheckpoint:
+
+    def test_resume_restores_frames_and_rows(self, tmp_path):
+        cp = RefreshCheckpoint(tmp_path)
+        cp.begin(PARAMS)
+        cp.record("history", "BRK-B", _frame())
+        cp.record("fundamentals", "AAA", {"Stock": "AAA", "PE Ratio": 12.5})
+
+        resumed = RefreshCheckpoint(tmp_path)
+        assert resumed.begin(PARAMS, resume=True) == 2
+        assert resumed.done("history") == {"BRK-B"}
+        pd.testing.assert_frame_equal(resumed.get("history", "BRK-B"), _frame())
+        assert resumed.get("fundamentals", "AAA") == {"Stock": "AAA", "PE Ratio": 12.5}
+        assert resumed.get("fundamentals", "ZZZ") is None
+
+    def test_fresh_run_discards_previous_journal(self, tmp_path):
+        cp = RefreshCheckpoint(tmp_path)
+        cp.begin(PARAMS)
+        cp.record("quote", "AAA", {"pct_change": 1.0})
+        assert RefreshCheckpoint(tmp_path).begin(PARAMS, resume=False) == 0
+        assert not (tmp_path / JOURNAL_NAME).exists()
+
+    def test_mismatched_params_are_not_resumed(self, tmp_path):
+        cp = RefreshCheckpoint(tmp_path)
+        cp.begin(PARAMS)
+        cp.record("quote", "AAA", {"pct_change": 1.0})
+        assert RefreshCheckpoint(tmp_path).begin(dict(PARAMS, full_refresh=True), resume=True) == 0
+
+    def test_stale_journal_is_not_resumed(self, tmp_path):
+        cp = RefreshCheckpoint(tmp_path)
+        cp.begin(PARAMS)
+        cp.record("quote", "AAA", {"pct_change": 1.0})
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        manifest["started"] = "2000-01-01T00:00:00"
+        (tmp_path / MANIFEST_NAME).write_text(json.dumps(manifest))
+        assert RefreshCheckpoint(tmp_path).begin(PARAMS, resume=True) == 0
+
+    def test_torn_last_line_is_ignored(self, tmp_path):
+        cp = RefreshCheckpoint(tmp_path)
+        cp.begin(PARAMS)
+        cp.record("quote", "AAA", {"pct_change": 1.0})
+        with open(tmp_path / JOURNAL_NAME, "a") as f:
+            f.write('{"phase": "quote", "tick')
+        resumed = RefreshCheckpoint(tmp_path)
+        assert resumed.begin(PARAMS, resume=True) == 1
+
+    def test_disabled_checkpoint_writes_nothing(self, tmp_path):
+        cp = RefreshCheckpoint(path=None)
+        cp.begin(PARAMS)
+        cp.record("history", "AAA", _frame())
+        assert cp.done("history") == set()
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,101 @@
+"""
+tests/test_response_cache.py — unit tests for scripts/response_cache.py.
+
+A fake clock drives TTL expiry; every cache lives under tmp_path.
+"""
+
+import pandas as pd
+import pytest
+
+from scripts.response_cache import OfflineCacheMiss, ResponseCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(tmp_path, **kwargs):
+    clock = _Clock()
+    return ResponseCache(tmp_path / "cache.sqlite", clock=clock, **kwargs), clock
+
+
+class TestFetch:
+
+    def test_hit_skips_loader(self, tmp_path):
+        cache, _ = _cache(tmp_path)
+        calls = []
+        loader = lambda: calls.append(1) or {"longName": "Alpha"}
+        assert cache.fetch("info", "AAA", loader) == {"longName": "Alpha"}
+        assert cache.fetch("info", "AAA", loader) == {"longName": "Alpha"}
+        assert len(calls) == 1
+
+    def test_per_endpoint_ttl(self, tmp_path):
+        cache, clock = _cache(tmp_path, ttls={"info": 100, "fast_info": 10})
+        cache.put("info", "AAA", {"v": 1})
+        cache.put("fast_info", "AAA", {"v": 1})
+        clock.now += 50
+        assert cache.get("info", "AAA") == {"v": 1}
+        assert cache.get("fast_info", "AAA") is None
+
+    def test_failed_result_not_cached(self, tmp_path):
+        cache, _ = _cache(tmp_path)
+        assert cache.fetch("info", "AAA", lambda: {}, cache_if=bool) == {}
+        assert cache.stats()["entries"] == 0
+
+    def test_stale_entry_served_when_loader_fails(self, tmp_path):
+        cache, clock = _cache(tmp_path, ttls={"info": 10})
+        cache.put("info", "AAA", {"v": "old"})
+        clock.now += 100
+
+        def failing():
+            raise RuntimeError("429 Too Many Requests")
+
+        assert cache.fetch("info", "AAA", failing) == {"v": "old"}
+        assert cache.fetch("info", "AAA", lambda: {}, cache_if=bool) == {"v": "old"}
+        with pytest.raises(RuntimeError):
+            cache.fetch("info", "BBB", failing)
+
+    def test_dataframe_round_trip(self, tmp_path):
+        cache, _ = _cache(tmp_path)
+        df = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.DatetimeIndex(["2026-01-02", "2026-01-05"]))
+        cache.put("history", "AAA:2026-01-01", df)
+        pd.testing.assert_frame_equal(cache.get("history", "AAA:2026-01-01"), df)
+
+
+class TestOfflineAndEviction:
+
+    def test_offline_serves_expired_and_raises_on_miss(self, tmp_path):
+        cache, clock = _cache(tmp_path, ttls={"info": 10}, offline=True)
+        cache.put("info", "AAA", {"v": 1})
+        clock.now += 10_000
+        loader = lambda: pytest.fail("network used offline")
+        assert cache.fetch("info", "AAA", loader) == {"v": 1}
+        with pytest.raises(OfflineCacheMiss):
+            cache.fetch("info", "BBB", loader)
+
+    def test_lru_eviction_respects_size_cap(self, tmp_path):
+        cache, clock = _cache(tmp_path, max_bytes=2500)
+        for key in ("A", "B", "C"):
+            clock.now += 1
+            cache.put("info", key, "x" * 1000)
+        # A was evicted; touching B makes C the next victim
+        assert cache.get("info", "A") is None
+        clock.now += 1
+        cache.get("info", "B")
+        clock.now += 1
+        cache.put("info", "D", "x" * 1000)
+        assert cache.get("info", "B") is not None
+        assert cache.get("info", "C") is None
+        assert cache.stats()["bytes"] <= 2500
+
+    def test_disabled_cache_always_calls_loader(self, tmp_path):
+        cache = ResponseCache(path=None)
+        calls = []
+        for _ in range(2):
+            cache.fetch("info", "AAA", lambda: calls.append(1) or {"v": 1})
+        assert len(calls) == 2
+        assert cache.stats() == {"entries": 0, "bytes": 0}
@@ -0,0 +1,88 @@
+"""
+tests/test_returns.py — unit tests for scripts/returns.py, the precomputed
+lookback returns behind the Portfolio Overview "Movers & Shakers" tables.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.returns import LOOKBACKS, RETURN_COLUMNS, YTD, build_return_anchors, returns_for, window_returns
+
+
+def _daily(seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for ticker, start in (("AAA", "2025-01-02"), ("BBB", "2025-01-02"), ("NEW", "2026-03-20")):
+        dates = pd.bdate_range(start, "2026-04-01")
+        frames.append(pd.DataFrame({
+            "date": dates.strftime("%Y-%m-%d"),
+            "stock": ticker,
+            "close": 50 + rng.normal(0, 1, len(dates)).cumsum(),
+        }))
+    # shuffled, as the loaders don't promise an order
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed)
+
+
+def _reference(daily_df, days_lookback=None, is_ytd=False):
+    """The scan-per-click formulation the anchors replace."""
+    daily_df = daily_df.copy()
+    daily_df["date"] = pd.to_datetime(daily_df["date"])
+    daily_df = daily_df.sort_values("date")
+    max_date = daily_df["date"].max()
+    start_date = date(max_date.year, 1, 1) if is_ytd else max_date - timedelta(days=days_lookback)
+    end_prices = daily_df[daily_df["date"] == max_date][["stock", "close"]].rename(columns={"close": "End_Price"})
+    history = daily_df[daily_df["date"] <= pd.Timestamp(start_date)]
+    latest_dates = history.groupby("stock")["date"].max().reset_index()
+    start_prices = pd.merge(daily_df, latest_dates, on=["stock", "date"])[["stock", "close"]]
+    perf = pd.merge(end_prices, start_prices.rename(columns={"close": "Start_Price"}), on="stock")
+    perf["Pct_Change"] = (perf["End_Price"] - perf["Start_Price"]) / perf["Start_Price"] * 100
+    return perf.sort_values("stock").reset_index(drop=True)
+
+
+class TestReturnAnchors:
+
+    @pytest.mark.parametrize("window", [*LOOKBACKS, YTD])
+    def test_matches_scan(self, window):
+        daily = _daily()
+        expected = (_reference(daily, is_ytd=True) if window == YTD
+                    else _reference(daily, days_lookback=LOOKBACKS[window]))
+        got = returns_for(build_return_anchors(daily), window)
+        assert got["stock"].tolist() == expected["stock"].tolist()
+        np.testing.assert_allclose(got["Start_Price"], expected["Start_Price"])
+        np.testing.assert_allclose(got["Pct_Change"], expected["Pct_Change"])
+
+    def test_new_ticker_only_in_short_windows(self):
+        anchors = build_return_anchors(_daily())
+        assert "NEW" in returns_for(anchors, "1 Week")["stock"].tolist()
+        assert "NEW" not in returns_for(anchors, "3 Months")["stock"].tolist()
+
+    def test_empty_history(self):
+        anchors = build_return_anchors(pd.DataFrame(columns=["date", "stock", "close"]))
+        assert returns_for(anchors, "1 Day").empty
+        assert list(returns_for(anchors, "1 Day").columns) == RETURN_COLUMNS
+
+    def test_unknown_window(self):
+        assert returns_for(build_return_anchors(_daily()), "5 Years").empty
+
+
+class TestWindowReturns:
+
+    def test_arbitrary_window(self):
+        daily = _daily()
+        got = window_returns(daily, "2025-06-15", "2025-12-31").set_index("stock")
+        prices = daily.assign(date=pd.to_datetime(daily["date"])).sort_values("date")
+        for ticker in ("AAA", "BBB"):
+            p = prices[prices["stock"] == ticker].set_index("date")["close"]
+            start, end = p[:"2025-06-15"].iloc[-1], p[:"2025-12-31"].iloc[-1]
+            assert got.loc[ticker, "Pct_Change"] == pytest.approx((end - start) / start * 100)
+        assert "NEW" not in got.index
+
+    def test_defaults_to_latest_date(self):
+        daily = _daily()
+        pd.testing.assert_frame_equal(
+            window_returns(daily, "2026-03-02"),
+            returns_for(build_return_anchors(daily), "1 Month"),
+        )
@@ -58,6 +58,13 @@ class TestCleanAmountColumn:
         result = clean_amount_column(df)
         assert list(result["amount"]) == pytest.approx([1.5, 2.5, 3.0])
 
+    def test_numeric_nan_becomes_zero_without_string_scrub(self):
+        df = pd.DataFrame({"amount": [1.5, float("nan")]})
+        result = clean_amount_column(df)
+        assert result["amount"].dtype == "float64"
+        assert list(result["amount"]) == pytest.approx([1.5, 0.0])
+        assert pd.isna(df["amount"].iloc[1])
+
     def test_unparseable_becomes_zero(self):
         df = pd.DataFrame({"amount": ["N/A", "abc", ""]})
         result = clean_amount_column(df)